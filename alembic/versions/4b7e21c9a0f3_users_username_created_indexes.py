@@ -0,0 +1,38 @@
+"""users.username, lower(users.username) and users.created_at indexes
+
+Revision ID: 4b7e21c9a0f3
+Revises: d35668de9e05
+Create Date: 2026-10-18 12:14:06.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e21c9a0f3'
+down_revision: Union[str, Sequence[str], None] = 'd35668de9e05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=False)
+    op.create_index(op.f('ix_users_created_at'), 'users', ['created_at'], unique=False)
+
+    # Case-insensitive username prefix search (LIKE 'q%' on PostgreSQL needs
+    # text_pattern_ops outside the C locale; SQLite seeks it with a range)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE INDEX ix_users_username_lower ON users (lower(username) text_pattern_ops)')
+    else:
+        op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_username_lower', table_name='users')
+    op.drop_index(op.f('ix_users_created_at'), table_name='users')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
@@ -0,0 +1,42 @@
+"""counters table
+
+Revision ID: 8c2f5d1e7a64
+Revises: 4b7e21c9a0f3
+Create Date: 2026-10-18 12:41:53.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2f5d1e7a64'
+down_revision: Union[str, Sequence[str], None] = '4b7e21c9a0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('counters',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Seed the user counters from the current table contents
+    op.execute(
+        "INSERT INTO counters (name, value) "
+        "SELECT 'users_total', COUNT(*) FROM users"
+    )
+    op.execute(
+        "INSERT INTO counters (name, value) "
+        "SELECT 'users_admin', COUNT(*) FROM users WHERE role = 'admin'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('counters')
@@ -0,0 +1,38 @@
+"""saved_topics (user_id, created_at) index
+
+Revision ID: 959465b7ab7b
+Revises: f5f0b3032ccd
+Create Date: 2026-10-18 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '959465b7ab7b'
+down_revision: Union[str, Sequence[str], None] = 'f5f0b3032ccd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _needs_index(table, name):
+    """Return True if `table` exists but does not yet carry index `name`."""
+    insp = sa.inspect(op.get_bind())
+    if table not in insp.get_table_names():
+        return False
+    return all(ix["name"] != name for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # saved_topics may have been created by create_all (already indexed)
+    if _needs_index('saved_topics', 'ix_saved_topics_user_created'):
+        op.create_index('ix_saved_topics_user_created', 'saved_topics', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_saved_topics_user_created', table_name='saved_topics', if_exists=True)
@@ -0,0 +1,108 @@
+"""users.email_normalized (unique, indexed) with batched backfill
+
+Revision ID: b6d0e8a3f217
+Revises: e3a9f4c21b58
+Create Date: 2026-10-18 14:07:31.275640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from brainery_data.sql.models import normalize_email
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d0e8a3f217'
+down_revision: Union[str, Sequence[str], None] = 'e3a9f4c21b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Rows normalised per UPDATE; each batch commits on its own (see upgrade)
+BACKFILL_BATCH_SIZE = 1000
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.Integer),
+    sa.column('email', sa.String),
+    sa.column('email_normalized', sa.String),
+)
+
+
+def _backfill(bind):
+    """
+    Fill email_normalized in id-ordered batches with normalize_email()
+    itself: SQL lower()/trim() differ from Python's str.lower()/strip()
+    for non-ASCII capitals and for tabs/newlines.
+    """
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(users.c.id, users.c.email)
+            .where(users.c.id > last_id)
+            .order_by(users.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        # One statement per batch (id -> normalised email)
+        bind.execute(
+            users.update()
+            .where(users.c.id.in_([row.id for row in rows]))
+            .values(email_normalized=sa.case(
+                {row.id: normalize_email(row.email) for row in rows}, value=users.c.id,
+            ))
+        )
+        last_id = rows[-1].id
+
+
+def _check_collisions(bind):
+    """Fail with a readable message if two accounts normalise to one email."""
+    clashes = bind.execute(sa.text(
+        "SELECT email_normalized, COUNT(*) FROM users "
+        "GROUP BY email_normalized HAVING COUNT(*) > 1 LIMIT 10"
+    )).all()
+    if clashes:
+        listed = ", ".join(f"{email} ({count})" for email, count in clashes)
+        raise RuntimeError(
+            "Cannot add unique users.email_normalized; merge or rename these "
+            f"accounts first: {listed}"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('email_normalized', sa.String(length=255), nullable=True))
+
+    # Commit the new column, then backfill in autocommit mode so every
+    # batch is its own short transaction instead of one long one. If the
+    # backfill fails, drop the column before running the upgrade again.
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        _backfill(bind)
+
+    _check_collisions(bind)
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('email_normalized', existing_type=sa.String(length=255), nullable=False)
+    op.create_index(op.f('ix_users_email_normalized'), 'users', ['email_normalized'], unique=True)
+
+    # Admin search prefix-matches emails with LIKE 'q%' on PostgreSQL, which
+    # needs text_pattern_ops outside the C locale (SQLite seeks the index above)
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            'CREATE INDEX ix_users_email_normalized_pattern '
+            'ON users (email_normalized text_pattern_ops)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_users_email_normalized_pattern', table_name='users')
+    op.drop_index(op.f('ix_users_email_normalized'), table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('email_normalized')
@@ -0,0 +1,28 @@
+"""topics.title index
+
+Revision ID: d35668de9e05
+Revises: 959465b7ab7b
+Create Date: 2026-10-18 11:02:17.540391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd35668de9e05'
+down_revision: Union[str, Sequence[str], None] = '959465b7ab7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_topics_title'), 'topics', ['title'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_topics_title'), table_name='topics')
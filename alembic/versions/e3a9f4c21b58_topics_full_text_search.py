@@ -0,0 +1,83 @@
+"""topics full-text search (FTS5 on SQLite, tsvector + GIN on PostgreSQL)
+
+Revision ID: e3a9f4c21b58
+Revises: 8c2f5d1e7a64
+Create Date: 2026-10-18 13:20:44.610935
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9f4c21b58'
+down_revision: Union[str, Sequence[str], None] = '8c2f5d1e7a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS topics_fts USING fts5("
+    "title, description, content='topics', content_rowid='id', "
+    "tokenize='porter unicode61')",
+
+    "CREATE TRIGGER IF NOT EXISTS topics_fts_ai AFTER INSERT ON topics BEGIN "
+    "INSERT INTO topics_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+
+    "CREATE TRIGGER IF NOT EXISTS topics_fts_ad AFTER DELETE ON topics BEGIN "
+    "INSERT INTO topics_fts(topics_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+
+    "CREATE TRIGGER IF NOT EXISTS topics_fts_au AFTER UPDATE OF title, description ON topics BEGIN "
+    "INSERT INTO topics_fts(topics_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO topics_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+
+    # Index the existing catalogue
+    "INSERT INTO topics_fts(topics_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS topics_fts_au",
+    "DROP TRIGGER IF EXISTS topics_fts_ad",
+    "DROP TRIGGER IF EXISTS topics_fts_ai",
+    "DROP TABLE IF EXISTS topics_fts",
+]
+
+POSTGRESQL_UPGRADE = [
+    # Generated column: PostgreSQL keeps it in sync on every write
+    "ALTER TABLE topics ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ") STORED",
+
+    "CREATE INDEX IF NOT EXISTS ix_topics_search_vector ON topics USING gin (search_vector)",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_topics_search_vector",
+    "ALTER TABLE topics DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _statements(sqlite, postgresql):
+    """Pick the statements for the connected dialect."""
+    dialect = op.get_bind().dialect.name
+    return {"sqlite": sqlite, "postgresql": postgresql}.get(dialect, [])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in _statements(SQLITE_UPGRADE, POSTGRESQL_UPGRADE):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in _statements(SQLITE_DOWNGRADE, POSTGRESQL_DOWNGRADE):
+        op.execute(statement)
@@ -0,0 +1,171 @@
+# =======================================================
+# Fingerprinted Static Assets (Manifest Lookup and Serving)
+# =======================================================
+# scripts/build_assets.py minifies static/css and static/js into
+# static/dist/ under content-hashed names, writes .gz/.br siblings and
+# a manifest.json mapping each source path to its built file.
+#
+# Templates call asset_url("css/styles.css"): with a manifest it
+# resolves to the hashed file, otherwise to the source file, so a
+# checkout without a build still works. Hashed files never change
+# under the same URL, so they are served with a one-year immutable
+# Cache-Control and the pre-compressed sibling the client accepts.
+#
+# scripts/build_images.py does the same for static/images: resized
+# WebP/AVIF variants listed in dist/images.json, rendered by the
+# picture() macro in templates/macros.html.
+#
+# scripts/vendor_assets.py writes static/vendor/ (purged Bootstrap +
+# Font Awesome CSS, jQuery + Popper + Bootstrap JS), which is committed
+# and served through asset_url() like our own files.
+
+# Import required modules
+import json
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory, url_for
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Build output directory and manifest, relative to the static folder
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMAGE_MANIFEST_NAME = "images.json"
+
+# Set ASSETS_USE_BUILD=0 to serve the unminified sources (front-end work)
+ASSETS_USE_BUILD = os.getenv("ASSETS_USE_BUILD", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Lifetime for hashed files (one year; the URL changes when content does)
+IMMUTABLE_MAX_AGE = 31536000
+
+# Pre-compressed siblings in order of preference (Content-Encoding, suffix)
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Not known to every Python's mimetypes table
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+
+# =======================================================
+# Manifest
+# =======================================================
+
+# Loaded once per worker by init_app (rebuild + restart to pick up changes)
+_manifest = {"version": "dev", "assets": {}}
+
+# Source image path -> {"width", "height", "variants": [...]}
+_images = {}
+
+# Built path -> available encodings, for the static view
+_built = {}
+
+
+def load_manifest(static_folder):
+    """Read the build manifests, or fall back to source files."""
+    global _manifest, _images, _built
+
+    _manifest, _images, _built = {"version": "dev", "assets": {}}, {}, {}
+    if not ASSETS_USE_BUILD:
+        return _manifest
+
+    path = os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as fh:
+            _manifest = json.load(fh)
+        _built.update(
+            (entry["path"], tuple(entry.get("encodings", ()))) for entry in _manifest["assets"].values()
+        )
+
+    # Image variants are already compressed formats: no .gz/.br siblings
+    path = os.path.join(static_folder, DIST_DIR, IMAGE_MANIFEST_NAME)
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as fh:
+            _images = json.load(fh)["images"]
+        _built.update(
+            (variant["path"], ()) for image in _images.values() for variant in image["variants"]
+        )
+    return _manifest
+
+
+def manifest_version():
+    """Token that changes whenever any built asset changes ("dev" unbuilt)."""
+    return _manifest["version"]
+
+
+def asset_url(filename):
+    """URL for a static source file, preferring its fingerprinted build."""
+    entry = _manifest["assets"].get(filename)
+    return url_for("static", filename=entry["path"] if entry else filename)
+
+
+def image_sources(filename):
+    """
+    Describe the built variants of a static image for <picture>:
+    {"width", "height", "sources": [(mime type, srcset), ...]} with the
+    smallest format first, or None when the image was not built.
+    """
+    image = _images.get(filename)
+    if not image:
+        return None
+
+    by_type = {}
+    for variant in image["variants"]:
+        by_type.setdefault(variant["type"], []).append(
+            f"{url_for('static', filename=variant['path'])} {variant['width']}w"
+        )
+
+    # AVIF before WebP: browsers take the first <source> they support
+    order = ("image/avif", "image/webp")
+    sources = [(mime, ", ".join(by_type[mime])) for mime in order if mime in by_type]
+    return {"width": image["width"], "height": image["height"], "sources": sources}
+
+
+# =======================================================
+# Static View (Pre-Compressed, Immutable)
+# =======================================================
+
+def _send_static(filename):
+    """Serve hashed build output directly; everything else as Flask would."""
+    encodings = _built.get(filename)
+    if encodings is None:
+        return current_app.send_static_file(filename)
+
+    # Pick the best pre-compressed sibling the client accepts
+    send_name, content_encoding = filename, None
+    for encoding, suffix in _ENCODINGS:
+        if encoding in encodings and request.accept_encodings[encoding]:
+            send_name, content_encoding = filename + suffix, encoding
+            break
+
+    # The MIME type is that of the original file, not of .gz/.br
+    resp = send_from_directory(
+        current_app.static_folder,
+        send_name,
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        max_age=IMMUTABLE_MAX_AGE,
+    )
+    if content_encoding:
+        resp.headers["Content-Encoding"] = content_encoding
+    if encodings:
+        resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+# =======================================================
+# Installation
+# =======================================================
+
+def init_app(app):
+    """Load the manifests, expose template helpers, take over static."""
+    load_manifest(app.static_folder)
+    app.add_template_global(asset_url)
+    app.add_template_global(image_sources)
+
+    # Same URL rule (prefix-aware static_url_path); only the view changes
+    app.view_functions["static"] = _send_static
@@ -0,0 +1,324 @@
+# =======================================================
+# Response Compression (WSGI Middleware)
+# =======================================================
+# Compresses text responses (HTML, JSON, CSS, JS, SVG) with brotli or
+# gzip, whichever the client prefers and this process supports. nginx
+# does this when it is in front; on the Heroku/gunicorn path nothing
+# else would.
+#
+# - Bodies under COMPRESS_MIN_SIZE are sent as-is (not worth a frame).
+# - Responses that already carry a Content-Encoding (the pre-compressed
+#   assets from brainery_data.assets), partial content, 204/304 and
+#   Cache-Control: no-transform are never touched.
+# - Streamed bodies (no Content-Length) are compressed chunk by chunk
+#   and flushed, so clients still see data as it is produced.
+# - Every compressible response gets Vary: Accept-Encoding, compressed
+#   or not, so shared caches keep the variants apart.
+
+# Import required modules
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Set COMPRESS_ENABLED=0 when a proxy in front already compresses
+COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Smallest body (bytes) worth compressing
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+
+# CPU/size trade-off for on-the-fly compression (not the offline build)
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+# Media types worth compressing (images/fonts/archives already are)
+COMPRESSIBLE_TYPES = frozenset({
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "text/xml",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+})
+
+# Statuses that have no body to compress
+_NO_BODY = ("1", "204", "206", "304")
+
+
+# =======================================================
+# Encoders
+# =======================================================
+
+class _GzipEncoder:
+    """Streaming gzip (zlib with a gzip header)."""
+
+    name = "gzip"
+
+    def __init__(self):
+        self._z = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._z.compress(data)
+
+    def flush(self):
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    """Streaming brotli (only when the optional package is installed)."""
+
+    name = "br"
+
+    def __init__(self):
+        self._b = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._b.process(data)
+
+    def flush(self):
+        return self._b.flush()
+
+    def finish(self):
+        return self._b.finish()
+
+
+def _accepted(accept_encoding):
+    """Map each coding in Accept-Encoding to its q-value."""
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding.lower()] = q
+    return accepted
+
+
+def choose_encoder(accept_encoding):
+    """Pick the best encoder the client accepts (None for identity)."""
+    accepted = _accepted(accept_encoding)
+    star = accepted.get("*", 0.0)
+
+    candidates = [("br", _BrotliEncoder)] if brotli is not None else []
+    candidates.append(("gzip", _GzipEncoder))
+
+    best, best_q = None, 0.0
+    for name, encoder in candidates:
+        q = accepted.get(name, star)
+        if q > best_q:
+            best, best_q = encoder, q
+    return best
+
+
+# =======================================================
+# Header Helpers
+# =======================================================
+
+def _get(headers, name):
+    """Return the first value of header `name` (case-insensitive)."""
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _without(headers, *names):
+    """Drop the given headers."""
+    names = {n.lower() for n in names}
+    return [(k, v) for k, v in headers if k.lower() not in names]
+
+
+def _add_vary(headers):
+    """Merge Accept-Encoding into Vary."""
+    vary = _get(headers, "Vary")
+    if vary is None:
+        return headers + [("Vary", "Accept-Encoding")]
+    tokens = [t.strip().lower() for t in vary.split(",")]
+    if "accept-encoding" in tokens or "*" in tokens:
+        return headers
+    return _without(headers, "Vary") + [("Vary", f"{vary}, Accept-Encoding")]
+
+
+def _weaken_etag(headers):
+    """A compressed body is a different byte sequence: W/ the validator."""
+    etag = _get(headers, "ETag")
+    if etag is None or etag.startswith("W/"):
+        return headers
+    return _without(headers, "ETag") + [("ETag", f"W/{etag}")]
+
+
+def _compressible(status, headers):
+    """True if this response is a candidate for compression."""
+    if status.startswith(_NO_BODY):
+        return False
+    if _get(headers, "Content-Encoding") or _get(headers, "Content-Range"):
+        return False
+    if "no-transform" in (_get(headers, "Cache-Control") or "").lower():
+        return False
+    mimetype = (_get(headers, "Content-Type") or "").split(";", 1)[0].strip().lower()
+    return mimetype in COMPRESSIBLE_TYPES
+
+
+# =======================================================
+# Middleware
+# =======================================================
+
+class CompressionMiddleware:
+    """Negotiate and apply gzip/brotli to compressible responses."""
+
+    def __init__(self, app, min_size=None):
+        self.app = app
+        self.min_size = COMPRESS_MIN_SIZE if min_size is None else min_size
+
+    def __call__(self, environ, start_response):
+        if not COMPRESS_ENABLED:
+            return self.app(environ, start_response)
+
+        encoder_cls = choose_encoder(environ.get("HTTP_ACCEPT_ENCODING"))
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            encoder_cls = None
+
+        state = {}
+        written = []
+
+        def capture(status, headers, exc_info=None):
+            """Hold back the real start_response until the body is seen."""
+            state.update(status=status, headers=list(headers), exc_info=exc_info)
+            return written.append
+
+        app_iter = self.app(environ, capture)
+        body = app_iter
+
+        # Apps may call start_response lazily, on the first chunk
+        if "status" not in state:
+            body = iter(app_iter)
+            while "status" not in state:
+                written.append(next(body))
+        status, headers = state["status"], state["headers"]
+
+        # Not a candidate: pass straight through
+        if not _compressible(status, headers):
+            start_response(status, headers, state["exc_info"])
+            return self._chain(written, body, app_iter)
+
+        headers = _add_vary(headers)
+        length = _get(headers, "Content-Length")
+        too_small = length is not None and length.isdigit() and int(length) < self.min_size
+        if encoder_cls is None or too_small:
+            start_response(status, headers, state["exc_info"])
+            return self._chain(written, body, app_iter)
+
+        return self._compress(encoder_cls(), status, headers, state["exc_info"],
+                              _iter_chunks(written, body), app_iter, start_response,
+                              buffered=length is not None)
+
+    @staticmethod
+    def _chain(written, body, app_iter):
+        """Chunks already pulled or passed to write() first, then the rest."""
+        if not written and body is app_iter:
+            return app_iter
+        return _ClosingIterator(_iter_chunks(written, body), app_iter)
+
+    def _compress(self, encoder, status, headers, exc_info, chunks, app_iter, start_response, buffered):
+        """Compress the whole body (known length) or stream it (unknown)."""
+
+        # Read until the body is known to be big enough (or ends)
+        head, size = [], 0
+        for chunk in chunks:
+            if chunk:
+                head.append(chunk)
+                size += len(chunk)
+            if size >= self.min_size and not buffered:
+                break
+
+        # Small after all: send the original bytes
+        if size < self.min_size:
+            start_response(status, headers, exc_info)
+            _close(app_iter)
+            return head
+
+        headers = _weaken_etag(_without(headers, "Content-Length", "Accept-Ranges"))
+        headers.append(("Content-Encoding", encoder.name))
+
+        # Known length (ordinary Flask responses): one frame, exact length
+        if buffered:
+            _close(app_iter)
+            body = encoder.compress(b"".join(head)) + encoder.finish()
+            headers.append(("Content-Length", str(len(body))))
+            start_response(status, headers, exc_info)
+            return [body]
+
+        # Streaming: flush after every chunk so data is not held back
+        start_response(status, headers, exc_info)
+        return _ClosingIterator(_stream(encoder, head, chunks), app_iter)
+
+
+def _iter_chunks(written, body):
+    """Yield write() chunks, then the response iterable."""
+    yield from written
+    yield from body
+
+
+def _stream(encoder, head, chunks):
+    """Compress and flush chunk by chunk."""
+    yield encoder.compress(b"".join(head)) + encoder.flush()
+    for chunk in chunks:
+        if chunk:
+            out = encoder.compress(chunk) + encoder.flush()
+            if out:
+                yield out
+    yield encoder.finish()
+
+
+def _close(app_iter):
+    """Call close() on the app's iterable, as WSGI requires."""
+    close = getattr(app_iter, "close", None)
+    if close is not None:
+        close()
+
+
+class _ClosingIterator:
+    """Iterate `iterable` and close the original app iterable afterwards."""
+
+    def __init__(self, iterable, app_iter):
+        self._iter = iter(iterable)
+        self._app_iter = app_iter
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iter)
+
+    def close(self):
+        _close(self._app_iter)
+
+
+# =======================================================
+# Installation
+# =======================================================
+
+def init_app(app):
+    """Wrap the app's WSGI callable (call after the other middleware)."""
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app)
@@ -0,0 +1,190 @@
+# =======================================================
+# Per-Worker Registered-Email Membership Filter (Bloom)
+# =======================================================
+# register.js calls /register/check_email while the user types. Most
+# of those emails are not registered, so a Bloom filter over the
+# normalised emails in `users` answers "definitely not registered"
+# from memory; only possible positives are confirmed in SQL.
+#
+# The filter is rebuilt from SQL every EMAIL_FILTER_REFRESH_SECONDS
+# (and when it fills up) and updated in place on registration. Emails
+# registered through another worker are picked up at the next
+# refresh; register_user still performs the authoritative check.
+
+# Import required modules
+import hashlib
+import math
+import os
+import threading
+import time
+
+from sqlalchemy import func, select
+
+from brainery_data.sql.db import SessionLocal
+from brainery_data.sql.models import UserSQL, normalize_email
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Target false-positive rate (positives cost one indexed SQL lookup)
+EMAIL_FILTER_FP_RATE = float(os.getenv("EMAIL_FILTER_FP_RATE", "0.01"))
+
+# Rebuild interval; bounds staleness for other workers' registrations
+EMAIL_FILTER_REFRESH_SECONDS = float(os.getenv("EMAIL_FILTER_REFRESH_SECONDS", "300"))
+
+# Headroom: capacity is this multiple of the current user count
+_GROWTH_FACTOR = 2
+_MIN_CAPACITY = 1024
+
+# Rows fetched per round-trip while building
+_BUILD_BATCH = 5000
+
+
+# =======================================================
+# Bloom Filter
+# =======================================================
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one BLAKE2b digest)."""
+
+    __slots__ = ("capacity", "num_bits", "num_hashes", "count", "_bits")
+
+    def __init__(self, capacity, fp_rate):
+        self.capacity = max(1, int(capacity))
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+    def full(self):
+        """True once more items were added than the filter was sized for."""
+        return self.count > self.capacity
+
+
+# =======================================================
+# Module State
+# =======================================================
+
+_lock = threading.Lock()
+_filter = None
+_built_at = 0.0
+
+# Emails added while a rebuild is scanning users (None when idle)
+_pending = None
+
+# Diagnostics
+_stats = {"negatives": 0, "positives": 0, "builds": 0}
+
+
+def normalise(email):
+    """Canonical form used for membership (same as users.email_normalized)."""
+    return normalize_email(email)
+
+
+def _build():
+    """Load every registered email into a freshly sized filter."""
+    db = SessionLocal()
+    try:
+        total = db.execute(select(func.count(UserSQL.id))).scalar_one()
+        bloom = BloomFilter(max(_MIN_CAPACITY, total * _GROWTH_FACTOR), EMAIL_FILTER_FP_RATE)
+        rows = db.execute(
+            select(UserSQL.email_normalized).execution_options(yield_per=_BUILD_BATCH)
+        )
+        for (email,) in rows:
+            bloom.add(email)
+    finally:
+        db.close()
+    return bloom
+
+
+def _stale(bloom):
+    """True if the filter is missing, full or older than the refresh interval."""
+    return bloom is None or bloom.full() or time.monotonic() - _built_at >= EMAIL_FILTER_REFRESH_SECONDS
+
+
+def _current():
+    """
+    Return the filter, (re)building it when missing, stale or full.
+    One thread rebuilds; the others keep answering from the old filter
+    and only wait when there is none yet.
+    """
+    global _filter, _built_at, _pending
+
+    bloom = _filter
+    if not _stale(bloom):
+        return bloom
+
+    if not _lock.acquire(blocking=bloom is None):
+        return bloom
+    try:
+        bloom = _filter
+        if _stale(bloom):
+            # Registrations during the scan may be missed by it: replay them
+            _pending = []
+            try:
+                bloom = _build()
+                _filter, _built_at = bloom, time.monotonic()
+                for email in _pending:
+                    bloom.add(email)
+            finally:
+                _pending = None
+            _stats["builds"] += 1
+        return bloom
+    finally:
+        _lock.release()
+
+
+# =======================================================
+# Public API
+# =======================================================
+
+def might_exist(email):
+    """False means the email is definitely not registered (as of the last refresh)."""
+    found = normalise(email) in _current()
+    _stats["positives" if found else "negatives"] += 1
+    return found
+
+
+def add(email):
+    """Record a newly registered email in this worker's filter."""
+    email = normalise(email)
+    pending = _pending
+    if pending is not None:
+        pending.append(email)
+    bloom = _filter
+    if bloom is not None:
+        bloom.add(email)
+
+
+def invalidate():
+    """Force a rebuild on the next check."""
+    global _filter
+    _filter = None
+
+
+def stats():
+    """Return filter sizing and hit counters for this worker."""
+    bloom = _filter
+    return dict(
+        _stats,
+        capacity=bloom.capacity if bloom else 0,
+        items=bloom.count if bloom else 0,
+        bits=bloom.num_bits if bloom else 0,
+        hashes=bloom.num_hashes if bloom else 0,
+    )
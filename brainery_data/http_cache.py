@@ -0,0 +1,77 @@
+# =======================================================
+# HTTP Conditional Caching for JSON Endpoints
+# =======================================================
+# Helpers that let a view answer If-None-Match with a 304 before it
+# shapes or serialises its payload, and that emit consistent
+# Cache-Control/Vary headers for shared and per-user resources.
+
+# Import required modules
+import hashlib
+import os
+
+from flask import current_app, jsonify, request
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Freshness lifetime for data shared by all users (catalogue etc.)
+SHARED_MAX_AGE = int(os.getenv("HTTP_CACHE_SHARED_MAX_AGE", "60"))
+
+
+# =======================================================
+# Validator Helpers
+# =======================================================
+
+def make_etag(*parts):
+    """Build a strong ETag value from version tokens or row tuples."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _not_modified(etag):
+    """Return True if the request's If-None-Match matches the resource."""
+    return etag is not None and request.if_none_match.contains_weak(etag)
+
+
+def _apply_cache_headers(resp, etag, shared, max_age):
+    """Attach the validator, Cache-Control and Vary to a response."""
+    if etag is not None:
+        resp.set_etag(etag)
+
+    if shared:
+        # Same bytes for every user: the browser may reuse them without
+        # asking, but the endpoints are login-gated so only its own copy
+        resp.cache_control.max_age = SHARED_MAX_AGE if max_age is None else max_age
+        resp.cache_control.private = True
+        resp.vary.add("Cookie")
+    else:
+        # Per-user data: never store in shared caches, always revalidate
+        resp.cache_control.private = True
+        resp.cache_control.no_cache = True
+        resp.vary.add("Cookie")
+
+    return resp
+
+
+# =======================================================
+# Conditional JSON Response
+# =======================================================
+
+def cached_json(build, etag=None, shared=False, max_age=None):
+    """
+    Return a JSON response for `build()` or a bodiless 304.
+    `build` is only called when the client's copy is stale.
+    `shared` marks data that is the same for every user (fresh in the
+    user's browser for max_age); otherwise it is revalidated every time.
+    """
+    if _not_modified(etag):
+        resp = current_app.response_class(status=304)
+    else:
+        resp = jsonify(build())
+
+    return _apply_cache_headers(resp, etag, shared, max_age)
@@ -0,0 +1,177 @@
+# =======================================================
+# Per-Request Timing (Server-Timing Header + Log Line)
+# =======================================================
+# Records, for every request, how many SQL statements ran and how
+# long they took, plus time spent rendering templates and serialising
+# JSON. The totals are sent back as a Server-Timing header (visible in
+# the browser devtools Network tab) and logged as one key=value line.
+
+# Import required modules
+import logging
+import os
+import time
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from brainery_data.sql.db import engine
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Set SERVER_TIMING=0 to stop sending the header (logging continues)
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Dedicated logger so timing lines can be routed/filtered separately
+logger = logging.getLogger("brainery_data.timing")
+
+# flask.g attribute holding the current request's timer
+_G_TIMER_KEY = "_brainery_request_timer"
+
+
+# =======================================================
+# Request Timer
+# =======================================================
+
+class RequestTimer:
+    """Accumulates DB, template and JSON time for a single request."""
+
+    __slots__ = ("started", "queries", "db", "template", "json", "_template_started")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.json = 0.0
+        self._template_started = []
+
+    def total(self):
+        """Seconds elapsed since the request started."""
+        return time.perf_counter() - self.started
+
+
+def current_timer():
+    """Return the active request's timer, or None outside a request."""
+    if not has_request_context():
+        return None
+    return g.get(_G_TIMER_KEY)
+
+
+# =======================================================
+# SQL Timing (SQLAlchemy Cursor Events)
+# =======================================================
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Stamp the statement start on its execution context."""
+    # Per-statement, so a statement that raises leaves nothing behind
+    context._brainery_query_start = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Add the statement's duration to the current request."""
+    started = getattr(context, "_brainery_query_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+
+    timer = current_timer()
+    if timer is not None:
+        timer.queries += 1
+        timer.db += elapsed
+
+
+# =======================================================
+# Template Timing (Flask Signals)
+# =======================================================
+
+def _before_render(sender, template, context, **extra):
+    """Stamp the render start (nested renders are supported)."""
+    timer = current_timer()
+    if timer is not None:
+        timer._template_started.append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    """Add the render duration to the current request."""
+    timer = current_timer()
+    if timer is not None and timer._template_started:
+        timer.template += time.perf_counter() - timer._template_started.pop()
+
+
+# =======================================================
+# JSON Timing (Flask JSON Provider)
+# =======================================================
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default JSON provider that also times serialisation per request."""
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            timer = current_timer()
+            if timer is not None:
+                timer.json += time.perf_counter() - started
+
+
+# =======================================================
+# Request Hooks
+# =======================================================
+
+def _start_timer():
+    """before_request: attach a fresh timer to the request."""
+    setattr(g, _G_TIMER_KEY, RequestTimer())
+
+
+def _ms(seconds):
+    """Format seconds as milliseconds for headers/logs."""
+    return round(seconds * 1000, 2)
+
+
+def _finish_timer(response):
+    """after_request: emit Server-Timing and the structured log line."""
+    timer = current_timer()
+    if timer is None:
+        return response
+
+    total = timer.total()
+    metrics = {
+        "queries": timer.queries,
+        "db_ms": _ms(timer.db),
+        "tpl_ms": _ms(timer.template),
+        "json_ms": _ms(timer.json),
+        "total_ms": _ms(total),
+    }
+
+    if SERVER_TIMING_HEADER:
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={metrics["db_ms"]};desc="{timer.queries} queries", '
+            f'tpl;dur={metrics["tpl_ms"]}, '
+            f'json;dur={metrics["json_ms"]}, '
+            f'total;dur={metrics["total_ms"]}',
+        )
+
+    logger.info(
+        "request method=%s path=%s status=%s queries=%d db_ms=%s tpl_ms=%s json_ms=%s total_ms=%s",
+        request.method, request.path, response.status_code, timer.queries,
+        metrics["db_ms"], metrics["tpl_ms"], metrics["json_ms"], metrics["total_ms"],
+        extra={"timing": dict(metrics, method=request.method, path=request.path, status=response.status_code)},
+    )
+    return response
+
+
+def init_app(app):
+    """Install request timing hooks, template signals and the timed JSON provider."""
+    app.json = TimedJSONProvider(app)
+    app.before_request(_start_timer)
+    app.after_request(_finish_timer)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
@@ -0,0 +1,185 @@
+# =======================================================
+# Central, Non-Blocking Logging Setup
+# =======================================================
+# Request threads only put records on an in-memory queue
+# (QueueHandler); a single background QueueListener thread formats
+# them and writes to stderr. If the queue is full the record is
+# dropped and counted rather than blocking the request.
+#
+# LOG_LEVEL          root level (DEBUG/INFO/WARNING/...; default INFO)
+# LOG_FORMAT         "text" (default) or "json" (one object per line)
+# LOG_QUEUE_SIZE     records buffered before dropping (default 10000)
+# LOG_SAMPLE_RATES   per-route sampling of records below WARNING,
+#                    e.g. "dashboard.get_saved_topics=0.1,register.check_email=0.01"
+#                    (keys are Flask endpoints or logger names)
+
+# Import required modules
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import has_request_context, request
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Chatty call sites sampled by default (overridable via LOG_SAMPLE_RATES)
+_DEFAULT_SAMPLE_RATES = {
+    "register.check_email": 0.01,
+}
+
+
+def _parse_sample_rates(raw):
+    """Parse "key=rate,key=rate" into a dict merged over the defaults."""
+    rates = dict(_DEFAULT_SAMPLE_RATES)
+    for item in (raw or "").split(","):
+        key, sep, value = item.partition("=")
+        if sep and key.strip():
+            rates[key.strip()] = max(0.0, min(1.0, float(value)))
+    return rates
+
+
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES"))
+
+
+# =======================================================
+# Request Context and Sampling (Runs on the Request Thread)
+# =======================================================
+
+class RequestContextFilter(logging.Filter):
+    """
+    Attach method/path/endpoint to each record and apply per-route
+    sampling. Runs before the record is queued, while the request
+    context is still available.
+    """
+
+    def __init__(self, sample_rates):
+        super().__init__()
+        self.sample_rates = sample_rates
+
+    def filter(self, record):
+        endpoint = None
+        if has_request_context():
+            endpoint = request.endpoint
+            record.method = request.method
+            record.path = request.path
+            record.endpoint = endpoint
+        else:
+            record.method = record.path = record.endpoint = None
+
+        # Warnings and errors are never sampled away
+        if record.levelno >= logging.WARNING or not self.sample_rates:
+            return True
+        rate = self.sample_rates.get(endpoint, self.sample_rates.get(record.name, 1.0))
+        return rate >= 1.0 or random.random() < rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# =======================================================
+# Formatting (Runs on the Listener Thread)
+# =======================================================
+
+# Standard LogRecord attributes; anything else was passed via extra=
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Render a record as one JSON object, including extra= fields."""
+
+    def format(self, record):
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable line with the request path when there is one."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        if getattr(record, "path", None):
+            line += f" [{record.method} {record.path}]"
+        return line
+
+
+# =======================================================
+# Installation
+# =======================================================
+
+_install_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+
+
+def init_app(app):
+    """Route all logging through one queue and background writer (idempotent)."""
+    global _listener, _queue_handler
+
+    with _install_lock:
+        if _listener is None:
+            log_queue = queue.Queue(maxsize=max(1, LOG_QUEUE_SIZE))
+
+            # The only handler doing I/O lives on the listener thread
+            stream = logging.StreamHandler(sys.stderr)
+            stream.setFormatter(JSONFormatter() if LOG_FORMAT == "json" else TextFormatter())
+            _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop)
+
+            _queue_handler = DroppingQueueHandler(log_queue)
+            _queue_handler.addFilter(RequestContextFilter(LOG_SAMPLE_RATES))
+
+            # Replace whatever handlers were configured before (e.g. basicConfig)
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(_queue_handler)
+            root.setLevel(LOG_LEVEL)
+
+    # Let Flask's app logger propagate to the queued root handler
+    app.logger.handlers.clear()
+    app.logger.propagate = True
+
+
+def dropped_records():
+    """Number of records discarded because the queue was full."""
+    return _queue_handler.dropped if _queue_handler else 0
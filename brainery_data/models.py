@@ -6,49 +6,68 @@ Database Session User Adapter and Utility Models
 # Import Required Modules
 # =======================================================
 
-# Import logging for diagnostics
-import logging
-
 # Import Flask-Login mixin for session identity
 from flask_login import UserMixin
 
-# Configure logging level for this module
-logging.basicConfig(level=logging.ERROR)
-
 
 # =======================================================
-# SQL Session User Adapter
+# Compact Cached Session User
 # =======================================================
 
-class SessionUser(UserMixin):
+class CachedSessionUser:
     """
-    Minimal user object for Flask-Login sessions, backed by SQL rows.
-    Only includes fields the app actually uses.
+    Slotted Flask-Login user record held in the per-worker user cache.
+    Carries only what views and templates read (no password hash).
     """
 
-    def __init__(self, row):
-        # Primary key is int in SQL; Flask-Login expects string
-        self.id = str(getattr(row, "id", ""))
+    __slots__ = ("id", "username", "email", "role")
 
-        # Basic identity fields
-        self.username = getattr(row, "username", "") or ""
-        self.first_name = getattr(row, "first_name", "") or ""
-        self.last_name = getattr(row, "last_name", "") or ""
+    # Flask-Login identity flags (records only exist for real users)
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
 
-        # Normalised email (lowercased, trimmed)
-        email = getattr(row, "email", "") or ""
-        self.email = email.strip().lower()
+    def __init__(self, id, username, email, role):
+        # Primary key as string (what Flask-Login stores in the session)
+        self.id = str(id)
 
-        # Stored password hash (not used directly by Flask-Login)
-        self.password = getattr(row, "password", "") or ""
+        # Display name and normalised email
+        self.username = username or ""
+        self.email = (email or "").strip().lower()
 
         # Role string (defaults to "user")
-        self.role = (getattr(row, "role", "") or "user").lower()
+        self.role = (role or "user").lower()
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from a UserSQL row or a (id, username, email, role) row."""
+        return cls(row.id, row.username, row.email, row.role)
+
+    # Flask-Login looks users up again by this id
+    def get_id(self):
+        return self.id
 
     # Check if the current session user has admin role
     def is_admin(self):
         return self.role == "admin"
 
+    # Same identity semantics as UserMixin
+    def __eq__(self, other):
+        if isinstance(other, (CachedSessionUser, UserMixin)):
+            return self.get_id() == other.get_id()
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    # Defining __eq__ would otherwise make records unhashable
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"<CachedSessionUser {self.id} {self.role}>"
+
 
 # =======================================================
 # Resource Model (Container Only)
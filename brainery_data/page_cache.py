@@ -0,0 +1,212 @@
+# =======================================================
+# Rendered-Page Cache for Anonymous Visitors (TTL + LRU)
+# =======================================================
+# Pages such as the homepage render to the same HTML for every
+# anonymous visitor. Views decorated with @anonymous_page keep that
+# HTML per worker and skip Jinja on later hits.
+#
+# - Key: (script root / prefix, path, asset manifest version). Query
+#   strings (e.g. campaign utm_* tags) do not change the page and are
+#   not part of the key. A new asset build changes the key.
+# - Bypassed for logged-in sessions, remember-me cookies and pending
+#   flashes, and for anything but a 200 text/html GET.
+# - The per-session CSRF token is the only dynamic value. Pages are
+#   rendered with a placeholder for it, and each response gets the
+#   visitor's real token substituted in.
+
+# Import required modules
+import functools
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, request, session
+from flask_wtf.csrf import generate_csrf
+
+from brainery_data import assets
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Set PAGE_CACHE_ENABLED=0 to always render (template work)
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Lifetime of a rendered page
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("PAGE_CACHE_TTL_SECONDS", "300"))
+
+# Maximum pages per worker before least-recently-used eviction
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "64"))
+
+# Pages larger than this (bytes) are never stored
+PAGE_CACHE_MAX_PAGE_BYTES = int(os.getenv("PAGE_CACHE_MAX_PAGE_BYTES", str(512 * 1024)))
+
+# Stands in for csrf_token() while rendering (random per process)
+_CSRF_PLACEHOLDER = f"__page_cache_csrf_{secrets.token_hex(8)}__"
+
+
+# =======================================================
+# Cache Implementation
+# =======================================================
+
+class PageCache:
+    """Thread-safe TTL+LRU map of cache key -> rendered HTML."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # key -> (expires_at, html), oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters for diagnostics
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def get(self, key):
+        """Return the cached HTML for `key`, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, html):
+        """Store rendered HTML, evicting the least recently used pages."""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def note_bypass(self):
+        """Count a request that was not eligible for the cache."""
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self):
+        """Forget every page."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return size and hit/miss/bypass counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+            }
+
+
+# Single cache instance per worker process
+_cache = PageCache(PAGE_CACHE_MAX_ENTRIES, PAGE_CACHE_TTL_SECONDS)
+
+
+# =======================================================
+# Request Checks
+# =======================================================
+
+def _personalised():
+    """True if this visitor may see something other than the anonymous page."""
+    if request.method != "GET":
+        return True
+
+    # Logged in (or about to be, via the remember-me cookie)
+    if "_user_id" in session:
+        return True
+    remember_cookie = current_app.config.get("REMEMBER_COOKIE_NAME", "remember_token")
+    if remember_cookie in request.cookies:
+        return True
+
+    # Pending flashes must reach a normally rendered page
+    return bool(session.get("_flashes"))
+
+
+def _with_csrf(html):
+    """Substitute this visitor's CSRF token into cached HTML."""
+    if _CSRF_PLACEHOLDER not in html:
+        return html
+    return html.replace(_CSRF_PLACEHOLDER, generate_csrf())
+
+
+# =======================================================
+# Public API
+# =======================================================
+
+def anonymous_page(view):
+    """Serve `view` from the page cache for anonymous visitors."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not PAGE_CACHE_ENABLED or _personalised():
+            _cache.note_bypass()
+            return view(*args, **kwargs)
+
+        key = (request.script_root, request.path, assets.manifest_version())
+        html = _cache.get(key)
+        if html is None:
+            # Render once with the CSRF placeholder (see init_app)
+            g.page_cache_rendering = True
+            try:
+                resp = current_app.make_response(view(*args, **kwargs))
+            finally:
+                g.page_cache_rendering = False
+
+            if resp.is_streamed or resp.mimetype != "text/html":
+                return resp
+
+            # Only successful pages are shared; errors still get a real token
+            html = resp.get_data(as_text=True)
+            if resp.status_code == 200 and len(html) <= PAGE_CACHE_MAX_PAGE_BYTES:
+                _cache.put(key, html)
+
+            resp.set_data(_with_csrf(html))
+            return resp
+
+        return current_app.response_class(_with_csrf(html), mimetype="text/html")
+
+    return wrapper
+
+
+def clear():
+    """Drop every cached page (e.g. after editing page content)."""
+    _cache.clear()
+
+
+def stats():
+    """Return cache size and hit/miss/bypass counters for this worker."""
+    return _cache.stats()
+
+
+# =======================================================
+# Installation
+# =======================================================
+
+def init_app(app):
+    """
+    Render csrf_token() as a placeholder while a page is being cached.
+    Call after CSRFProtect.init_app: later context processors win.
+    """
+
+    @app.context_processor
+    def _page_cache_csrf():
+        if g.get("page_cache_rendering"):
+            return {"csrf_token": lambda: _CSRF_PLACEHOLDER}
+        return {}
@@ -0,0 +1,133 @@
+# =======================================================
+# Password Hashing Service (Bounded Executor)
+# =======================================================
+# PBKDF2/scrypt are deliberately slow. Running them inline lets a
+# login burst occupy every request thread, so hashing runs on a small
+# dedicated executor instead. Admission is capped: when the executor
+# and its queue are full, callers get HashingBusy immediately and the
+# route answers 503 instead of stacking up more CPU work.
+#
+# The cost is configured with PASSWORD_HASH_METHOD (any Werkzeug
+# method string). Stored hashes using other parameters are reported
+# by needs_rehash() so login can upgrade them transparently.
+# scripts/calibrate_password_hash.py reports the latency per setting.
+
+# Import required modules
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Werkzeug method string, e.g. "pbkdf2:sha256:600000" or "scrypt:32768:8:1"
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+
+# "thread" (hashlib releases the GIL) or "process"
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread").strip().lower()
+
+# Concurrent hashes per worker process
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Hashes admitted at once (running + queued) before failing fast
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4)))
+
+# Longest a request waits for its hash (seconds)
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+# Retry-After hint sent with 503 responses (seconds)
+RETRY_AFTER_SECONDS = 2
+
+
+# =======================================================
+# Errors
+# =======================================================
+
+class HashingBusy(RuntimeError):
+    """Raised when the hashing executor is saturated (answer 503)."""
+
+
+# =======================================================
+# Method Normalisation
+# =======================================================
+
+def normalise_method(method):
+    """Expand a Werkzeug method to the exact prefix it writes into hashes."""
+    parts = method.split(":")
+    if parts[0] == "pbkdf2":
+        name = parts[1] if len(parts) > 1 else "sha256"
+        iterations = parts[2] if len(parts) > 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{name}:{int(iterations)}"
+    if parts[0] == "scrypt":
+        n, r, p = (parts[1:] + ["32768", "8", "1"][len(parts) - 1:])[:3]
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    raise ValueError(f"Unsupported PASSWORD_HASH_METHOD {method!r}")
+
+
+# Prefix that current hashes start with (validated at import)
+_CURRENT_METHOD = normalise_method(PASSWORD_HASH_METHOD)
+
+
+def needs_rehash(stored_hash):
+    """True if `stored_hash` was produced with different parameters."""
+    return (stored_hash or "").split("$", 1)[0] != _CURRENT_METHOD
+
+
+# =======================================================
+# Executor and Admission Control
+# =======================================================
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(1, PASSWORD_HASH_MAX_PENDING))
+
+
+def _get_executor():
+    """Create the executor on first use (keeps forked workers independent)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                cls = ProcessPoolExecutor if PASSWORD_HASH_EXECUTOR == "process" else ThreadPoolExecutor
+                kwargs = {} if cls is ProcessPoolExecutor else {"thread_name_prefix": "password-hash"}
+                _executor = cls(max_workers=max(1, PASSWORD_HASH_WORKERS), **kwargs)
+    return _executor
+
+
+def _run(fn, *args):
+    """Run `fn` on the executor, failing fast when no slot is free."""
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy("password hashing capacity exhausted")
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+
+    # The slot is freed when the work finishes, even if we stop waiting
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+    except FutureTimeout as e:
+        raise HashingBusy("password hashing timed out") from e
+
+
+# =======================================================
+# Public API
+# =======================================================
+
+def hash_password(password):
+    """Hash `password` with the configured method (may raise HashingBusy)."""
+    return _run(generate_password_hash, password, _CURRENT_METHOD)
+
+
+def verify_password(stored_hash, password):
+    """Check `password` against `stored_hash` (may raise HashingBusy)."""
+    if not stored_hash:
+        return False
+    return _run(check_password_hash, stored_hash, password)
@@ -0,0 +1,232 @@
+# =======================================================
+# Token-Bucket Throttle for Unauthenticated Endpoints
+# =======================================================
+# Login and password reset cost a full password hash plus a DB lookup
+# per attempt. Each attempt first takes a token from a bucket per
+# client IP and one per normalised email; an empty bucket rejects the
+# request before any hashing or SQL runs.
+#
+# Buckets live in a pluggable store:
+#   RATE_LIMIT_STORE=memory                 per worker (default)
+#   RATE_LIMIT_STORE=sqlite:///path/to.db   shared by workers on one host
+#   RATE_LIMIT_STORE=package.module:factory any object with take()
+
+# Import required modules
+import hashlib
+import importlib
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Set RATE_LIMIT_ENABLED=0 to disable throttling (e.g. load tests)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Bucket store specification (see header)
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "memory").strip()
+
+# "<capacity>/<seconds>": burst size, refilled evenly over the period
+_DEFAULT_LIMITS = {
+    ("login", "ip"): "20/60",
+    ("login", "email"): "5/60",
+    ("reset_password", "ip"): "5/300",
+    ("reset_password", "email"): "3/300",
+}
+
+# Buckets kept by the in-memory store before LRU eviction
+MEMORY_STORE_MAX_KEYS = int(os.getenv("RATE_LIMIT_MEMORY_MAX_KEYS", "100000"))
+
+
+def _parse_limit(spec):
+    """Parse "capacity/seconds" into (capacity, tokens per second)."""
+    capacity, seconds = spec.split("/", 1)
+    capacity, seconds = float(capacity), float(seconds)
+    if capacity <= 0 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit {spec!r}")
+    return capacity, capacity / seconds
+
+
+def _limits():
+    """Read per-scope limits, e.g. RATE_LIMIT_LOGIN_IP=20/60."""
+    return {
+        (scope, kind): _parse_limit(os.getenv(f"RATE_LIMIT_{scope.upper()}_{kind.upper()}", default))
+        for (scope, kind), default in _DEFAULT_LIMITS.items()
+    }
+
+
+LIMITS = _limits()
+
+
+# =======================================================
+# Token Bucket Arithmetic
+# =======================================================
+
+def _refill(tokens, updated, now, capacity, rate):
+    """Return the token count after refilling from `updated` to `now`."""
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def _decide(tokens, capacity, rate, cost):
+    """Return (allowed, tokens_left, retry_after_seconds)."""
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / rate
+
+
+# =======================================================
+# Stores
+# =======================================================
+
+class MemoryStore:
+    """Per-process buckets with LRU eviction (state is not shared between workers)."""
+
+    def __init__(self, max_keys=MEMORY_STORE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost=1.0):
+        """Take `cost` tokens from `key`; return (allowed, retry_after)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            allowed, tokens, retry_after = _decide(tokens, capacity, rate, cost)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class SQLiteStore:
+    """Buckets in a small SQLite file, shared by every worker on the host."""
+
+    # Delete buckets that have been full (idle) for this long, every N takes
+    _PRUNE_EVERY = 1000
+    _PRUNE_IDLE_SECONDS = 3600
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        # itertools.count: next() is atomic, so threads never lose a take
+        self._takes = itertools.count(1)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _conn(self):
+        """One autocommit connection per thread (WAL keeps readers unblocked)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, rate, cost=1.0):
+        """Take `cost` tokens from `key`; return (allowed, retry_after)."""
+        # Wall-clock time: buckets are compared across processes
+        now = time.time()
+        conn = self._conn()
+
+        # BEGIN IMMEDIATE serialises read-modify-write across workers
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            allowed, tokens, retry_after = _decide(tokens, capacity, rate, cost)
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            # A failed COMMIT may already have ended the transaction; a
+            # ROLLBACK then would raise and hide the original error
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+        # Occasionally drop idle buckets so the file stays small
+        if next(self._takes) % self._PRUNE_EVERY == 0:
+            conn.execute(
+                "DELETE FROM rate_limit_buckets WHERE updated < ?",
+                (now - self._PRUNE_IDLE_SECONDS,),
+            )
+        return allowed, retry_after
+
+
+def make_store(spec):
+    """Build a bucket store from a RATE_LIMIT_STORE specification."""
+    if spec in ("", "memory"):
+        return MemoryStore()
+    if spec.startswith("sqlite:///"):
+        return SQLiteStore(spec[len("sqlite:///"):])
+    if ":" in spec:
+        module, attr = spec.split(":", 1)
+        return getattr(importlib.import_module(module), attr)()
+    raise ValueError(f"Unknown RATE_LIMIT_STORE {spec!r}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the configured store, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = make_store(RATE_LIMIT_STORE)
+    return _store
+
+
+# =======================================================
+# Public API
+# =======================================================
+
+def _email_key(email):
+    """Normalise an email and hash it (no addresses stored in bucket keys)."""
+    normalised = (email or "").strip().lower()
+    if not normalised:
+        return None
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()[:32]
+
+
+def hit(scope, ip, email=None):
+    """
+    Record one attempt at `scope` ("login" / "reset_password").
+    Returns None when allowed, or the seconds to wait when throttled.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return None
+
+    store = get_store()
+    keys = [("ip", ip or "unknown"), ("email", _email_key(email))]
+
+    # Every bucket is charged so an attacker cannot probe one side freely
+    wait = 0.0
+    for kind, value in keys:
+        if value is None:
+            continue
+        capacity, rate = LIMITS[(scope, kind)]
+        allowed, retry_after = store.take(f"{scope}:{kind}:{value}", capacity, rate)
+        if not allowed:
+            wait = max(wait, retry_after)
+    return max(1, int(wait + 0.999)) if wait else None
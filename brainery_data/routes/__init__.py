@@ -17,9 +17,21 @@ from dotenv import load_dotenv
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Import session/user wrappers for SQL-backed auth
-from brainery_data.sql.db import SessionLocal
+from brainery_data.sql.db import get_db, init_app as init_db
 from brainery_data.sql.models import UserSQL
-from brainery_data.models import SessionUser
+from brainery_data import user_cache
+
+# Per-request DB/template/JSON timing (Server-Timing) and queued logging
+from brainery_data import instrumentation, logging_setup
+
+# Fingerprinted static assets (asset_url() and immutable static serving)
+from brainery_data import assets
+
+# On-the-fly gzip/brotli for HTML/JSON when no proxy compresses
+from brainery_data import compression
+
+# Rendered HTML for anonymous visitors (homepage)
+from brainery_data import page_cache
 
 
 # =======================================================
@@ -73,6 +85,30 @@ def create_app():
         app.config["APPLICATION_ROOT"] = _prefix
         app.config["SESSION_COOKIE_PATH"] = _prefix
 
+    # =======================================================
+    # Logging (Queue-Based, Environment-Driven)
+    # =======================================================
+
+    # Request threads enqueue records; one background thread writes them
+    logging_setup.init_app(app)
+
+    # =======================================================
+    # Static Assets (Fingerprinted Build Output)
+    # =======================================================
+
+    # asset_url() for templates; hashed files served immutable and pre-compressed
+    assets.init_app(app)
+
+    # =======================================================
+    # Request-Scoped Database Session
+    # =======================================================
+
+    # One lazily-connected session per request, released at teardown
+    init_db(app)
+
+    # Time SQL, templates and JSON per request (Server-Timing header)
+    instrumentation.init_app(app)
+
     # =======================================================
     # Security and Authentication Features
     # =======================================================
@@ -83,25 +119,22 @@ def create_app():
     login_manager.login_view = "auth.login"
     login_manager.login_message_category = "info"
 
+    # Anonymous pages render once per worker; registered after CSRFProtect
+    # so its csrf_token placeholder overrides Flask-WTF's while caching
+    page_cache.init_app(app)
+
     # Flask-Login user loader function for SQL
     @login_manager.user_loader
     def load_user(user_id):
-        """Reload user from SQL for Flask-Login sessions."""
+        """Reload user for Flask-Login sessions (per-worker cache, SQL on miss)."""
         # Convert the string id to int for SQL PK
         try:
             uid = int(user_id)
         except (TypeError, ValueError):
             return None
 
-        # Open a DB session and fetch the user
-        db = SessionLocal()
-        try:
-            row = db.get(UserSQL, uid)
-            if row:
-                return SessionUser(row)
-            return None
-        finally:
-            db.close()
+        # Compact cached record; unknown ids are negatively cached
+        return user_cache.load_user(uid)
 
     # =======================================================
     # Proxy & Middleware Configuration
@@ -109,6 +142,9 @@ def create_app():
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
     app.wsgi_app = _PrefixFromHeaderMiddleware(app.wsgi_app)
 
+    # Outermost: compress the final response bytes (Vary: Accept-Encoding)
+    compression.init_app(app)
+
     # =======================================================
     # Register Application Blueprints (Prefix-Aware)
     # =======================================================
@@ -144,21 +180,18 @@ def create_app():
 def test_db():
     """Function to test the SQL database connection."""
     try:
-        # Open a DB session
-        db = SessionLocal()
-        try:
-            # Try to fetch a user row (or confirm empty table)
-            row = db.query(UserSQL).first()
-            if row:
-                return jsonify({
-                    "message": "Database connection successful!",
-                    "sample_user": {"id": row.id, "email": row.email}
-                }), 200
-            else:
-                return jsonify({"message": "Database connected, but no users found!"}), 200
-        finally:
-            # Always close the session
-            db.close()
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
+
+        # Try to fetch a user row (or confirm empty table)
+        row = db.query(UserSQL).first()
+        if row:
+            return jsonify({
+                "message": "Database connection successful!",
+                "sample_user": {"id": row.id, "email": row.email}
+            }), 200
+        else:
+            return jsonify({"message": "Database connected, but no users found!"}), 200
     except Exception as e:
         # Return error in JSON for quick visibility
         return jsonify({"error": str(e)}), 500
@@ -11,9 +11,19 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request,
 # Import login utilities
 from flask_login import login_required, current_user
 
-# Import SQL session and models
-from brainery_data.sql.db import SessionLocal
+# Import SQLAlchemy expression helpers
+from sqlalchemy import and_, delete, func, select, union, update
+
+# Import SQL session, models and keyset pagination helpers
+from brainery_data.sql.db import get_db, pool_stats
 from brainery_data.sql.models import UserSQL
+from brainery_data.sql.pagination import InvalidCursor, decode_cursor, encode_cursor, page_size, seek_after
+
+# Import the in-process subject/topic catalogue, query statistics and counters
+from brainery_data.sql import catalogue, counters, query_stats
+
+# Import the session user cache (invalidated on role changes/deletes)
+from brainery_data import user_cache
 
 
 # =======================================================
@@ -23,6 +33,20 @@ from brainery_data.sql.models import UserSQL
 # Blueprint for admin routes
 admin = Blueprint("admin", __name__, url_prefix="/admin")
 
+# Admin user table page sizes
+USERS_PAGE_SIZE = 50
+USERS_MAX_PAGE_SIZE = 200
+
+# Maximum number of ids accepted by the bulk promote/delete endpoints
+USERS_MAX_BATCH = 500
+
+# Sortable user columns (each backed by an index; id breaks ties)
+USER_SORT_COLUMNS = {
+    "created": UserSQL.created_at,
+    "email": UserSQL.email_normalized,
+    "username": UserSQL.username,
+}
+
 
 # =======================================================
 # Admin Dashboard Route
@@ -38,21 +62,131 @@ def admin_dashboard():
         flash("Unauthorized access!", "danger")
         return redirect(url_for("dashboard.dashboard_main"))
 
-    # Create SQL session
-    db = SessionLocal()
-    try:
-        # Retrieve all users from the database
-        users = db.query(UserSQL).all()
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
 
-        # Count system statistics
-        total_users = db.query(UserSQL).count()
-        admin_users = db.query(UserSQL).filter(UserSQL.role == "admin").count()
-    finally:
-        # Always close the session
-        db.close()
+    # Read the maintained counters (the user table itself is fetched page by page)
+    total_users, admin_users = counters.user_counts(db)
 
     # Render admin dashboard template
-    return render_template("admin.html", users=users, total_users=total_users, admin_users=admin_users)
+    return render_template("admin.html", total_users=total_users, admin_users=admin_users)
+
+
+# =======================================================
+# List Users (Search, Sort, Keyset Pagination)
+# =======================================================
+
+def _escape_like(value):
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix(db, expr, q):
+    """
+    Prefix match on a lower-case column/expression that an index can seek:
+    LIKE on PostgreSQL (text_pattern_ops indexes), a range elsewhere
+    (SQLite's LIKE is case-insensitive and never uses these indexes).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return expr.like(_escape_like(q) + "%", escape="\\")
+    return and_(expr >= q, expr < q + "\uffff")
+
+
+@admin.route("/users", methods=["GET"])
+@login_required
+def list_users():
+    """
+    Return one page of users for the admin table.
+    Accepts ?q= (email/username prefix), ?sort= created|email|username,
+    ?dir= asc|desc, ?limit= and an opaque ?cursor=; the next page is
+    advertised through a Link: <...>; rel="next" header.
+    """
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    # Resolve search, sort order and page size
+    q = (request.args.get("q") or "").strip().lower()
+    sort = request.args.get("sort", "created")
+    if sort not in USER_SORT_COLUMNS:
+        return jsonify({"error": "Invalid sort"}), 400
+    direction = request.args.get("dir", "desc" if sort == "created" else "asc")
+    if direction not in ("asc", "desc"):
+        return jsonify({"error": "Invalid sort direction"}), 400
+    descending = direction == "desc"
+    limit = page_size(request.args.get("limit"), USERS_PAGE_SIZE, USERS_MAX_PAGE_SIZE)
+
+    # Decode the position to resume from (must match the requested sort)
+    cursor = request.args.get("cursor") or None
+    try:
+        after = decode_cursor(cursor, 4) if cursor else None
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+    if after and after[:2] != [sort, direction]:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
+    try:
+        # Only the columns the table shows (never the password hash)
+        sort_col = USER_SORT_COLUMNS[sort]
+        page = select(
+            UserSQL.id, UserSQL.username, UserSQL.email, UserSQL.role, UserSQL.created_at,
+            sort_col.label("sort_key"),
+        )
+
+        # Seek past the last row of the previous page
+        if after:
+            page = page.where(seek_after((sort_col, UserSQL.id), after[2:], descending=descending))
+
+        # Prefix search: one seek on the email_normalized index and one on
+        # ix_users_username_lower, combined with UNION (an OR of the two
+        # would make either dialect scan the whole table)
+        if q:
+            matches = union(
+                page.where(_prefix(db, UserSQL.email_normalized, q)),
+                page.where(_prefix(db, func.lower(UserSQL.username), q)),
+            ).subquery()
+            page = select(matches)
+            sort_key, row_id = matches.c.sort_key, matches.c.id
+        else:
+            sort_key, row_id = sort_col, UserSQL.id
+
+        # Fetch one extra row to learn whether another page exists
+        order = (sort_key.desc(), row_id.desc()) if descending else (sort_key.asc(), row_id.asc())
+        rows = db.execute(page.order_by(*order).limit(limit + 1)).all()
+
+        # Split the look-ahead row off and build the next-page link
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_url = url_for(
+                "admin.list_users",
+                q=q or None,
+                sort=sort,
+                dir=direction,
+                limit=limit,
+                cursor=encode_cursor(sort, direction, last.sort_key, last.id),
+            )
+
+        resp = jsonify([
+            {
+                "id": r.id,
+                "username": r.username,
+                "email": r.email,
+                "role": r.role,
+                "created_at": r.created_at.isoformat() if r.created_at else None,
+            }
+            for r in rows
+        ])
+        if next_url:
+            resp.headers["Link"] = f'<{next_url}>; rel="next"'
+        return resp, 200
+    except Exception as e:
+        logging.error("Error listing users: %s", e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
 
 
 # =======================================================
@@ -68,11 +202,11 @@ def promote_user(user_id):
     if current_user.role != "admin":
         return jsonify({"error": "Unauthorized"}), 403
 
-    # Create SQL session
-    db = SessionLocal()
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
     try:
-        # Fetch target user by id
-        user = db.get(UserSQL, user_id)
+        # Fetch and lock the target user so a concurrent promote/delete waits
+        user = db.get(UserSQL, user_id, with_for_update=True)
         if not user:
             return jsonify({"error": "User not found"}), 404
 
@@ -81,14 +215,16 @@ def promote_user(user_id):
             return jsonify({"error": "User is already an admin"}), 400
 
         user.role = "admin"
+        counters.bump(db, counters.USERS_ADMIN, 1)
         db.commit()
+
+        # Make the new role visible on this worker's next request
+        user_cache.invalidate_user(user_id)
         return jsonify({"success": True}), 200
     except Exception as e:
         logging.error("Error promoting user: %s", e, exc_info=True)
         db.rollback()
         return jsonify({"error": "Internal server error"}), 500
-    finally:
-        db.close()
 
 
 # =======================================================
@@ -104,21 +240,297 @@ def delete_user(user_id):
     if current_user.role != "admin":
         return jsonify({"error": "Unauthorized"}), 403
 
-    # Create SQL session
-    db = SessionLocal()
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
     try:
-        # Fetch target user by id
-        user = db.get(UserSQL, user_id)
+        # Fetch and lock the target user so a concurrent promote/delete waits
+        user = db.get(UserSQL, user_id, with_for_update=True)
         if not user:
             return jsonify({"error": "User not found"}), 404
 
-        # Delete user
+        # Delete user and adjust the counters in the same transaction
+        if user.role == "admin":
+            counters.bump(db, counters.USERS_ADMIN, -1)
+        counters.bump(db, counters.USERS_TOTAL, -1)
         db.delete(user)
         db.commit()
+
+        # Stop serving the deleted user from the session cache
+        user_cache.invalidate_user(user_id)
         return jsonify({"success": True}), 200
     except Exception as e:
         logging.error("Error deleting user: %s", e, exc_info=True)
         db.rollback()
         return jsonify({"error": "Internal server error"}), 500
-    finally:
-        db.close()
\ No newline at end of file
+
+
+# =======================================================
+# Bulk Promote / Delete
+# =======================================================
+
+def _bulk_ids():
+    """
+    Parse { "ids": [...] } from the request body.
+    Returns (ids, results, error): valid ids in request order (deduplicated),
+    per-item results pre-filled for invalid entries, or an error response.
+    """
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get("ids")
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return None, None, (jsonify({"error": "Invalid data - ids missing"}), 400)
+    if len(raw_ids) > USERS_MAX_BATCH:
+        return None, None, (jsonify({"error": f"Too many ids (max {USERS_MAX_BATCH})"}), 400)
+
+    ids, results, seen = [], [], set()
+    for raw in raw_ids:
+        try:
+            uid = int(raw)
+        except (TypeError, ValueError):
+            results.append({"id": raw, "status": 400, "error": "Invalid user id"})
+            continue
+        if uid in seen:
+            continue
+        seen.add(uid)
+        ids.append(uid)
+    return ids, results, None
+
+
+@admin.route("/users/promote", methods=["POST"])
+@login_required
+def bulk_promote_users():
+    """
+    Promote many users to admin with one UPDATE … WHERE id IN (…).
+    Expects JSON: { "ids": [1, 2, ...] } and returns one result per id.
+    """
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    ids, results, error = _bulk_ids()
+    if error:
+        return error
+
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
+    try:
+        # One locked read tells us which ids exist and their current roles
+        roles = dict(
+            db.query(UserSQL.id, UserSQL.role)
+              .filter(UserSQL.id.in_(ids))
+              .with_for_update()
+              .all()
+        ) if ids else {}
+
+        # Only users that are not already admins are updated
+        targets = [uid for uid in ids if uid in roles and roles[uid] != "admin"]
+        if targets:
+            db.execute(
+                update(UserSQL)
+                .where(UserSQL.id.in_(targets))
+                .values(role="admin")
+                .execution_options(synchronize_session=False)
+            )
+            counters.bump(db, counters.USERS_ADMIN, len(targets))
+        db.commit()
+
+        # Make the new roles visible on this worker's next request
+        for uid in targets:
+            user_cache.invalidate_user(uid)
+
+        # Report one outcome per requested id
+        for uid in ids:
+            if uid not in roles:
+                results.append({"id": uid, "status": 404, "error": "User not found"})
+            elif roles[uid] == "admin":
+                results.append({"id": uid, "status": 400, "error": "User is already an admin"})
+            else:
+                results.append({"id": uid, "status": 200})
+
+        return jsonify({"success": True, "promoted": len(targets), "results": results}), 200
+    except Exception as e:
+        logging.error("Error bulk promoting users: %s", e, exc_info=True)
+        db.rollback()
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@admin.route("/users/delete", methods=["POST"])
+@login_required
+def bulk_delete_users():
+    """
+    Delete many users with one DELETE … WHERE id IN (…).
+    Expects JSON: { "ids": [1, 2, ...] } and returns one result per id.
+    The requesting admin's own account is never deleted in bulk.
+    """
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    ids, results, error = _bulk_ids()
+    if error:
+        return error
+
+    # Guard against "select all" removing the caller's own account
+    try:
+        self_id = int(current_user.id)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid user context"}), 400
+
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
+    try:
+        # One locked read tells us which ids exist and how many are admins
+        roles = dict(
+            db.query(UserSQL.id, UserSQL.role)
+              .filter(UserSQL.id.in_(ids))
+              .with_for_update()
+              .all()
+        ) if ids else {}
+
+        # Saved topics/resources go with their owner via ON DELETE CASCADE
+        targets = [uid for uid in ids if uid in roles and uid != self_id]
+        if targets:
+            db.execute(
+                delete(UserSQL)
+                .where(UserSQL.id.in_(targets))
+                .execution_options(synchronize_session=False)
+            )
+            admins = sum(1 for uid in targets if roles[uid] == "admin")
+            if admins:
+                counters.bump(db, counters.USERS_ADMIN, -admins)
+            counters.bump(db, counters.USERS_TOTAL, -len(targets))
+        db.commit()
+
+        # Stop serving the deleted users from the session cache
+        for uid in targets:
+            user_cache.invalidate_user(uid)
+
+        # Report one outcome per requested id
+        for uid in ids:
+            if uid not in roles:
+                results.append({"id": uid, "status": 404, "error": "User not found"})
+            elif uid == self_id:
+                results.append({"id": uid, "status": 400, "error": "Cannot delete your own account"})
+            else:
+                results.append({"id": uid, "status": 200})
+
+        return jsonify({"success": True, "deleted": len(targets), "results": results}), 200
+    except Exception as e:
+        logging.error("Error bulk deleting users: %s", e, exc_info=True)
+        db.rollback()
+        return jsonify({"error": "Internal server error"}), 500
+
+
+# =======================================================
+# Reconcile Counters
+# =======================================================
+
+@admin.route("/counters/reconcile", methods=["POST"])
+@login_required
+def reconcile_counters():
+    """Recompute the dashboard counters and report any drift that was fixed."""
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
+    try:
+        drift = counters.reconcile(db)
+        return jsonify({
+            "success": True,
+            "drift": {name: {"stored": old, "actual": new} for name, (old, new) in drift.items()},
+        }), 200
+    except Exception as e:
+        logging.error("Error reconciling counters: %s", e, exc_info=True)
+        db.rollback()
+        return jsonify({"error": "Internal server error"}), 500
+
+
+# =======================================================
+# Reload Subject/Topic Catalogue
+# =======================================================
+
+@admin.route("/catalogue/reload", methods=["POST"])
+@login_required
+def reload_catalogue():
+    """Hot-reload this worker's subject/topic catalogue snapshot."""
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    try:
+        # Rebuild synchronously so the response reflects the new data
+        snap = catalogue.reload()
+        return jsonify({
+            "success": True,
+            "version": snap.version,
+            "subjects": len(snap.subjects),
+            "topics": snap.topic_count(),
+        }), 200
+    except Exception as e:
+        logging.error("Error reloading catalogue: %s", e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+
+
+# =======================================================
+# Connection Pool Statistics
+# =======================================================
+
+@admin.route("/pool_stats", methods=["GET"])
+@login_required
+def get_pool_stats():
+    """Return this worker's connection pool state and checkout/wait counters."""
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    return jsonify(pool_stats()), 200
+
+
+
+# =======================================================
+# Query Fingerprint Report
+# =======================================================
+
+@admin.route("/query_stats", methods=["GET"])
+@login_required
+def get_query_stats():
+    """
+    Return this worker's heaviest SQL fingerprints.
+    Accepts ?limit= (default 50) and ?order= total|count|p95|max.
+    """
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    # Parse report options
+    try:
+        limit = max(1, min(int(request.args.get("limit", 50)), 500))
+    except (TypeError, ValueError):
+        limit = 50
+    order = request.args.get("order", "total")
+
+    return jsonify({
+        "slow_query_ms": query_stats.SLOW_QUERY_MS,
+        "fingerprints": query_stats.report(limit=limit, order_by=order),
+    }), 200
+
+
+@admin.route("/query_stats/reset", methods=["POST"])
+@login_required
+def reset_query_stats():
+    """Clear this worker's query fingerprint statistics."""
+
+    # Ensure current user is admin
+    if current_user.role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    query_stats.reset()
+    return jsonify({"success": True}), 200
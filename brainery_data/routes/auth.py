@@ -8,19 +8,16 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 # Import Flask-Login helpers
 from flask_login import login_user, logout_user, login_required, current_user
 
-# Import password hashing utilities
-from werkzeug.security import check_password_hash, generate_password_hash
+# Import the bounded password hashing service and the login throttle
+from brainery_data import passwords, rate_limit
 
 # Import database session/model
-from brainery_data.sql.db import SessionLocal
-from brainery_data.sql.models import UserSQL
+from brainery_data.sql.db import get_db
+from brainery_data.sql.users import find_user_by_email
 
-# Import forms and session user adapter
+# Import forms and the session user cache
 from brainery_data.routes.form import LoginForm
-from brainery_data.models import SessionUser
-
-# Import SQL helpers
-from sqlalchemy import func
+from brainery_data import user_cache
 
 
 # =======================================================
@@ -43,30 +40,45 @@ def login():
     # Instantiate login form
     form = LoginForm()
 
+    # Throttle per IP and email before any hashing or SQL work
+    if request.method == "POST":
+        retry_after = rate_limit.hit("login", request.remote_addr, request.form.get("email"))
+        if retry_after:
+            flash("Too many login attempts. Please wait a moment and try again.", "danger")
+            return render_template("login.html", form=form), 429, {"Retry-After": str(retry_after)}
+
     # Validate and process POST submissions
     if form.validate_on_submit():
         # Normalise inputs
         email = (form.email.data or "").strip().lower()
         password = (form.password.data or "").strip()
 
-        # Open database session and look up user by case-insensitive email
-        db = SessionLocal()
+        # Look up user by normalised email (indexed) on the request-scoped session
+        db = get_db()
+        sql_user = find_user_by_email(db, email)
+
+        # Check credentials on the hashing executor (503 when saturated)
         try:
-            sql_user = (
-                db.query(UserSQL)
-                  .filter(func.lower(UserSQL.email) == email)
-                  .one_or_none()
-            )
-        finally:
-            db.close()
-
-        # Check credentials
-        if not sql_user or not check_password_hash(sql_user.password or "", password):
+            valid = sql_user is not None and passwords.verify_password(sql_user.password, password)
+        except passwords.HashingBusy:
+            flash("The server is busy. Please try again in a moment.", "warning")
+            return render_template("login.html", form=form), 503, {"Retry-After": str(passwords.RETRY_AFTER_SECONDS)}
+
+        if not valid:
             flash("Invalid email or password.", "danger")
             return render_template("login.html", form=form)
 
-        # Build session user from DB row and log them in
-        user_obj = SessionUser(sql_user)
+        # Transparently upgrade hashes made with outdated parameters
+        if passwords.needs_rehash(sql_user.password):
+            try:
+                sql_user.password = passwords.hash_password(password)
+                db.commit()
+            except passwords.HashingBusy:
+                # Keep the old hash; a later login will upgrade it
+                db.rollback()
+
+        # Build the compact session user (priming the cache) and log them in
+        user_obj = user_cache.prime_user(sql_user)
         login_user(user_obj, remember=True)
 
         # Role-based redirect
@@ -127,36 +139,40 @@ def reset_password():
     except Exception:
         return jsonify({"error": "Invalid JSON format"}), 400
 
+    # Throttle per IP and email before any hashing or SQL work
+    retry_after = rate_limit.hit("reset_password", request.remote_addr, email)
+    if retry_after:
+        return jsonify({"error": "Too many attempts. Please try again later."}), 429, {"Retry-After": str(retry_after)}
+
     # Basic validation
     if not email or not new_password:
         return jsonify({"error": "Email and new password are required."}), 400
     if len(new_password) < 6:
         return jsonify({"error": "Password must be at least 6 characters long."}), 400
 
-    # Hash new password
-    hashed = generate_password_hash(new_password)
-
-    # Open database session
-    db = SessionLocal()
+    # Hash new password on the hashing executor (503 when saturated)
     try:
-        # Case-insensitive email lookup
-        user = (
-            db.query(UserSQL)
-              .filter(func.lower(UserSQL.email) == email)
-              .one_or_none()
-        )
-
-        # Fail if no matching user
-        if not user:
-            return jsonify({"error": "User not found."}), 404
-
-        # Update password and commit
-        user.password = hashed
-        db.commit()
-
-        # Success response
-        return jsonify({"message": "Password reset successful."}), 200
-
-    # Always close session
-    finally:
-        db.close()
\ No newline at end of file
+        hashed = passwords.hash_password(new_password)
+    except passwords.HashingBusy:
+        return jsonify({"error": "Server busy, please retry."}), 503, {"Retry-After": str(passwords.RETRY_AFTER_SECONDS)}
+
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
+
+    # Normalised (indexed) email lookup
+    user = find_user_by_email(db, email)
+
+    # Fail if no matching user
+    if not user:
+        return jsonify({"error": "User not found."}), 404
+
+    # Update password and commit
+    user.password = hashed
+    user_id = user.id
+    db.commit()
+
+    # Drop any cached session record for this user
+    user_cache.invalidate_user(user_id)
+
+    # Success response
+    return jsonify({"message": "Password reset successful."}), 200
\ No newline at end of file
@@ -2,15 +2,32 @@
 # User Routes
 # =======================================================
 
+# Import logging for diagnostics
+import logging
+
 # Import Flask primitives for views, JSON responses, and redirects
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session
 
 # Import login/session helpers
 from flask_login import login_required, current_user, logout_user
 
+# Import SQL helpers
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
 # Import database session and models
-from brainery_data.sql.db import SessionLocal
-from brainery_data.sql.models import Subject, Topic, SavedTopic
+from brainery_data.sql.db import get_db
+from brainery_data.sql.models import SavedTopic
+from brainery_data.sql.saved_topics import DEFAULT_SUMMARY, insert_saved_topic
+
+# Import the in-process subject/topic catalogue, full-text search and type-ahead
+from brainery_data.sql import catalogue, search, suggest
+
+# Import conditional (ETag) response helpers
+from brainery_data.http_cache import cached_json, make_etag
+
+# Import keyset pagination helpers
+from brainery_data.sql.pagination import InvalidCursor, decode_cursor, encode_cursor, page_size, seek_after
 
 
 # =======================================================
@@ -20,6 +37,26 @@ from brainery_data.sql.models import Subject, Topic, SavedTopic
 # Create the dashboard blueprint with URL prefix /dashboard
 dashboard = Blueprint("dashboard", __name__, url_prefix="/dashboard")
 
+# Module logger (configured centrally in create_app; never blocks on I/O)
+logger = logging.getLogger(__name__)
+
+# Saved-topic page sizes (default and hard cap for ?limit=)
+SAVED_TOPICS_PAGE_SIZE = 30
+SAVED_TOPICS_MAX_PAGE_SIZE = 100
+
+# Maximum number of operations accepted by /saved_topics/batch
+SAVED_TOPICS_MAX_BATCH = 200
+
+# Search page sizes and the deepest offset served
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+SEARCH_MAX_OFFSET = 1000
+SEARCH_MAX_QUERY_LENGTH = 200
+
+# Type-ahead suggestion counts (default and hard cap for ?k=)
+SUGGEST_DEFAULT_K = 8
+SUGGEST_MAX_K = 20
+
 
 # =======================================================
 # Dashboard Home Route (Main Dashboard)
@@ -31,7 +68,7 @@ def dashboard_main():
     """Render the main dashboard page for logged-in users."""
 
     # Log who is visiting for diagnostic purposes
-    print(f"🔍 Current User: {current_user} (ID: {current_user.id})")
+    logger.debug("🔍 Current User ID: %s", current_user.id)
 
     # Render the dashboard template (no DB access required here)
     return render_template("dashboard.html")
@@ -44,30 +81,18 @@ def dashboard_main():
 @dashboard.route("/subjects", methods=["GET"])
 @login_required
 def get_subjects():
-    """Fetch all subjects from the database and return as JSON."""
+    """Return all subjects from the in-process catalogue snapshot as JSON."""
 
     try:
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
-        try:
-            # Query all subjects ordered by name (A→Z)
-            rows = db.query(Subject).order_by(Subject.name.asc()).all()
-        finally:
-            # Ensure the session is closed even on errors
-            db.close()
-
-        # Shape results for the UI (keep _id as string for data attributes)
-        subjects = [
-            {"_id": str(s.id), "name": s.name, "icon": s.icon or ""}
-            for s in rows
-        ]
+        # Served from memory; the snapshot reloads itself after catalogue writes
+        snap = catalogue.get_snapshot()
 
-        # Return JSON payload
-        return jsonify(subjects), 200
+        # Return JSON payload (or 304 if the client's copy is current)
+        return cached_json(lambda: snap.subjects, etag=snap.subjects_digest, shared=True)
 
     except Exception as e:
         # Log the error and return a safe message
-        print(f"🚨 Error Fetching Subjects (SQL): {e}")
+        logger.error("🚨 Error Fetching Subjects (SQL): %s", e, exc_info=True)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
@@ -87,32 +112,95 @@ def get_topics(subject_id):
         return jsonify({"error": "Invalid Subject ID"}), 400
 
     try:
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
-        try:
-            # Query topics for the given subject id; order alphabetically by title
-            rows = (
-                db.query(Topic)
-                  .filter(Topic.subject_id == sid)
-                  .order_by(Topic.title.asc())
-                  .all()
-            )
-        finally:
-            # Always close the session
-            db.close()
+        # Topics are pre-sorted by title inside the catalogue snapshot
+        topics, digest = catalogue.get_snapshot().topics_for(sid)
 
-        # Reduce fields to what the UI expects
-        topics = [
-            {"title": t.title, "description": t.description or ""}
-            for t in rows
-        ]
+        # Return JSON payload (or 304 if the client's copy is current)
+        return cached_json(lambda: topics, etag=digest, shared=True)
 
-        # Return JSON payload
-        return jsonify(topics), 200
+    except Exception as e:
+        # Log the error and return a safe message
+        logger.error("🚨 Error Fetching Topics (SQL): %s", e, exc_info=True)
+        return jsonify({"error": "Internal Server Error"}), 500
+
+
+# =======================================================
+# Full-Text Topic Search
+# =======================================================
+
+@dashboard.route("/search", methods=["GET"])
+@login_required
+def search_topics():
+    """
+    Ranked full-text search over topic titles and descriptions.
+    Accepts ?q=, ?limit= and ?offset=; matches come back best first
+    with <mark>-highlighted title/snippet HTML.
+    """
+
+    # Validate the query text
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Query required"}), 400
+    if len(q) > SEARCH_MAX_QUERY_LENGTH:
+        return jsonify({"error": "Query too long"}), 400
+
+    # Resolve the requested page
+    limit = page_size(request.args.get("limit"), SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE)
+    try:
+        offset = max(0, int(request.args.get("offset") or 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid offset"}), 400
+    if offset > SEARCH_MAX_OFFSET:
+        return jsonify({"error": "Offset too large"}), 400
+
+    try:
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
+        if not search.supported(db):
+            return jsonify({"error": "Search is not available"}), 501
+
+        # Fetch one extra match to learn whether another page exists
+        results = search.search_topics(db, q, limit + 1, offset)
+        has_more = len(results) > limit
+
+        return jsonify({
+            "query": q,
+            "results": results[:limit],
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if has_more else None,
+        }), 200
 
     except Exception as e:
         # Log the error and return a safe message
-        print(f"🚨 Error Fetching Topics (SQL): {e}")
+        logger.error("🚨 Error Searching Topics (SQL): %s", e, exc_info=True)
+        return jsonify({"error": "Internal Server Error"}), 500
+
+
+# =======================================================
+# Type-Ahead Suggestions
+# =======================================================
+
+@dashboard.route("/suggest", methods=["GET"])
+@login_required
+def suggest_topics():
+    """
+    Return the top-k fuzzy matches for a partial query (?q=, ?k=).
+    Answered from the in-memory trigram index; no SQL per keystroke.
+    """
+
+    # Short or empty input yields no suggestions rather than an error
+    q = (request.args.get("q") or "").strip()
+    k = page_size(request.args.get("k"), SUGGEST_DEFAULT_K, SUGGEST_MAX_K)
+    if not q:
+        return jsonify([]), 200
+
+    try:
+        return jsonify(suggest.suggest(q, k)), 200
+
+    except Exception as e:
+        # Log the error and return a safe message
+        logger.error("🚨 Error Suggesting Topics: %s", e, exc_info=True)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
@@ -132,34 +220,30 @@ def get_topic(topic_id):
         return jsonify({"error": "Invalid Topic ID format"}), 400
 
     try:
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
-        try:
-            # Fetch the saved topic by primary key
-            row = db.get(SavedTopic, tid)
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
 
-            # Enforce ownership: topic must belong to the current user
-            if not row or str(row.user_id) != str(current_user.id):
-                return jsonify({"error": "Topic not found"}), 404
+        # Fetch the saved topic by primary key
+        row = db.get(SavedTopic, tid)
 
-            # Shape payload for the UI
-            payload = {
-                "_id": str(row.id),
-                "title": row.title,
-                "summary": row.summary or "No summary available.",
-                "timestamp": (row.created_at.isoformat() if row.created_at else "Unknown Date"),
-            }
+        # Enforce ownership: topic must belong to the current user
+        if not row or str(row.user_id) != str(current_user.id):
+            return jsonify({"error": "Topic not found"}), 404
 
-            # Return JSON payload
-            return jsonify(payload), 200
+        # Shape payload for the UI
+        payload = {
+            "_id": str(row.id),
+            "title": row.title,
+            "summary": row.summary or "No summary available.",
+            "timestamp": (row.created_at.isoformat() if row.created_at else "Unknown Date"),
+        }
 
-        finally:
-            # Ensure the session is closed
-            db.close()
+        # Return JSON payload
+        return jsonify(payload), 200
 
     except Exception as e:
         # Log the error and return a safe message
-        print(f"🚨 Error Fetching Topic (SQL): {e}")
+        logger.error("🚨 Error Fetching Topic (SQL): %s", e, exc_info=True)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
@@ -175,7 +259,7 @@ def save_topic():
     try:
         # Parse inbound JSON body
         data = request.get_json()
-        print("🔍 Received Data from JS:", data)
+        logger.debug("🔍 Received Data from JS: %s", data)
 
         # Validate presence of title in payload
         if not data or "title" not in data:
@@ -192,42 +276,28 @@ def save_topic():
         except (TypeError, ValueError):
             return jsonify({"error": "Invalid user context"}), 400
 
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
-        try:
-            # Prevent duplicate titles for the same user
-            exists = (
-                db.query(SavedTopic)
-                  .filter(SavedTopic.user_id == uid, SavedTopic.title == topic_title)
-                  .first()
-            )
-            if exists:
-                return jsonify({"error": "Topic already saved!"}), 400
-
-            # Try to derive a summary from Topic table by title (optional)
-            src = db.query(Topic).filter(Topic.title == topic_title).first()
-            summary = src.description if src and src.description else "No summary available."
-
-            # Create and persist the SavedTopic record
-            st = SavedTopic(user_id=uid, title=topic_title, summary=summary)
-            db.add(st)
-            db.commit()
-            db.refresh(st)
-
-            # Return success and the created record's id/timestamp
-            return jsonify({
-                "message": "Topic saved successfully!",
-                "timestamp": (st.created_at.isoformat() if st.created_at else None),
-                "_id": str(st.id),
-            }), 201
-
-        finally:
-            # Ensure the session is closed
-            db.close()
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
+
+        # One INSERT … ON CONFLICT … RETURNING: resolves the summary and
+        # detects duplicates via uq_savedtopic_user_title atomically
+        inserted = insert_saved_topic(db, uid, topic_title)
+        if inserted is None:
+            db.rollback()
+            return jsonify({"error": "Topic already saved!"}), 400
+        new_id, created_at = inserted
+        db.commit()
+
+        # Return success and the created record's id/timestamp
+        return jsonify({
+            "message": "Topic saved successfully!",
+            "timestamp": (created_at.isoformat() if created_at else None),
+            "_id": str(new_id),
+        }), 201
 
     except Exception as e:
         # Log the error and return a safe message
-        print("🚨 Error saving topic (SQL):", str(e))
+        logger.error("🚨 Error saving topic (SQL): %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 
@@ -238,7 +308,11 @@ def save_topic():
 @dashboard.route("/saved_topics", methods=["GET"])
 @login_required
 def get_saved_topics():
-    """Fetch the current user's saved topics (most recent first)."""
+    """
+    Fetch one page of the current user's saved topics (most recent first).
+    Accepts ?limit= and an opaque ?cursor=; the next page is advertised
+    through a Link: <...>; rel="next" header.
+    """
 
     try:
         # Convert current_user.id (string) → integer PK
@@ -247,18 +321,47 @@ def get_saved_topics():
         except (TypeError, ValueError):
             return jsonify({"error": "Invalid user context"}), 400
 
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
+        # Resolve page size and the position to resume from
+        limit = page_size(request.args.get("limit"), SAVED_TOPICS_PAGE_SIZE, SAVED_TOPICS_MAX_PAGE_SIZE)
+        cursor = request.args.get("cursor") or None
         try:
-            # Query all saved topics for the user, newest first
-            rows = (
-                db.query(SavedTopic)
-                  .filter(SavedTopic.user_id == uid)
-                  .order_by(SavedTopic.created_at.desc())
-                  .all()
+            after = decode_cursor(cursor, 2) if cursor else None
+        except InvalidCursor:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
+
+        # Seek newest-first along ix_saved_topics_user_created (id breaks ties)
+        query = (
+            db.query(SavedTopic.id, SavedTopic.title, SavedTopic.summary, SavedTopic.created_at)
+              .filter(SavedTopic.user_id == uid)
+        )
+        if after:
+            query = query.filter(
+                seek_after((SavedTopic.created_at, SavedTopic.id), after, descending=True)
             )
 
-            # Shape results for UI expectations
+        # Fetch one extra row to learn whether another page exists
+        rows = (
+            query.order_by(SavedTopic.created_at.desc(), SavedTopic.id.desc())
+                 .limit(limit + 1)
+                 .all()
+        )
+
+        # Split the look-ahead row off and build the next-page link
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_url = url_for(
+                "dashboard.get_saved_topics",
+                limit=limit,
+                cursor=encode_cursor(last.created_at, last.id),
+            )
+
+        # Shape results for UI expectations (only called on a cache miss)
+        def build_payload():
             payload = []
             for r in rows:
                 payload.append({
@@ -267,20 +370,20 @@ def get_saved_topics():
                     "summary": r.summary or "No summary available.",
                     "timestamp": (r.created_at.isoformat() if r.created_at else "Unknown Date"),
                 })
+            return payload
 
-            # Log success for diagnostics
-            print("Saved Topics Retrieved Successfully!")
-
-            # Return JSON payload
-            return jsonify(payload), 200
+        # Log success for diagnostics
+        logger.debug("Saved Topics Retrieved Successfully!")
 
-        finally:
-            # Ensure the session is closed
-            db.close()
+        # Return JSON payload (or 304 if the client's copy is current)
+        resp = cached_json(build_payload, etag=make_etag(uid, cursor, limit, [tuple(r) for r in rows]))
+        if next_url:
+            resp.headers["Link"] = f'<{next_url}>; rel="next"'
+        return resp
 
     except Exception as e:
         # Log the error and return a safe message
-        print("🚨 Error Fetching Saved Topics (SQL):", str(e))
+        logger.error("🚨 Error Fetching Saved Topics (SQL): %s", e, exc_info=True)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
@@ -309,28 +412,24 @@ def update_topic(topic_id):
         except (TypeError, ValueError):
             return jsonify({"error": "Invalid IDs"}), 400
 
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
-        try:
-            # Fetch the saved topic and check ownership
-            row = db.get(SavedTopic, tid)
-            if not row or row.user_id != uid:
-                return jsonify({"error": "Topic not found"}), 404
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
 
-            # Update the title and commit
-            row.title = new_title
-            db.commit()
+        # Fetch the saved topic and check ownership
+        row = db.get(SavedTopic, tid)
+        if not row or row.user_id != uid:
+            return jsonify({"error": "Topic not found"}), 404
 
-            # Return success
-            return jsonify({"message": "Topic updated successfully!"}), 200
+        # Update the title and commit
+        row.title = new_title
+        db.commit()
 
-        finally:
-            # Ensure the session is closed
-            db.close()
+        # Return success
+        return jsonify({"message": "Topic updated successfully!"}), 200
 
     except Exception as e:
         # Log the error and return a safe message
-        print(f"🚨 Error Updating Topic (SQL): {e}")
+        logger.error("🚨 Error Updating Topic (SQL): %s", e, exc_info=True)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
@@ -351,28 +450,194 @@ def delete_topic(topic_id):
         except (TypeError, ValueError):
             return jsonify({"error": "Invalid Topic ID format"}), 400
 
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
-        try:
-            # Fetch the topic and check ownership
-            row = db.get(SavedTopic, tid)
-            if not row or row.user_id != uid:
-                return jsonify({"error": "Topic not found"}), 404
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
 
-            # Delete the record and commit
-            db.delete(row)
-            db.commit()
+        # Fetch the topic and check ownership
+        row = db.get(SavedTopic, tid)
+        if not row or row.user_id != uid:
+            return jsonify({"error": "Topic not found"}), 404
+
+        # Delete the record and commit
+        db.delete(row)
+        db.commit()
+
+        # Return success
+        return jsonify({"message": "Topic deleted successfully!"}), 200
+
+    except Exception as e:
+        # Log the error and return a safe message
+        logger.error("🚨 Error Deleting Topic (SQL): %s", e, exc_info=True)
+        return jsonify({"error": "Internal Server Error"}), 500
 
-            # Return success
-            return jsonify({"message": "Topic deleted successfully!"}), 200
 
-        finally:
-            # Ensure the session is closed
-            db.close()
+# =======================================================
+# Batch Saved-Topic Operations (Create / Rename / Delete)
+# =======================================================
+
+def _clean_title(value):
+    """Return a stripped title, or "" for missing/non-string values."""
+    return value.strip() if isinstance(value, str) else ""
+
+
+@dashboard.route("/saved_topics/batch", methods=["POST"])
+@login_required
+def batch_saved_topics():
+    """
+    Apply many saved-topic operations in one request and one transaction.
+    Expects JSON: { "operations": [
+        {"op": "create", "title": "..."},
+        {"op": "rename", "id": "...", "new_title": "..."},
+        {"op": "delete", "id": "..."}
+    ] }
+    Invalid items are reported and skipped; valid items commit together.
+    """
+
+    try:
+        # Parse inbound JSON body
+        data = request.get_json(silent=True) or {}
+        ops = data.get("operations")
+        if not isinstance(ops, list) or not ops:
+            return jsonify({"error": "Invalid data - operations missing"}), 400
+        if len(ops) > SAVED_TOPICS_MAX_BATCH:
+            return jsonify({"error": f"Too many operations (max {SAVED_TOPICS_MAX_BATCH})"}), 400
+
+        # Convert current_user.id (string) → integer PK
+        try:
+            uid = int(current_user.id)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid user context"}), 400
+
+        # Collect every id and title the batch refers to
+        ids, titles = set(), set()
+        for op in ops:
+            if not isinstance(op, dict):
+                continue
+            try:
+                if op.get("id") is not None:
+                    ids.add(int(op["id"]))
+            except (TypeError, ValueError):
+                pass
+            for key in ("title", "new_title"):
+                title = _clean_title(op.get(key))
+                if title:
+                    titles.add(title)
+
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
+
+        # One ownership query covers both target ids and title clashes
+        owned_rows = []
+        if ids or titles:
+            owned_rows = (
+                db.query(SavedTopic)
+                  .filter(
+                      SavedTopic.user_id == uid,
+                      or_(SavedTopic.id.in_(ids), SavedTopic.title.in_(titles)),
+                  )
+                  .all()
+            )
+        owned = {row.id: row for row in owned_rows}
+        taken = {row.title for row in owned_rows}
+
+        # Titles released by pending renames/deletes; reusing one needs a flush
+        # first because the unit of work inserts before it deletes
+        freed = set()
+
+        # Summaries come from the in-memory catalogue (no per-item query)
+        summaries = catalogue.get_snapshot().descriptions_by_title
+
+        results, created = [], []
+        for index, op in enumerate(ops):
+            kind = op.get("op") if isinstance(op, dict) else None
+            result = {"index": index, "op": kind}
+            results.append(result)
+
+            # Create: same rules as save_topic
+            if kind == "create":
+                title = _clean_title(op.get("title"))
+                if not title:
+                    result.update(status=400, error="Invalid data - Title missing")
+                    continue
+                if title in taken:
+                    result.update(status=409, error="Topic already saved!")
+                    continue
+                if title in freed:
+                    db.flush()
+                    freed.clear()
+
+                st = SavedTopic(user_id=uid, title=title, summary=summaries.get(title) or DEFAULT_SUMMARY)
+                db.add(st)
+                taken.add(title)
+                created.append((result, st))
+                result.update(status=201)
+                continue
+
+            # Rename/delete both need an owned target row
+            if kind not in ("rename", "delete"):
+                result.update(status=400, error="Unknown operation")
+                continue
+            try:
+                row = owned.get(int(op.get("id")))
+            except (TypeError, ValueError):
+                result.update(status=400, error="Invalid Topic ID format")
+                continue
+            if row is None:
+                result.update(status=404, error="Topic not found")
+                continue
+            result["_id"] = str(row.id)
+
+            # Rename: enforce one title per user within the batch too
+            if kind == "rename":
+                new_title = _clean_title(op.get("new_title"))
+                if not new_title:
+                    result.update(status=400, error="New title required")
+                    continue
+                if new_title != row.title and new_title in taken:
+                    result.update(status=409, error="Topic already saved!")
+                    continue
+                if new_title in freed:
+                    db.flush()
+                    freed.clear()
+
+                taken.discard(row.title)
+                freed.add(row.title)
+                row.title = new_title
+                taken.add(new_title)
+                result.update(status=200)
+                continue
+
+            # Delete: forget the row so later items cannot target it
+            db.delete(row)
+            owned.pop(row.id, None)
+            taken.discard(row.title)
+            freed.add(row.title)
+            result.update(status=200)
+
+        # Apply every accepted item in a single commit
+        applied = sum(1 for r in results if r["status"] < 400)
+        if applied:
+            try:
+                # Flush first so new ids are read before commit expires the rows
+                db.flush()
+                for result, st in created:
+                    result["_id"] = str(st.id)
+                    result["timestamp"] = st.created_at.isoformat() if st.created_at else None
+                db.commit()
+            except IntegrityError:
+                # A concurrent request raced us; nothing from this batch was applied
+                db.rollback()
+                return jsonify({"error": "Conflicting concurrent update, please retry"}), 409
+
+        return jsonify({
+            "results": results,
+            "applied": applied,
+            "failed": len(results) - applied,
+        }), 200
 
     except Exception as e:
         # Log the error and return a safe message
-        print(f"🚨 Error Deleting Topic (SQL): {e}")
+        logger.error("🚨 Error Applying Saved Topic Batch (SQL): %s", e, exc_info=True)
         return jsonify({"error": "Internal Server Error"}), 500
 
 
@@ -394,7 +659,7 @@ def logout():
         session.clear()
 
         # Diagnostic log for visibility
-        print("🔴 User session cleared.")
+        logger.info("🔴 User session cleared.")
 
         # Return JSON for AJAX calls; redirect for normal navigation
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
@@ -405,5 +670,5 @@ def logout():
 
     except Exception as e:
         # Log the error and return a safe message
-        print(f"🚨 Logout Error: {e}")
+        logger.error("🚨 Logout Error: %s", e, exc_info=True)
         return jsonify({"error": "Internal Server Error"}), 500
\ No newline at end of file
@@ -2,13 +2,19 @@
 # Main Blueprint - Routes for Homepage and Database Test
 # =======================================================
 
+# Import logging for diagnostics
+import logging
+
 # Import Flask primitives
 from flask import Blueprint, jsonify, render_template
 
 # Import database session and model
-from brainery_data.sql.db import SessionLocal
+from brainery_data.sql.db import get_db
 from brainery_data.sql.models import UserSQL
 
+# Rendered-page cache for anonymous visitors
+from brainery_data import page_cache
+
 
 # =======================================================
 # Initialize Main Blueprint
@@ -17,18 +23,22 @@ from brainery_data.sql.models import UserSQL
 # Blueprint for main routes
 main = Blueprint("main", __name__)
 
+# Module logger (configured centrally in create_app)
+logger = logging.getLogger(__name__)
+
 
 # =======================================================
 # Home Route
 # =======================================================
 
 @main.route("/")
+@page_cache.anonymous_page
 def index():
-    """Render the home page."""
+    """Render the home page (cached per worker for anonymous visitors)."""
 
     try:
-        # Diagnostic message to server console
-        print("Rendering the home page")
+        # Diagnostic message (debug level; only logged on a cache miss)
+        logger.debug("Rendering the home page")
 
         # Render homepage template
         return render_template("index.html")
@@ -49,14 +59,11 @@ def test_db():
     """Test if the SQL database connection is working."""
 
     try:
-        # Open a new SQLAlchemy session
-        db = SessionLocal()
-        try:
-            # Fetch the first user row from the database
-            user = db.query(UserSQL).first()
-        finally:
-            # Always close the session
-            db.close()
+        # Use the request-scoped SQLAlchemy session
+        db = get_db()
+
+        # Fetch the first user row from the database
+        user = db.query(UserSQL).first()
 
         # If a user exists, return their data as JSON
         if user:
@@ -8,8 +8,8 @@ import logging
 # Import Flask utilities
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 
-# Import password hashing
-from werkzeug.security import generate_password_hash
+# Import the bounded password hashing service and the email membership filter
+from brainery_data import email_filter, passwords
 
 # Import WTForms base and fields
 from flask_wtf import FlaskForm
@@ -21,22 +21,21 @@ from datetime import datetime
 
 # Import app-level CSRF and SQL session/model
 from brainery_data.routes import csrf
-from brainery_data.sql.db import SessionLocal
+from brainery_data.sql.db import get_db
 from brainery_data.sql.models import UserSQL
+from brainery_data.sql.users import email_exists
+from brainery_data.sql import counters
 
 # Import SQLAlchemy exceptions
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
-# SQL helper for case-insensitive lookup
-from sqlalchemy import func
-
 
 # =======================================================
 # Logging Setup
 # =======================================================
 
-# Configure base logging level
-logging.basicConfig(level=logging.INFO)
+# Module logger (handlers/levels are configured centrally in create_app)
+logger = logging.getLogger(__name__)
 
 
 # =======================================================
@@ -127,12 +126,11 @@ def check_email():
 
     # Wrap handler for safety
     try:
-        # Log incoming request basics
-        logging.info("📩 Received request for email check")
-
-        # Log raw request (useful while wiring up)
-        logging.info("🔍 Raw Request Data: %s", request.get_data(as_text=True))
-        logging.info("🔍 Request Headers: %s", dict(request.headers))
+        # Debug line, sampled per route (no body or headers: they carry emails and cookies)
+        logger.debug(
+            "📩 check_email content_type=%s length=%s",
+            request.content_type, request.content_length,
+        )
 
         # Ensure JSON body
         if not request.is_json:
@@ -144,19 +142,11 @@ def check_email():
         if not email:
             return jsonify({"exists": False, "message": "⚠ Email field is required."}), 400
 
-        # Create SQL session
-        sql_session = SessionLocal()
-        try:
-            # Case-insensitive lookup against SQL
-            found = (
-                sql_session.query(UserSQL.id)
-                           .filter(func.lower(UserSQL.email) == email)
-                           .first()
-                is not None
-            )
-        finally:
-            # Always close session
-            sql_session.close()
+        # Fast path: the membership filter rules most emails out from memory
+        found = False
+        if email_filter.might_exist(email):
+            # Possible positive: confirm against SQL (normalised, indexed)
+            found = email_exists(get_db(), email)
 
         # Return existence result
         if found:
@@ -167,7 +157,7 @@ def check_email():
 
     # Unexpected server errors
     except Exception as e:
-        logging.error("check_email error: %s", e, exc_info=True)
+        logger.error("check_email error: %s", e, exc_info=True)
         return jsonify({"exists": False, "message": "⚠ Server error."}), 500
 
 
@@ -183,17 +173,12 @@ def register_user():
 
     # Process only when the request method is POST
     if request.method == "POST":
-        # Log basic diagnostics
-        logging.info("✅ Received POST request for /register")
+        # Log basic diagnostics (field names only: values include passwords)
+        logger.debug("✅ POST /register fields=%s", sorted(request.form.keys()))
 
-        # Log raw form payload for debugging
-        logging.info("🔹 Raw Form Data: %s", request.form)
-
-        # Log CSRF presence for debugging
-        if 'csrf_token' in request.form:
-            logging.info("🔹 CSRF Token Received: %s", request.form['csrf_token'])
-        else:
-            logging.warning("❌ No CSRF Token Found!")
+        # Log CSRF absence (never the token itself)
+        if 'csrf_token' not in request.form:
+            logger.warning("❌ No CSRF Token Found!")
 
         # Clear any existing flash messages before validation
         session.pop('_flashes', None)
@@ -212,22 +197,25 @@ def register_user():
 
                 # Ensure a plan is selected
                 if not selected_plan:
-                    logging.error("❌ No plan selected!")
+                    logger.warning("❌ No plan selected!")
                     flash("⚠️ Please select a plan before registering.", 'danger')
                     return render_template('register.html', form=form)
 
-                # Open SQL session
-                sql_session = SessionLocal()
+                # Use the request-scoped SQLAlchemy session
+                sql_session = get_db()
                 try:
-                    # Check for duplicate email
-                    existing = sql_session.query(UserSQL).filter(UserSQL.email == email).one_or_none()
-                    if existing:
-                        logging.warning("❌ Email %s already exists in database", email)
+                    # Check for duplicate email (same normalisation as login)
+                    if email_exists(sql_session, email):
+                        logger.info("❌ Registration attempt for an existing email")
                         flash("❌ This email is already registered. Try logging in instead.", 'danger')
                         return redirect(url_for('register.register_user'))
 
-                    # Hash the password
-                    hashed_password = generate_password_hash(password, method="pbkdf2:sha256")
+                    # Hash the password on the hashing executor (503 when saturated)
+                    try:
+                        hashed_password = passwords.hash_password(password)
+                    except passwords.HashingBusy:
+                        flash("⚠️ The server is busy. Please try again in a moment.", 'warning')
+                        return render_template('register.html', form=form), 503, {"Retry-After": str(passwords.RETRY_AFTER_SECONDS)}
 
                     # Create a new user record
                     new_user = UserSQL(
@@ -238,28 +226,28 @@ def register_user():
                         created_at=datetime.utcnow(),
                     )
 
-                    # Persist the new user to the database
+                    # Persist the new user and count it in the same transaction
                     sql_session.add(new_user)
+                    counters.bump(sql_session, counters.USERS_TOTAL, 1)
                     sql_session.commit()
 
+                    # Let this worker's check_email see the new address at once
+                    email_filter.add(email)
+
                 # Handle unique/constraint violations
                 except IntegrityError as ie:
                     sql_session.rollback()
-                    logging.error("IntegrityError during registration: %s", ie, exc_info=True)
+                    logger.error("IntegrityError during registration: %s", ie, exc_info=True)
                     flash("❌ Email already exists or data invalid.", "danger")
                     return redirect(url_for('register.register_user'))
 
                 # Handle generic SQL errors
                 except SQLAlchemyError as se:
                     sql_session.rollback()
-                    logging.error("SQLAlchemyError during registration: %s", se, exc_info=True)
+                    logger.error("SQLAlchemyError during registration: %s", se, exc_info=True)
                     flash("❌ Database error. Please try again.", "danger")
                     return redirect(url_for('register.register_user'))
 
-                # Ensure session is closed
-                finally:
-                    sql_session.close()
-
                 # Indicate successful registration
                 flash("Registration successful! You selected: " + selected_plan + ".", "success")
 
@@ -272,7 +260,7 @@ def register_user():
 
             # Handle unexpected server errors during registration
             except Exception as e:
-                logging.error("Unexpected error during registration: %s", e, exc_info=True)
+                logger.error("Unexpected error during registration: %s", e, exc_info=True)
                 flash("❌ Registration failed. Please try again.", 'danger')
                 return redirect(url_for('register.register_user'))
 
@@ -9,7 +9,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 
 # Import database session and model
-from brainery_data.sql.db import SessionLocal
+from brainery_data.sql.db import get_db
 from brainery_data.sql.models import ResourceSQL
 
 
@@ -50,8 +50,8 @@ def add_resource():
             flash("Invalid user context.", "danger")
             return render_template("add_resource.html")
 
-        # Open DB session and insert the resource
-        db = SessionLocal()
+        # Insert the resource on the request-scoped session
+        db = get_db()
         try:
             # Create ORM row
             row = ResourceSQL(
@@ -76,10 +76,6 @@ def add_resource():
             flash("Failed to add resource. Please try again.", "danger")
             return render_template("add_resource.html")
 
-        finally:
-            # Ensure session is closed
-            db.close()
-
     # Render the creation form
     return render_template("add_resource.html")
 
@@ -100,8 +96,8 @@ def edit_resource(resource_id):
         flash("Invalid user context.", "danger")
         return redirect(url_for("dashboard.dashboard_main"))
 
-    # Open DB session
-    db = SessionLocal()
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
     try:
         # Fetch the resource row
         row = db.get(ResourceSQL, resource_id)
@@ -138,10 +134,6 @@ def edit_resource(resource_id):
         flash("Failed to update resource. Please try again.", "danger")
         return redirect(url_for("dashboard.dashboard_main"))
 
-    finally:
-        # Close session
-        db.close()
-
 
 # =======================================================
 # Delete a Resource
@@ -159,8 +151,8 @@ def delete_resource(resource_id):
         flash("Invalid user context.", "danger")
         return redirect(url_for("dashboard.dashboard_main"))
 
-    # Open DB session
-    db = SessionLocal()
+    # Use the request-scoped SQLAlchemy session
+    db = get_db()
     try:
         # Fetch the resource row
         row = db.get(ResourceSQL, resource_id)
@@ -182,8 +174,4 @@ def delete_resource(resource_id):
         # Rollback on error
         db.rollback()
         flash("Failed to delete resource. Please try again.", "danger")
-        return redirect(url_for("dashboard.dashboard_main"))
-
-    finally:
-        # Close session
-        db.close()
\ No newline at end of file
+        return redirect(url_for("dashboard.dashboard_main"))
\ No newline at end of file
@@ -0,0 +1,262 @@
+# =======================================================
+# In-Process Subject/Topic Catalogue Snapshot
+# =======================================================
+# The Subject/Topic catalogue is read on almost every dashboard
+# request but written only by seed/migration scripts and admins.
+# This module loads it once per worker, serves reads from memory
+# and drops the snapshot whenever a catalogue write commits.
+
+# Import required modules
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from brainery_data.sql.db import SessionLocal
+from brainery_data.sql.models import Subject, Topic
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Upper bound on snapshot age; other workers' writes are only
+# observed through this TTL (0 disables time-based expiry)
+CATALOGUE_TTL_SECONDS = float(os.getenv("CATALOGUE_TTL_SECONDS", "300"))
+
+# Session.info key used to remember pending catalogue writes
+_DIRTY_KEY = "catalogue_dirty"
+
+# Models whose writes invalidate the snapshot
+_CATALOGUE_MODELS = (Subject, Topic)
+
+logger = logging.getLogger(__name__)
+
+
+# =======================================================
+# Content Digests
+# =======================================================
+
+def _digest(payload):
+    """Return a stable content hash of a JSON-serialisable payload."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# =======================================================
+# Snapshot Container
+# =======================================================
+
+class CatalogueSnapshot:
+    """
+    Immutable view of the catalogue, already shaped for the UI.
+    Subjects are sorted by name and topics by title per subject.
+    """
+
+    __slots__ = (
+        "subjects", "topics_by_subject", "version", "loaded_at",
+        "subjects_digest", "topic_digests", "descriptions_by_title",
+    )
+
+    def __init__(self, subjects, topics_by_subject, version):
+        # List of {"_id", "name", "icon"} dicts (A→Z by name)
+        self.subjects = subjects
+
+        # Map subject id (int) -> list of {"title", "description"} dicts
+        self.topics_by_subject = topics_by_subject
+
+        # Monotonic version, bumped on every load
+        self.version = version
+
+        # Wall-clock load time (used for TTL expiry)
+        self.loaded_at = time.time()
+
+        # First non-empty description per topic title (saved-topic summaries)
+        self.descriptions_by_title = {}
+        for rows in topics_by_subject.values():
+            for row in rows:
+                if row["description"]:
+                    self.descriptions_by_title.setdefault(row["title"], row["description"])
+
+        # Content digests (identical across workers for identical data)
+        self.subjects_digest = _digest(subjects)
+        self.topic_digests = {sid: _digest(rows) for sid, rows in topics_by_subject.items()}
+
+    def topics_for(self, subject_id):
+        """Return (topics, digest) for a subject; unknown ids give an empty list."""
+        rows = self.topics_by_subject.get(subject_id, [])
+        return rows, self.topic_digests.get(subject_id) or _digest(rows)
+
+    def topic_count(self):
+        """Return the total number of topics in the snapshot."""
+        return sum(len(rows) for rows in self.topics_by_subject.values())
+
+
+# =======================================================
+# Module State
+# =======================================================
+
+# Guards loading so concurrent cold requests share one query
+_lock = threading.Lock()
+
+# Current snapshot (None until first use or after invalidation)
+_snapshot = None
+
+# Bumped by invalidate(); a load started before an invalidation
+# must not install its (possibly stale) result
+_generation = 0
+
+# Monotonic snapshot version (never reused within a worker)
+_version = 0
+
+
+# =======================================================
+# Loading
+# =======================================================
+
+def _build():
+    """Read the full catalogue from SQL and shape it for the UI."""
+    global _version
+
+    db = SessionLocal()
+    try:
+        # Subjects A→Z, topics grouped by subject and sorted by title
+        subject_rows = db.query(Subject.id, Subject.name, Subject.icon).order_by(Subject.name.asc()).all()
+        topic_rows = (
+            db.query(Topic.subject_id, Topic.title, Topic.description)
+              .order_by(Topic.subject_id.asc(), Topic.title.asc())
+              .all()
+        )
+    finally:
+        db.close()
+
+    # Shape subjects exactly as the dashboard endpoint returns them
+    subjects = [
+        {"_id": str(sid), "name": name, "icon": icon or ""}
+        for sid, name, icon in subject_rows
+    ]
+
+    # Bucket topics per subject, preserving the SQL sort order
+    topics_by_subject = {sid: [] for sid, _, _ in subject_rows}
+    for subject_id, title, description in topic_rows:
+        topics_by_subject.setdefault(subject_id, []).append(
+            {"title": title, "description": description or ""}
+        )
+
+    _version += 1
+    return CatalogueSnapshot(subjects, topics_by_subject, _version)
+
+
+def _expired(snap):
+    """Return True if the snapshot is older than the configured TTL."""
+    return CATALOGUE_TTL_SECONDS > 0 and (time.time() - snap.loaded_at) > CATALOGUE_TTL_SECONDS
+
+
+def get_snapshot():
+    """Return the current snapshot, loading it on first use."""
+    global _snapshot
+
+    # Fast path: no locking when a fresh snapshot is installed
+    snap = _snapshot
+    if snap is not None and not _expired(snap):
+        return snap
+
+    with _lock:
+        # Another thread may have loaded while we waited
+        snap = _snapshot
+        if snap is not None and not _expired(snap):
+            return snap
+
+        # Remember which generation this load started from
+        started_at = _generation
+        snap = _build()
+
+        # Only publish if no catalogue write committed meanwhile
+        if started_at == _generation:
+            _snapshot = snap
+        return snap
+
+
+def reload():
+    """Force a synchronous reload and return the new snapshot."""
+    global _snapshot, _generation
+
+    with _lock:
+        _generation += 1
+        _snapshot = _build()
+        logger.info(
+            "Catalogue reloaded: %d subjects, %d topics (v%d)",
+            len(_snapshot.subjects), _snapshot.topic_count(), _snapshot.version,
+        )
+        return _snapshot
+
+
+def invalidate():
+    """Drop the snapshot; the next read reloads it from SQL."""
+    global _snapshot, _generation
+
+    # Deliberately lock-free so committing threads never wait on a
+    # load in progress; the generation bump stops that load publishing
+    _generation += 1
+    _snapshot = None
+
+
+# =======================================================
+# Read Helpers (used by the dashboard blueprint)
+# =======================================================
+
+def get_subjects():
+    """Return all subjects shaped for the UI (A→Z)."""
+    return get_snapshot().subjects
+
+
+def get_topics(subject_id):
+    """Return topics for a subject shaped for the UI (A→Z by title)."""
+    return get_snapshot().topics_by_subject.get(subject_id, [])
+
+
+# =======================================================
+# Write-Driven Invalidation (SQLAlchemy Session Events)
+# =======================================================
+
+def _touches_catalogue(objects):
+    """Return True if any object in the collection is a catalogue row."""
+    return any(isinstance(obj, _CATALOGUE_MODELS) for obj in objects)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_catalogue_flush(session, flush_context):
+    """Flag the session if a flush wrote Subject/Topic rows."""
+    if (
+        _touches_catalogue(session.new)
+        or _touches_catalogue(session.dirty)
+        or _touches_catalogue(session.deleted)
+    ):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_catalogue_bulk(orm_execute_state):
+    """Flag the session for ORM-enabled bulk INSERT/UPDATE/DELETE."""
+    if orm_execute_state.is_select:
+        return
+    if any(m.class_ in _CATALOGUE_MODELS for m in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    """Invalidate once the catalogue write is durable."""
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    """Forget pending catalogue writes that never committed."""
+    session.info.pop(_DIRTY_KEY, None)
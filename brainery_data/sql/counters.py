@@ -0,0 +1,115 @@
+# =======================================================
+# Incrementally Maintained Counters
+# =======================================================
+# Dashboard figures such as "Total Users" live as rows in the counters
+# table. Writers adjust them with a relative UPDATE inside their own
+# transaction, so a counter commits or rolls back together with the
+# change it counts and reading one is a primary-key lookup instead of
+# a COUNT(*) scan. reconcile() recomputes the true values to repair
+# drift (e.g. rows changed outside the app).
+
+# Import required modules
+import logging
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from brainery_data.sql.models import Counter, UserSQL
+
+logger = logging.getLogger(__name__)
+
+
+# =======================================================
+# Counter Names
+# =======================================================
+
+USERS_TOTAL = "users_total"
+USERS_ADMIN = "users_admin"
+
+
+# =======================================================
+# Writes (Caller Commits)
+# =======================================================
+
+def bump(db, name, delta=1):
+    """Add `delta` to counter `name` within the caller's transaction."""
+    result = db.execute(
+        update(Counter)
+        .where(Counter.name == name)
+        .values(value=Counter.value + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+    # No row to adjust: the change is not counted here, but read() seeds
+    # the missing row from the true values on the next dashboard load
+    if result.rowcount == 0:
+        logger.warning("Counter %r is missing; it will be reconciled on next read", name)
+
+
+# =======================================================
+# True Values
+# =======================================================
+
+def _actual_counts(db):
+    """Recompute every counter from the source tables (one aggregate query)."""
+    total, admins = db.execute(
+        select(
+            func.count(UserSQL.id),
+            func.count(case((UserSQL.role == "admin", 1))),
+        )
+    ).one()
+    return {USERS_TOTAL: total, USERS_ADMIN: admins}
+
+
+# =======================================================
+# Reconcile
+# =======================================================
+
+def reconcile(db):
+    """
+    Overwrite every counter with its true value and commit.
+    Returns {name: (stored, actual)} for counters that had drifted
+    (stored is None when the row was missing).
+    """
+    # Lock the counter rows first (PostgreSQL) so writers that commit
+    # while we count queue behind us instead of being overwritten
+    stored = dict(
+        db.execute(select(Counter.name, Counter.value).with_for_update()).all()
+    )
+    actual = _actual_counts(db)
+
+    drift = {}
+    for name, value in actual.items():
+        if stored.get(name) == value:
+            continue
+        drift[name] = (stored.get(name), value)
+        if name in stored:
+            db.execute(update(Counter).where(Counter.name == name).values(value=value))
+        else:
+            db.add(Counter(name=name, value=value))
+
+    db.commit()
+    return drift
+
+
+# =======================================================
+# Reads
+# =======================================================
+
+def read(db):
+    """Return {name: value} for every counter, reconciling once if any are missing."""
+    values = dict(db.execute(select(Counter.name, Counter.value)).all())
+    if any(name not in values for name in (USERS_TOTAL, USERS_ADMIN)):
+        try:
+            reconcile(db)
+        except IntegrityError:
+            # Another worker seeded the rows first; theirs are as good
+            db.rollback()
+        values = dict(db.execute(select(Counter.name, Counter.value)).all())
+    return values
+
+
+def user_counts(db):
+    """Return (total_users, admin_users) as maintained by the counters table."""
+    values = read(db)
+    return values.get(USERS_TOTAL, 0), values.get(USERS_ADMIN, 0)
@@ -4,9 +4,15 @@
 
 # Import required modules
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool, SingletonThreadPool, StaticPool
 from dotenv import load_dotenv
+from flask import g
 
 # =======================================================
 # Load Environment Variables
@@ -22,8 +28,233 @@ load_dotenv()
 # Get database URL from environment or fall back to SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///instance/brainery.db")
 
+
+# =======================================================
+# Pool Statistics
+# =======================================================
+
+class PoolStats:
+    """Thread-safe counters for connection checkouts, waits and overflow."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero every counter (e.g. between load-test runs)."""
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.checked_out_peak = 0
+            self._checked_out = 0
+
+    def record_wait(self, seconds, timed_out=False):
+        """Record a checkout that found the pool exhausted and had to wait."""
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def _on_connect(self, *_):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, *_):
+        with self._lock:
+            self.checkouts += 1
+            self._checked_out += 1
+            self.checked_out_peak = max(self.checked_out_peak, self._checked_out)
+
+    def _on_checkin(self, *_):
+        with self._lock:
+            self.checkins += 1
+            self._checked_out = max(0, self._checked_out - 1)
+
+    def _on_invalidate(self, *_):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self):
+        """Return the counters as a plain dict."""
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self._checked_out,
+                "checked_out_peak": self.checked_out_peak,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "wait_avg_ms": round(1000 * self.wait_total / self.waits, 3) if self.waits else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max, 3),
+            }
+
+
+# Process-wide statistics for the application engine
+_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts block on an exhausted pool."""
+
+    def __init__(self, creator, pool_size=5, max_overflow=10, **kw):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        # Public copy of the overflow limit (-1 = unlimited, never blocks)
+        self.max_overflow = max_overflow
+
+    def _exhausted(self):
+        """True if a checkout now has to wait for another thread's checkin."""
+        if self.max_overflow == -1 or self.checkedin() > 0:
+            return False
+        return self.overflow() >= self.max_overflow
+
+    def _do_get(self):
+        # Checkouts served at once (idle or new connection) are not waits
+        if not self._exhausted():
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            _stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        _stats.record_wait(time.perf_counter() - started)
+        return conn
+
+
+# =======================================================
+# Pool Configuration (Environment-Driven)
+# =======================================================
+# DB_POOL_CLASS      queue | null | static | singleton (default per dialect)
+# DB_POOL_SIZE       persistent connections per worker process
+# DB_MAX_OVERFLOW    extra connections allowed under burst
+# DB_POOL_TIMEOUT    seconds to wait for a free connection
+# DB_POOL_RECYCLE    seconds after which connections are replaced (-1 = never)
+# DB_POOL_PRE_PING   test connections on checkout (true/false)
+
+_POOL_CLASSES = {
+    "queue": InstrumentedQueuePool,
+    "null": NullPool,
+    "static": StaticPool,
+    "singleton": SingletonThreadPool,
+}
+
+# Per-dialect defaults; PostgreSQL sits behind a network and idle
+# timeouts, SQLite is a local file where pinging buys nothing
+_DIALECT_DEFAULTS = {
+    "postgresql": {
+        "pool": "queue",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+    "sqlite": {
+        "pool": "queue",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+    },
+}
+
+
+def _env_int(name, default):
+    """Read an integer environment variable."""
+    raw = os.getenv(name)
+    return int(raw) if raw not in (None, "") else default
+
+
+def _env_bool(name, default):
+    """Read a boolean environment variable (1/true/yes/on)."""
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(url):
+    """Build create_engine() pool keyword arguments for `url` from the environment."""
+    url = make_url(url)
+    dialect = url.get_backend_name()
+    defaults = _DIALECT_DEFAULTS.get(dialect, _DIALECT_DEFAULTS["postgresql"])
+
+    # In-memory SQLite must keep one shared connection
+    if dialect == "sqlite" and url.database in (None, "", ":memory:"):
+        defaults = dict(defaults, pool="static")
+
+    pool_name = (os.getenv("DB_POOL_CLASS") or defaults["pool"]).strip().lower()
+    if pool_name not in _POOL_CLASSES:
+        raise ValueError(f"Unknown DB_POOL_CLASS {pool_name!r}; expected one of {sorted(_POOL_CLASSES)}")
+
+    options = {
+        "poolclass": _POOL_CLASSES[pool_name],
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", defaults["pool_pre_ping"]),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", defaults["pool_recycle"]),
+    }
+
+    # Sizing knobs only apply to QueuePool
+    if pool_name == "queue":
+        options["pool_size"] = _env_int("DB_POOL_SIZE", defaults["pool_size"])
+        options["max_overflow"] = _env_int("DB_MAX_OVERFLOW", defaults["max_overflow"])
+        options["pool_timeout"] = _env_int("DB_POOL_TIMEOUT", defaults["pool_timeout"])
+
+    return options
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, future=True)
+engine = create_engine(DATABASE_URL, future=True, **engine_options(DATABASE_URL))
+
+# Count connects/checkouts/checkins/invalidations on the engine's pool
+event.listen(engine, "connect", _stats._on_connect)
+event.listen(engine, "checkout", _stats._on_checkout)
+event.listen(engine, "checkin", _stats._on_checkin)
+event.listen(engine, "invalidate", _stats._on_invalidate)
+
+
+def _enable_sqlite_foreign_keys(dbapi_conn, _record):
+    """SQLite ignores FOREIGN KEY / ON DELETE CASCADE unless enabled per connection."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# Deleting a user must also delete their saved topics/resources
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+
+
+def pool_stats():
+    """Return live pool state plus checkout/wait/overflow counters."""
+    pool = engine.pool
+    stats = _stats.snapshot()
+    stats["pool_class"] = type(pool).__name__
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool.max_overflow,
+            timeout=pool.timeout(),
+        )
+    return stats
+
+
+def reset_pool_stats():
+    """Zero the checkout/wait counters (live pool state is unaffected)."""
+    _stats.reset()
 
 # =======================================================
 # Session Factory
@@ -35,4 +266,42 @@ SessionLocal = sessionmaker(
     autoflush=False,
     autocommit=False,
     future=True,
-)
\ No newline at end of file
+)
+
+
+# =======================================================
+# Request-Scoped Session
+# =======================================================
+# One Session per request, shared by the user loader and every
+# blueprint. A Session only checks a connection out of the pool when
+# it first executes SQL, so requests served entirely from caches never
+# touch the pool; the connection is returned at app-context teardown.
+
+# Key under flask.g holding the request's session
+_G_SESSION_KEY = "_brainery_db_session"
+
+
+def get_db():
+    """Return this request's Session, creating it on first use."""
+    db = g.get(_G_SESSION_KEY)
+    if db is None:
+        db = SessionLocal()
+        setattr(g, _G_SESSION_KEY, db)
+    return db
+
+
+def close_db(exc=None):
+    """Teardown hook: roll back on error and release the connection."""
+    db = g.pop(_G_SESSION_KEY, None)
+    if db is None:
+        return
+    try:
+        if exc is not None:
+            db.rollback()
+    finally:
+        db.close()
+
+
+def init_app(app):
+    """Register the request-scoped session teardown on a Flask app."""
+    app.teardown_appcontext(close_db)
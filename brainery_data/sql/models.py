@@ -4,9 +4,9 @@
 
 from __future__ import annotations
 from datetime import datetime
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
 from sqlalchemy import String, Text, ForeignKey, DateTime
-from sqlalchemy import String, Text, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import String, Text, ForeignKey, DateTime, UniqueConstraint, Index, func
 
 
 # =======================================================
@@ -17,6 +17,15 @@ class Base(DeclarativeBase):
     pass
 
 
+# =======================================================
+# Email Normalisation
+# =======================================================
+
+def normalize_email(email):
+    """Canonical form of an email used for lookups and uniqueness."""
+    return (email or "").strip().lower()
+
+
 # =======================================================
 # Users Model
 # =======================================================
@@ -26,15 +35,41 @@ class UserSQL(Base):
 
     # Primary key
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    username: Mapped[str] = mapped_column(String(120), nullable=False)
+    # Indexed: the admin user table sorts and seeks by username
+    username: Mapped[str] = mapped_column(String(120), index=True, nullable=False)
 
     # Unique + indexed
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+
+    # Normalised copy of email (unique + indexed); every lookup goes through it
+    email_normalized: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
 
     # user/admin
     role: Mapped[str] = mapped_column(String(20), default="user", nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+
+    # Case-insensitive username and email prefix search in the admin table
+    # (text_pattern_ops so PostgreSQL can serve LIKE 'q%' in any locale;
+    # SQLite seeks ix_users_email_normalized with a range instead)
+    __table_args__ = (
+        Index(
+            "ix_users_username_lower",
+            func.lower(username).label("username_lower"),
+            postgresql_ops={"username_lower": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_users_email_normalized_pattern",
+            email_normalized,
+            postgresql_ops={"email_normalized": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    @validates("email")
+    def _sync_email_normalized(self, key, value):
+        """Keep email_normalized in step with every email assignment."""
+        self.email_normalized = normalize_email(value)
+        return value
 
 
 # =======================================================
@@ -69,7 +104,9 @@ class Topic(Base):
         nullable=False,
         index=True,
     )
-    title: Mapped[str] = mapped_column(String(200), nullable=False)
+
+    # Indexed: saved-topic summaries are resolved by title
+    title: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -82,9 +119,10 @@ class SavedTopic(Base):
     __tablename__ = "saved_topics"
     __table_args__ = (UniqueConstraint("user_id", "title", name="uq_savedtopic_user_title"),)
 
-    # Enforce 1 title per user
+    # Enforce 1 title per user; composite index serves newest-first keyset pages
     __table_args__ = (
         UniqueConstraint("user_id", "title", name="uq_savedtopic_user_title"),
+        Index("ix_saved_topics_user_created", "user_id", "created_at"),
     )
 
     # Primary key
@@ -129,4 +167,18 @@ class ResourceSQL(Base):
     category: Mapped[str] = mapped_column(String(120), nullable=True)
 
     # Created timestamp
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# =======================================================
+# Counters Model
+# =======================================================
+
+class Counter(Base):
+    __tablename__ = "counters"
+
+    # Counter name (e.g. "users_total") is the primary key
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # Current value, adjusted in the same transaction as the change it counts
+    value: Mapped[int] = mapped_column(default=0, nullable=False)
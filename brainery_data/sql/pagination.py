@@ -0,0 +1,86 @@
+# =======================================================
+# Keyset (Cursor) Pagination Helpers
+# =======================================================
+# Keyset pagination seeks past the last row of the previous page
+# using an indexed sort key instead of OFFSET, so every page costs
+# the same no matter how deep the client scrolls.
+
+# Import required modules
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+# =======================================================
+# Errors
+# =======================================================
+
+class InvalidCursor(ValueError):
+    """Raised when a client-supplied cursor cannot be decoded."""
+
+
+# =======================================================
+# Page Size
+# =======================================================
+
+def page_size(raw, default, maximum):
+    """Parse a ?limit= value, falling back to `default` and capping at `maximum`."""
+    try:
+        size = int(raw) if raw not in (None, "") else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+# =======================================================
+# Opaque Cursor Encoding
+# =======================================================
+
+def encode_cursor(*values):
+    """Encode the sort key of the last row on a page as an opaque token."""
+    # Datetimes travel as ISO strings and are tagged for decoding
+    parts = [
+        {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(parts, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, arity):
+    """Decode a token produced by encode_cursor() into `arity` values."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [
+            datetime.fromisoformat(p["dt"]) if isinstance(p, dict) else p
+            for p in parts
+        ]
+    except (ValueError, TypeError, KeyError, UnicodeEncodeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+    # Reject tokens that were built for a different sort key
+    if len(values) != arity:
+        raise InvalidCursor("cursor arity mismatch")
+    return values
+
+
+# =======================================================
+# Seek Predicate
+# =======================================================
+
+def seek_after(columns, values, descending=False):
+    """
+    Build "row comes after the cursor" for a multi-column sort key.
+    Expanded to OR/AND (not row values) so SQLite and PostgreSQL
+    both plan it as an index range scan.
+    """
+    clauses = []
+    for i, (col, val) in enumerate(zip(columns, values)):
+        # Earlier columns equal, this column strictly past the cursor
+        past = col < val if descending else col > val
+        equal_prefix = [c == v for c, v in zip(columns[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, past))
+    return or_(*clauses)
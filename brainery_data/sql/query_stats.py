@@ -0,0 +1,237 @@
+# =======================================================
+# Query Fingerprint Statistics and Slow-Query Log
+# =======================================================
+# Every statement executed through the application engine is
+# normalised into a fingerprint (literals and bind parameters replaced
+# by "?"), and count/total/max/p95 are kept per fingerprint in bounded
+# memory. Statements slower than SLOW_QUERY_MS are logged together
+# with their EXPLAIN (PostgreSQL) / EXPLAIN QUERY PLAN (SQLite) output.
+
+# Import required modules
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+
+from sqlalchemy import event
+
+from brainery_data.sql.db import engine
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Set QUERY_STATS=0 to disable collection entirely
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Statements at or above this duration are logged with their plan
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Maximum distinct fingerprints kept (least recently seen are evicted)
+MAX_FINGERPRINTS = int(os.getenv("QUERY_STATS_MAX_FINGERPRINTS", "500"))
+
+# Recent durations kept per fingerprint for the p95 estimate
+_SAMPLES_PER_FINGERPRINT = 256
+
+# Re-capture a fingerprint's plan at most this often (seconds)
+_EXPLAIN_INTERVAL = 300.0
+
+# EXPLAIN prefix per dialect (others are not explained)
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+
+logger = logging.getLogger(__name__)
+
+
+# =======================================================
+# Fingerprinting
+# =======================================================
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\$\d+|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_RE = re.compile(r"(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement):
+    """Normalise SQL so statements differing only in literals share a key."""
+    sql = _COMMENT_RE.sub(" ", statement)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(?+)", sql)
+    sql = _VALUES_RE.sub(r"\1, ...", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+# =======================================================
+# Aggregation
+# =======================================================
+
+class _FingerprintStats:
+    """Counters for one fingerprint."""
+
+    __slots__ = ("count", "total", "max", "samples", "slow", "plan", "plan_at")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=_SAMPLES_PER_FINGERPRINT)
+        self.slow = 0
+        self.plan = None
+        self.plan_at = 0.0
+
+    def p95(self):
+        """95th percentile of the recent samples (seconds)."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+_lock = threading.Lock()
+_stats = OrderedDict()
+
+
+def record(statement, elapsed):
+    """Add one execution of `statement` taking `elapsed` seconds; return its entry."""
+    key = fingerprint(statement)
+    with _lock:
+        entry = _stats.get(key)
+        if entry is None:
+            entry = _stats[key] = _FingerprintStats()
+            while len(_stats) > MAX_FINGERPRINTS:
+                _stats.popitem(last=False)
+        else:
+            _stats.move_to_end(key)
+
+        entry.count += 1
+        entry.total += elapsed
+        entry.max = max(entry.max, elapsed)
+        entry.samples.append(elapsed)
+        return key, entry
+
+
+def report(limit=50, order_by="total"):
+    """Return the top fingerprints as dicts, heaviest first."""
+    sort_keys = {
+        "total": lambda item: item[1].total,
+        "count": lambda item: item[1].count,
+        "p95": lambda item: item[1].p95(),
+        "max": lambda item: item[1].max,
+    }
+    with _lock:
+        items = sorted(_stats.items(), key=sort_keys.get(order_by, sort_keys["total"]), reverse=True)[:limit]
+        return [
+            {
+                "fingerprint": key,
+                "count": e.count,
+                "total_ms": round(e.total * 1000, 3),
+                "mean_ms": round(e.total * 1000 / e.count, 3) if e.count else 0.0,
+                "p95_ms": round(e.p95() * 1000, 3),
+                "max_ms": round(e.max * 1000, 3),
+                "slow": e.slow,
+                "plan": e.plan,
+            }
+            for key, e in items
+        ]
+
+
+def reset():
+    """Forget all collected statistics."""
+    with _lock:
+        _stats.clear()
+
+
+# =======================================================
+# Slow-Query Plans
+# =======================================================
+
+def _explain(cursor, dialect, statement, parameters):
+    """Run EXPLAIN for `statement` on a side cursor and return plan lines."""
+    prefix = _EXPLAIN_PREFIX.get(dialect)
+    if prefix is None or not statement.lstrip()[:6].upper() == "SELECT":
+        return None
+
+    # Raw DBAPI cursor: bypasses SQLAlchemy events (no recursion)
+    side = cursor.connection.cursor()
+    try:
+        # On PostgreSQL a failed EXPLAIN would abort the caller's transaction
+        guard = dialect == "postgresql"
+        if guard:
+            side.execute("SAVEPOINT brainery_explain")
+        try:
+            side.execute(prefix + statement, parameters)
+            rows = side.fetchall()
+        except Exception:
+            if guard:
+                side.execute("ROLLBACK TO SAVEPOINT brainery_explain")
+            raise
+        finally:
+            if guard:
+                side.execute("RELEASE SAVEPOINT brainery_explain")
+    finally:
+        side.close()
+
+    # SQLite rows are (id, parent, notused, detail); PostgreSQL rows are (line,)
+    return [str(row[-1]) for row in rows]
+
+
+def _log_slow(key, entry, cursor, conn, statement, parameters, elapsed):
+    """Log a slow statement, capturing its plan at most once per interval."""
+    now = time.monotonic()
+    with _lock:
+        entry.slow += 1
+        stale = entry.plan is None or now - entry.plan_at > _EXPLAIN_INTERVAL
+        if stale:
+            entry.plan_at = now
+
+    if stale:
+        try:
+            plan = _explain(cursor, conn.dialect.name, statement, parameters)
+        except Exception as e:
+            plan = [f"EXPLAIN failed: {e}"]
+        with _lock:
+            entry.plan = plan
+
+    # Bind parameters are deliberately not logged (may contain credentials)
+    logger.warning(
+        "slow query %.1f ms: %s\nplan: %s",
+        elapsed * 1000, key, "\n      ".join(entry.plan or ["(not captured)"]),
+    )
+
+
+# =======================================================
+# Engine Hooks
+# =======================================================
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Stamp the statement start on its execution context."""
+    # Per-statement, so a statement that raises leaves nothing behind
+    if QUERY_STATS_ENABLED:
+        context._query_stats_start = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Aggregate the statement and log it if slow."""
+    started = getattr(context, "_query_stats_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+
+    key, entry = record(statement, elapsed)
+    if elapsed * 1000 >= SLOW_QUERY_MS and not executemany:
+        _log_slow(key, entry, cursor, conn, statement, parameters, elapsed)
@@ -0,0 +1,84 @@
+# =======================================================
+# Saved Topic Write Helpers (Dialect-Aware Upsert)
+# =======================================================
+# Saving a topic used to take an existence check, a Topic lookup
+# for the summary and an INSERT/refresh. On SQLite and PostgreSQL
+# this collapses into one INSERT … ON CONFLICT DO NOTHING … RETURNING
+# that also resolves the summary and is safe against concurrent saves.
+
+# Import required modules
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from brainery_data.sql.models import SavedTopic, Topic
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Summary stored when the catalogue has no description for a title
+DEFAULT_SUMMARY = "No summary available."
+
+# Dialects with INSERT … ON CONFLICT … RETURNING support
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+# =======================================================
+# Summary Resolution
+# =======================================================
+
+def _summary_expr(title):
+    """SQL expression yielding the catalogue description for `title` (or the default)."""
+    described = (
+        select(Topic.description)
+        .where(Topic.title == title, Topic.description.is_not(None), Topic.description != "")
+        .limit(1)
+        .scalar_subquery()
+    )
+    return func.coalesce(described, DEFAULT_SUMMARY)
+
+
+# =======================================================
+# Insert-If-Absent
+# =======================================================
+
+def insert_saved_topic(db, user_id, title):
+    """
+    Insert a saved topic unless the user already saved that title.
+    Returns (id, created_at) for the new row, or None on conflict.
+    The caller owns the transaction (commit/rollback).
+    """
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+
+    # Single round-trip path: conflicts are detected by uq_savedtopic_user_title
+    if insert is not None:
+        stmt = (
+            insert(SavedTopic)
+            .values(
+                user_id=user_id,
+                title=title,
+                summary=_summary_expr(title),
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "title"])
+            .returning(SavedTopic.id, SavedTopic.created_at)
+        )
+        row = db.execute(stmt).first()
+        return (row.id, row.created_at) if row else None
+
+    # Portable fallback for other dialects (check-then-insert)
+    exists = db.execute(
+        select(SavedTopic.id).where(SavedTopic.user_id == user_id, SavedTopic.title == title)
+    ).first()
+    if exists:
+        return None
+    st = SavedTopic(user_id=user_id, title=title, summary=db.execute(select(_summary_expr(title))).scalar())
+    db.add(st)
+    db.flush()
+    return st.id, st.created_at
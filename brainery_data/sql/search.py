@@ -0,0 +1,187 @@
+# =======================================================
+# Full-Text Topic Search (FTS5 / tsvector)
+# =======================================================
+# Ranked search over Topic.title and Topic.description without
+# LIKE '%x%' scans:
+#   - SQLite: an external-content FTS5 table (topics_fts) kept in
+#     sync with topics by AFTER INSERT/UPDATE/DELETE triggers.
+#   - PostgreSQL: a stored generated tsvector column on topics
+#     (title weighted above description) with a GIN index.
+# The schema objects are created by the Alembic migration and, for
+# databases built with metadata.create_all(), by the DDL hooks below.
+
+# Import required modules
+import html
+import re
+
+from sqlalchemy import DDL, event, text
+
+from brainery_data.sql.models import Topic
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Maximum query terms passed to the engine
+MAX_TERMS = 8
+
+# Highlight sentinels (swapped for <mark> after HTML-escaping)
+_HL_START = "⟦"
+_HL_STOP = "⟧"
+
+
+# =======================================================
+# Schema (SQLite FTS5)
+# =======================================================
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS topics_fts USING fts5("
+    "title, description, content='topics', content_rowid='id', "
+    "tokenize='porter unicode61')",
+
+    "CREATE TRIGGER IF NOT EXISTS topics_fts_ai AFTER INSERT ON topics BEGIN "
+    "INSERT INTO topics_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+
+    "CREATE TRIGGER IF NOT EXISTS topics_fts_ad AFTER DELETE ON topics BEGIN "
+    "INSERT INTO topics_fts(topics_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+
+    "CREATE TRIGGER IF NOT EXISTS topics_fts_au AFTER UPDATE OF title, description ON topics BEGIN "
+    "INSERT INTO topics_fts(topics_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO topics_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+
+    # Index any rows that existed before the table was created
+    "INSERT INTO topics_fts(topics_fts) VALUES ('rebuild')",
+]
+
+
+# =======================================================
+# Schema (PostgreSQL tsvector + GIN)
+# =======================================================
+
+POSTGRESQL_DDL = [
+    "ALTER TABLE topics ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ") STORED",
+
+    "CREATE INDEX IF NOT EXISTS ix_topics_search_vector ON topics USING gin (search_vector)",
+]
+
+
+# Emit the search schema whenever create_all() builds the topics table
+for _statement in SQLITE_DDL:
+    event.listen(Topic.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRESQL_DDL:
+    event.listen(Topic.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    Topic.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS topics_fts").execute_if(dialect="sqlite"),
+)
+
+
+# =======================================================
+# Queries
+# =======================================================
+
+_SQLITE_SEARCH = text(f"""
+    SELECT t.id, t.subject_id, t.title,
+           snippet(topics_fts, 0, '{_HL_START}', '{_HL_STOP}', '…', 12) AS title_hl,
+           snippet(topics_fts, 1, '{_HL_START}', '{_HL_STOP}', '…', 24) AS snippet,
+           -bm25(topics_fts, 10.0, 1.0) AS score
+    FROM topics_fts
+    JOIN topics AS t ON t.id = topics_fts.rowid
+    WHERE topics_fts MATCH :match
+    ORDER BY bm25(topics_fts, 10.0, 1.0), t.id
+    LIMIT :limit OFFSET :offset
+""")
+
+# Rank and page first; headlines are only built for the returned rows
+_POSTGRESQL_SEARCH = text("""
+    WITH q AS (SELECT websearch_to_tsquery('english', :query) AS tsq),
+    hits AS (
+        SELECT t.id, t.subject_id, t.title, t.description,
+               ts_rank_cd(t.search_vector, q.tsq) AS score
+        FROM topics AS t, q
+        WHERE t.search_vector @@ q.tsq
+        ORDER BY score DESC, t.id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT hits.id, hits.subject_id, hits.title,
+           ts_headline('english', hits.title, q.tsq, :title_opts) AS title_hl,
+           ts_headline('english', coalesce(hits.description, ''), q.tsq, :snippet_opts) AS snippet,
+           hits.score
+    FROM hits, q
+    ORDER BY hits.score DESC, hits.id
+""")
+
+_PG_TITLE_OPTS = f"StartSel={_HL_START}, StopSel={_HL_STOP}, HighlightAll=true"
+_PG_SNIPPET_OPTS = f"StartSel={_HL_START}, StopSel={_HL_STOP}, MaxWords=30, MinWords=12, MaxFragments=2, FragmentDelimiter=\" … \""
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def supported(db):
+    """True when the bound database has a full-text search backend."""
+    return db.get_bind().dialect.name in ("sqlite", "postgresql")
+
+
+def _fts5_match(query):
+    """Turn free text into a safe FTS5 MATCH expression (AND of quoted terms)."""
+    terms = _TERM_RE.findall(query.lower())[:MAX_TERMS]
+    if not terms:
+        return None
+    # The last term is a prefix so results follow the user's typing
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _highlight(fragment):
+    """HTML-escape a highlighted fragment and turn the sentinels into <mark>."""
+    escaped = html.escape(fragment or "")
+    return escaped.replace(_HL_START, "<mark>").replace(_HL_STOP, "</mark>")
+
+
+def search_topics(db, query, limit, offset=0):
+    """
+    Return up to `limit` ranked matches for `query`, best first, as dicts
+    with id, subject_id, title, title_html, snippet_html and score.
+    Raises RuntimeError on databases where supported() is False.
+    """
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        match = _fts5_match(query)
+        if match is None:
+            return []
+        rows = db.execute(_SQLITE_SEARCH, {"match": match, "limit": limit, "offset": offset}).all()
+    elif dialect == "postgresql":
+        if not _TERM_RE.search(query):
+            return []
+        rows = db.execute(_POSTGRESQL_SEARCH, {
+            "query": query,
+            "limit": limit,
+            "offset": offset,
+            "title_opts": _PG_TITLE_OPTS,
+            "snippet_opts": _PG_SNIPPET_OPTS,
+        }).all()
+    else:
+        raise RuntimeError(f"Full-text search is not available on {dialect}")
+
+    return [
+        {
+            "id": r.id,
+            "subject_id": r.subject_id,
+            "title": r.title,
+            "title_html": _highlight(r.title_hl),
+            "snippet_html": _highlight(r.snippet),
+            "score": round(float(r.score or 0.0), 6),
+        }
+        for r in rows
+    ]
@@ -0,0 +1,192 @@
+# =======================================================
+# Fuzzy Type-Ahead (In-Memory Trigram Index)
+# =======================================================
+# Suggestions for the dashboard search box are answered from a
+# per-worker trigram index over topic titles and subject names, so
+# typing never reaches the database. The index follows the catalogue
+# snapshot: when a catalogue write produces a new snapshot version,
+# only the entries that were added or removed are re-indexed.
+
+# Import required modules
+import heapq
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from brainery_data.sql import catalogue
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Minimum trigram similarity for a fuzzy (non-prefix) match
+SUGGEST_MIN_SIMILARITY = float(os.getenv("SUGGEST_MIN_SIMILARITY", "0.25"))
+
+# Longest query considered (characters)
+SUGGEST_MAX_QUERY_LENGTH = 100
+
+# Ranking bonuses for literal matches on top of trigram similarity
+_PREFIX_BONUS = 1.0
+_WORD_PREFIX_BONUS = 0.5
+
+
+# =======================================================
+# Normalisation and Trigrams
+# =======================================================
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalise(value):
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD_RE.sub(" ", stripped.casefold()).strip()
+
+
+def trigrams(normalised):
+    """Return the set of word trigrams (each word padded like pg_trgm: "  w" … "d ")."""
+    grams = set()
+    for word in normalised.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# =======================================================
+# Index
+# =======================================================
+
+class TrigramIndex:
+    """Thread-safe trigram postings over (key -> payload) entries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # key -> (payload, normalised text, trigram set)
+        self._entries = {}
+
+        # trigram -> set of keys containing it
+        self._postings = defaultdict(set)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, key, text, payload):
+        norm = normalise(text)
+        grams = trigrams(norm)
+        self._entries[key] = (payload, norm, grams)
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    def _remove(self, key):
+        _, _, grams = self._entries.pop(key)
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def sync(self, documents):
+        """
+        Make the index match `documents` ({key: (text, payload)}), touching
+        only keys that were added or removed. Returns (added, removed).
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key not in documents]
+            fresh = [key for key in documents if key not in self._entries]
+            for key in stale:
+                self._remove(key)
+            for key in fresh:
+                text, payload = documents[key]
+                self._add(key, text, payload)
+            return len(fresh), len(stale)
+
+    def search(self, query, k):
+        """Return the top `k` (score, payload) pairs for `query`, best first."""
+        norm = normalise(query)[:SUGGEST_MAX_QUERY_LENGTH]
+        grams = trigrams(norm)
+        if not grams:
+            return []
+
+        with self._lock:
+            # Count shared trigrams per candidate via the postings lists
+            shared = defaultdict(int)
+            for gram in grams:
+                for key in self._postings.get(gram, ()):
+                    shared[key] += 1
+
+            scored = []
+            for key, common in shared.items():
+                payload, text, doc_grams = self._entries[key]
+
+                # Jaccard similarity of the trigram sets
+                score = common / (len(grams) + len(doc_grams) - common)
+
+                # Literal prefixes outrank fuzzy matches
+                if text.startswith(norm):
+                    score += _PREFIX_BONUS
+                elif f" {norm}" in f" {text}":
+                    score += _WORD_PREFIX_BONUS
+                elif score < SUGGEST_MIN_SIMILARITY:
+                    continue
+
+                scored.append((score, text, key, payload))
+
+        # Ties resolve alphabetically so results are stable
+        best = heapq.nsmallest(k, scored, key=lambda item: (-item[0], item[1], item[2]))
+        return [(round(score, 4), payload) for score, _, _, payload in best]
+
+
+# =======================================================
+# Catalogue-Backed Index
+# =======================================================
+
+_index = TrigramIndex()
+
+# Snapshot version the index currently reflects
+_indexed_version = None
+_sync_lock = threading.Lock()
+
+
+def _documents(snap):
+    """Flatten a catalogue snapshot into index documents."""
+    documents = {}
+    for subject in snap.subjects:
+        sid = int(subject["_id"])
+        documents[("subject", sid)] = (
+            subject["name"],
+            {"type": "subject", "name": subject["name"], "subject_id": sid},
+        )
+    for sid, rows in snap.topics_by_subject.items():
+        for row in rows:
+            documents[("topic", sid, row["title"])] = (
+                row["title"],
+                {"type": "topic", "title": row["title"], "subject_id": sid},
+            )
+    return documents
+
+
+def get_index():
+    """Return the index, syncing it first if the catalogue snapshot changed."""
+    global _indexed_version
+
+    snap = catalogue.get_snapshot()
+    if snap.version != _indexed_version:
+        with _sync_lock:
+            if snap.version != _indexed_version:
+                _index.sync(_documents(snap))
+                _indexed_version = snap.version
+    return _index
+
+
+def suggest(query, k=8):
+    """Return up to `k` topic/subject suggestions for a partial, possibly misspelt query."""
+    return [
+        dict(payload, score=score)
+        for score, payload in get_index().search(query, k)
+    ]
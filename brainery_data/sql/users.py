@@ -0,0 +1,33 @@
+# =======================================================
+# User Lookup Helpers (Normalised Email)
+# =======================================================
+# Every email lookup goes through users.email_normalized, which has a
+# unique index; filtering on lower(email) could not use ix_users_email
+# and scanned the whole table on each login.
+
+# Import required modules
+from sqlalchemy import select
+
+from brainery_data.sql.models import UserSQL, normalize_email
+
+
+def find_user_by_email(db, email):
+    """Return the UserSQL row for `email` (any case/whitespace), or None."""
+    normalized = normalize_email(email)
+    if not normalized:
+        return None
+    return (
+        db.query(UserSQL)
+          .filter(UserSQL.email_normalized == normalized)
+          .one_or_none()
+    )
+
+
+def email_exists(db, email):
+    """Return True if an account is registered under `email`."""
+    normalized = normalize_email(email)
+    if not normalized:
+        return False
+    return db.execute(
+        select(UserSQL.id).where(UserSQL.email_normalized == normalized).limit(1)
+    ).first() is not None
@@ -203,7 +203,7 @@ $(document).ready(function () {
         .then(data => {
             if (data.success) {
                 showPopupMessage("User promoted successfully!", "success");
-                setTimeout(() => location.reload(), 1000);
+                markUserPromoted(userId);
             } else {
                 showPopupMessage(data.error || "Failed to promote user.", "error");
             }
@@ -237,7 +237,7 @@ $(document).ready(function () {
         .then(data => {
             if (data.success) {
                 showPopupMessage("User deleted successfully!", "success");
-                setTimeout(() => location.reload(), 1000);
+                removeUserRow(userId);
             } else {
                 showPopupMessage(data.error || "Failed to delete user.", "error");
             }
@@ -288,6 +288,233 @@ $(document).ready(function () {
         window.deleteUser(id);
     });
 
+    /* =======================================================
+    SECTION 2B: User Table (Server-Side Search, Sort & Paging)
+    ======================================================= */
+
+    // URL of the next page (from the Link header), null when exhausted
+    let usersNext = null;
+
+    // True while a page request is in flight
+    let usersLoading = false;
+
+    // Bumped on every search/sort change so stale responses are dropped
+    let usersGeneration = 0;
+
+    // Extract the rel="next" URL from a Link header
+    function parseNextLink(linkHeader) {
+        if (!linkHeader) return null;
+        const m = linkHeader.match(/<([^>]+)>\s*;\s*rel="next"/);
+        return m ? m[1] : null;
+    }
+
+    // Build one table row (text() keeps user-supplied values escaped)
+    function userRow(user) {
+        const $actions = $("<td>").addClass("action-icons");
+        if (user.role !== "admin") {
+            $actions.append($("<i>").addClass("fas fa-user-shield icon-promote")
+                .attr({ "data-user-id": user.id, title: "Promote to admin" }));
+        }
+        $actions.append($("<i>").addClass("fas fa-trash icon-delete")
+            .attr({ "data-user-id": user.id, title: "Delete user" }));
+
+        return $("<tr>").attr("data-user-id", user.id).append(
+            $("<td>").append($("<input>").attr({ type: "checkbox" }).addClass("user-select")),
+            $("<td>").text(user.username),
+            $("<td>").text(user.email),
+            $("<td>").addClass("user-role").text(user.role),
+            $actions
+        );
+    }
+
+    // Show paging state under the table
+    function updateUsersStatus() {
+        const count = $("#user-table-body tr").length;
+        let text = "";
+        if (usersLoading) text = "Loading…";
+        else if (count === 0) text = "No users found.";
+        $("#user-table-status").text(text);
+        $("#user-load-more").toggleClass("d-none", !usersNext || usersLoading);
+    }
+
+    // Fetch one page and append its rows
+    function fetchUsersPage(url) {
+        const generation = usersGeneration;
+        usersLoading = true;
+        updateUsersStatus();
+
+        $.getJSON(url, function (users, _status, xhr) {
+            if (generation !== usersGeneration) return;
+
+            // Remember where the next page starts (null when this was the last)
+            usersNext = parseNextLink(xhr.getResponseHeader("Link"));
+            $("#user-table-body").append(users.map(userRow));
+            updateBulkButtons();
+        }).fail(() => {
+            if (generation !== usersGeneration) return;
+            usersNext = null;
+            showPopupMessage("Failed to load users.", "error");
+        }).always(() => {
+            if (generation !== usersGeneration) return;
+            usersLoading = false;
+            updateUsersStatus();
+
+            // Short pages may not overflow; keep filling until they do
+            maybeLoadMoreUsers();
+        });
+    }
+
+    // Load the next page when the table is scrolled near its end
+    function maybeLoadMoreUsers() {
+        const panel = document.getElementById("user-table-scroll");
+        if (!panel || !usersNext || usersLoading) return;
+        if (panel.scrollTop + panel.clientHeight >= panel.scrollHeight - 200) {
+            fetchUsersPage(usersNext);
+        }
+    }
+
+    // Restart from the first page for the current search/sort
+    function reloadUsers() {
+        usersGeneration += 1;
+        usersNext = null;
+        usersLoading = false;
+        $("#user-table-body").empty();
+        updateBulkButtons();
+
+        const [sort, dir] = ($("#user-sort").val() || "created:desc").split(":");
+        const params = new URLSearchParams({ sort: sort, dir: dir });
+        const q = ($("#user-search").val() || "").trim();
+        if (q) params.set("q", q);
+
+        fetchUsersPage(`${(window.APP_PREFIX || "")}/admin/users?${params.toString()}`);
+    }
+
+    // Adjust a sidebar counter by delta
+    function bumpStat(selector, delta) {
+        const $el = $(selector);
+        const value = parseInt($el.text(), 10);
+        if (!isNaN(value)) $el.text(Math.max(0, value + delta));
+    }
+
+    // Reflect a successful promotion without reloading the page
+    function markUserPromoted(userId) {
+        const $row = $(`#user-table-body tr[data-user-id="${userId}"]`);
+        $row.find(".user-role").text("admin");
+        $row.find(".icon-promote").remove();
+        bumpStat("#stat-admin-users", 1);
+    }
+
+    // Reflect a successful deletion without reloading the page
+    function removeUserRow(userId) {
+        const $row = $(`#user-table-body tr[data-user-id="${userId}"]`);
+        if ($row.find(".user-role").text() === "admin") bumpStat("#stat-admin-users", -1);
+        $row.remove();
+        bumpStat("#stat-total-users", -1);
+        updateUsersStatus();
+        updateBulkButtons();
+    }
+
+    /* =======================================================
+    SECTION 2C: Multi-Select & Bulk Actions
+    ======================================================= */
+
+    // Ids of the ticked rows
+    function selectedUserIds() {
+        return $("#user-table-body .user-select:checked").map(function () {
+            return $(this).closest("tr").attr("data-user-id");
+        }).get();
+    }
+
+    // Enable the bulk buttons and show how many rows are ticked
+    function updateBulkButtons() {
+        const count = selectedUserIds().length;
+        $(".bulk-count").text(count);
+        $("#bulk-promote, #bulk-delete").prop("disabled", count === 0);
+
+        const total = $("#user-table-body .user-select").length;
+        $("#select-all-users").prop("checked", total > 0 && count === total);
+    }
+
+    // Send one bulk request and apply the per-id outcomes to the table
+    function bulkAction(action, ids) {
+        $("#bulk-promote, #bulk-delete").prop("disabled", true);
+
+        fetch(`${(window.APP_PREFIX || "")}/admin/users/${action}`, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "X-CSRFToken": csrfToken,
+                "X-Requested-With": "XMLHttpRequest"
+            },
+            body: JSON.stringify({ ids: ids })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                showPopupMessage(data.error || "Bulk action failed.", "error");
+                return;
+            }
+
+            (data.results || []).forEach(result => {
+                if (result.status !== 200) return;
+                if (action === "promote") markUserPromoted(result.id);
+                else removeUserRow(result.id);
+            });
+
+            const done = action === "promote" ? data.promoted : data.deleted;
+            const skipped = (data.results || []).length - done;
+            const verb = action === "promote" ? "promoted" : "deleted";
+            showPopupMessage(
+                `${done} user(s) ${verb}` + (skipped ? `, ${skipped} skipped.` : "."),
+                skipped && !done ? "error" : "success"
+            );
+        })
+        .catch(error => {
+            console.error("[DEBUG] Error:", error);
+            showPopupMessage("An error occurred.", "error");
+        })
+        .finally(() => {
+            $("#user-table-body .user-select").prop("checked", false);
+            updateBulkButtons();
+        });
+    }
+
+    // Tick/untick every loaded row
+    $("#select-all-users").on("change", function () {
+        $("#user-table-body .user-select").prop("checked", this.checked);
+        updateBulkButtons();
+    });
+    $(document).on("change", ".user-select", updateBulkButtons);
+
+    $("#bulk-promote").on("click", function () {
+        const ids = selectedUserIds();
+        if (ids.length) bulkAction("promote", ids);
+    });
+
+    $("#bulk-delete").on("click", function () {
+        const ids = selectedUserIds();
+        if (ids.length && confirm(`Delete ${ids.length} user(s)? This cannot be undone.`)) {
+            bulkAction("delete", ids);
+        }
+    });
+
+    // Debounced search; sort changes apply immediately
+    let searchTimer = null;
+    $("#user-search").on("input", function () {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(reloadUsers, 250);
+    });
+    $("#user-sort").on("change", reloadUsers);
+
+    // Infinite scroll plus an explicit fallback button
+    $("#user-table-scroll").on("scroll", maybeLoadMoreUsers);
+    $("#user-load-more").on("click", function () {
+        if (usersNext && !usersLoading) fetchUsersPage(usersNext);
+    });
+
+    // First page
+    reloadUsers();
+
     /* =======================================================
     SECTION 3: Logout Functionality
     ======================================================= */
@@ -331,7 +558,7 @@ $(document).ready(function () {
     SECTION 5: Debugging - Check Button Clicks
     ======================================================= */
 
-    $(".icon-promote, .icon-delete").on("click", function () {
+    $(document).on("click", ".icon-promote, .icon-delete", function () {
         console.log("[DEBUG] Button Clicked:", this);
     });
 });
@@ -140,6 +140,129 @@ $(document).ready(function () {
         });
     }
 
+    /* =======================================================
+    SECTION 5A: Full-Text Topic Search
+    ======================================================= */
+
+    // Build a result card; title/snippet HTML arrive escaped with <mark> highlights
+    function searchResultCard(result) {
+        const $body = $("<div>").addClass("card-body text-center").append(
+            $("<h6>").addClass("fw-bold mb-2").html(result.title_html),
+            $("<p>").addClass("text-muted small").html(result.snippet_html),
+            $("<button>").addClass("btn btn-info btn-sm read-topic mt-2").attr("data-title", result.title).text("🔗 Read More"),
+            " ",
+            $("<button>").addClass("btn btn-success btn-sm save-topic mt-2").attr("data-title", result.title).text("💾 Save")
+        );
+        return $("<div>").addClass("col").append($("<div>").addClass("card shadow-sm p-3").append($body));
+    }
+
+    // Fetch one page of matches; offset > 0 appends to the current results
+    function searchTopics(query, offset = 0) {
+        const params = new URLSearchParams({ q: query, offset: offset });
+
+        $.getJSON(`${APP_BASE}/dashboard/search?${params.toString()}`, function (page) {
+            if (offset === 0) {
+                $("#subject-title").text(`🔎 Results for "${query}"`);
+                $("#study-content").html(`<div id="search-results" class="row row-cols-1 row-cols-md-3 g-3"></div>`);
+            }
+            $("#search-more").remove();
+            $("#search-results").append(page.results.map(searchResultCard));
+
+            // Nothing matched at all
+            if ($("#search-results").children().length === 0) {
+                $("#search-results").html("<p class='text-center text-muted'>No matching topics.</p>");
+            }
+
+            // Offer the next page when there is one
+            if (page.next_offset !== null) {
+                $("<div id='search-more' class='text-center mt-3'>")
+                    .append($("<button class='btn btn-outline-secondary btn-sm'>").text("More results")
+                        .on("click", () => searchTopics(query, page.next_offset)))
+                    .appendTo("#study-content");
+            }
+        }).fail(() => {
+            showToast("❌ Error searching topics.", "danger");
+        });
+    }
+
+    // Submit the sidebar search box
+    $("#topic-search-form").on("submit", function (e) {
+        e.preventDefault();
+        const query = ($("#topic-search").val() || "").trim();
+        if (!query) return;
+        hideSuggestions();
+        searchTopics(query);
+        autoCollapseSidebar();
+    });
+
+    /* =======================================================
+    SECTION 5B: Type-Ahead Suggestions
+    ======================================================= */
+
+    // Debounce timer and the latest request (older responses are dropped)
+    let suggestTimer = null;
+    let suggestSeq = 0;
+
+    function hideSuggestions() {
+        $("#topic-suggestions").addClass("d-none").empty();
+    }
+
+    // Render suggestions; topics run a search, subjects open their topic list
+    function showSuggestions(items) {
+        const $list = $("#topic-suggestions").empty();
+        if (!items.length) {
+            hideSuggestions();
+            return;
+        }
+        items.forEach(item => {
+            const label = item.type === "subject" ? `📚 ${item.name}` : item.title;
+            $("<li>")
+                .addClass("list-group-item list-group-item-action py-1 small topic-suggestion")
+                .attr({ "data-type": item.type, "data-subject-id": item.subject_id })
+                .data("value", item.type === "subject" ? item.name : item.title)
+                .text(label)
+                .appendTo($list);
+        });
+        $list.removeClass("d-none");
+    }
+
+    // Ask the server's in-memory index as the user types
+    $("#topic-search").on("input", function () {
+        clearTimeout(suggestTimer);
+        const query = ($(this).val() || "").trim();
+        if (!query) {
+            hideSuggestions();
+            return;
+        }
+
+        suggestTimer = setTimeout(() => {
+            const seq = ++suggestSeq;
+            $.getJSON(`${APP_BASE}/dashboard/suggest`, { q: query }, function (items) {
+                if (seq === suggestSeq) showSuggestions(items);
+            });
+        }, 120);
+    });
+
+    // Pick a suggestion
+    $(document).on("click", ".topic-suggestion", function () {
+        const value = $(this).data("value");
+        $("#topic-search").val(value);
+        hideSuggestions();
+
+        if ($(this).attr("data-type") === "subject") {
+            $("#subject-title").text("📚 Topics");
+            loadTopics($(this).attr("data-subject-id"));
+        } else {
+            searchTopics(value);
+        }
+        autoCollapseSidebar();
+    });
+
+    // Escape closes the list
+    $("#topic-search").on("keydown", function (e) {
+        if (e.key === "Escape") hideSuggestions();
+    });
+
     /* =======================================================
     SECTION 6: Save a Topic (CREATE)
     ======================================================= */
@@ -175,56 +298,99 @@ $(document).ready(function () {
     });
 
     /* =======================================================
-    SECTION 7: Load Saved Topics on Login
+    SECTION 7: Load Saved Topics on Login (Paged, Infinite Scroll)
     ======================================================= */
 
-    // Function to fetch and display saved topics
-    function loadSavedTopics() {
-        // Update the page title to indicate saved topics
-        $("#subject-title").text("📌 Saved Topics");
+    // URL of the next saved-topics page (from the Link header), or null
+    let savedTopicsNext = null;
 
-        // Send an AJAX request to fetch saved topics from the server
-        $.getJSON(`${APP_BASE}/dashboard/saved_topics`, function (savedTopics) {
-            let savedHtml = `<div class="row row-cols-1 row-cols-md-3 g-3">`;
-
-            // Check if there are any saved topics
-            if (savedTopics.length > 0) {
-                savedTopics.forEach(topic => {
-                    // Format timestamp for display or show "Unknown Date" if unavailable
-                    let savedDate = topic.timestamp ? new Date(topic.timestamp).toLocaleString() : "Unknown Date";
-
-                    // Create a card for each saved topic with relevant details and actions
-                    savedHtml += `
-                        <div class="col">
-                            <div class="card shadow-sm p-3">
-                                <div class="card-body text-center">
-                                    <h6 class="fw-bold mb-2">${topic.title}</h6>
-                                    <p class="text-muted small"><i class="fa-solid fa-calendar-days"></i> ${savedDate}</p>
-                                    <button class="btn btn-success btn-sm open-topic mt-2" data-id="${topic._id}" data-wiki-title="${topic.wiki_title || topic.title}">🔗 Open</button>
-                                    <button class="btn edit-topic border-0" data-id="${topic._id}" style="color: #FFC107; font-size: 22px;">✏️</button>
-                                    <button class="btn delete-topic border-0" data-id="${topic._id}" style="color: #DC3545; font-size: 26px;">❌</button>
-                                </div>
-                            </div>
-                        </div>`;
-                });
-            } else {
-                // Display message if no saved topics are available
-                savedHtml += "<p class='text-center text-muted'>No saved topics yet.</p>";
-            }
+    // True while a page request is in flight (prevents duplicate fetches)
+    let savedTopicsLoading = false;
+
+    // Extract the rel="next" URL from a Link response header
+    function parseNextLink(linkHeader) {
+        if (!linkHeader) return null;
+        const m = linkHeader.match(/<([^>]+)>\s*;\s*rel="next"/);
+        return m ? m[1] : null;
+    }
+
+    // Build the card markup for a single saved topic
+    function savedTopicCard(topic) {
+        // Format timestamp for display or show "Unknown Date" if unavailable
+        let savedDate = topic.timestamp ? new Date(topic.timestamp).toLocaleString() : "Unknown Date";
+
+        return `
+            <div class="col">
+                <div class="card shadow-sm p-3">
+                    <div class="card-body text-center">
+                        <h6 class="fw-bold mb-2">${topic.title}</h6>
+                        <p class="text-muted small"><i class="fa-solid fa-calendar-days"></i> ${savedDate}</p>
+                        <button class="btn btn-success btn-sm open-topic mt-2" data-id="${topic._id}" data-wiki-title="${topic.wiki_title || topic.title}">🔗 Open</button>
+                        <button class="btn edit-topic border-0" data-id="${topic._id}" style="color: #FFC107; font-size: 22px;">✏️</button>
+                        <button class="btn delete-topic border-0" data-id="${topic._id}" style="color: #DC3545; font-size: 26px;">❌</button>
+                    </div>
+                </div>
+            </div>`;
+    }
 
-            savedHtml += "</div>";
+    // Fetch one page of saved topics and append it to the grid
+    function fetchSavedTopicsPage(url) {
+        savedTopicsLoading = true;
 
-            // Insert the saved topics into the study content section
-            $("#study-content").html(savedHtml);
+        $.getJSON(url, function (savedTopics, _status, xhr) {
+            // Remember where the next page starts (null when this was the last)
+            savedTopicsNext = parseNextLink(xhr.getResponseHeader("Link"));
+
+            // Append the cards for this page
+            $("#saved-topics-grid").append(savedTopics.map(savedTopicCard).join(""));
+
+            // Display message if no saved topics are available at all
+            if ($("#saved-topics-grid").children().length === 0) {
+                $("#saved-topics-grid").html("<p class='text-center text-muted'>No saved topics yet.</p>");
+            }
         }).fail(() => {
             // Show an error message if the request fails
+            savedTopicsNext = null;
             showToast("❌ Error loading saved topics.", "danger");
+        }).always(() => {
+            savedTopicsLoading = false;
+
+            // Short first pages may not overflow; keep filling until they do
+            maybeLoadMoreSavedTopics();
         });
+    }
+
+    // Load the next page when the content panel is scrolled near its end
+    function maybeLoadMoreSavedTopics() {
+        const panel = document.getElementById("study-content");
+        if (!panel || !savedTopicsNext || savedTopicsLoading) return;
+        if (!document.getElementById("saved-topics-grid")) return;
+
+        // Within ~one card height of the bottom
+        if (panel.scrollTop + panel.clientHeight >= panel.scrollHeight - 200) {
+            fetchSavedTopicsPage(savedTopicsNext);
+        }
+    }
+
+    // Function to fetch and display saved topics (first page)
+    function loadSavedTopics() {
+        // Update the page title to indicate saved topics
+        $("#subject-title").text("📌 Saved Topics");
+
+        // Reset paging state and render an empty grid to fill
+        savedTopicsNext = null;
+        $("#study-content").html(`<div id="saved-topics-grid" class="row row-cols-1 row-cols-md-3 g-3"></div>`);
+
+        // Send an AJAX request to fetch the first page from the server
+        fetchSavedTopicsPage(`${APP_BASE}/dashboard/saved_topics`);
 
         // Collapse the sidebar automatically after loading topics
         autoCollapseSidebar();
     }
 
+    // Infinite scroll inside the study content panel
+    $("#study-content").on("scroll", maybeLoadMoreSavedTopics);
+
     /* =======================================================
     SECTION 8: Open a Saved Topic
     ======================================================= */
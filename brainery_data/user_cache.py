@@ -0,0 +1,150 @@
+# =======================================================
+# Per-Worker Session User Cache (TTL + LRU)
+# =======================================================
+# Flask-Login reloads the user on every authenticated request.
+# This cache keeps compact CachedSessionUser records per worker so
+# that reload is usually a dict lookup instead of a DB round-trip.
+# Unknown ids are cached briefly too (negative caching). Writes that
+# change a user call invalidate_user(); other workers converge
+# within USER_CACHE_TTL_SECONDS.
+
+# Import required modules
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from brainery_data.models import CachedSessionUser
+from brainery_data.sql.db import get_db
+from brainery_data.sql.models import UserSQL
+
+
+# =======================================================
+# Configuration
+# =======================================================
+
+# Lifetime of a positive entry (bounds cross-worker staleness)
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+# Lifetime of a "no such user" entry
+USER_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("USER_CACHE_NEGATIVE_TTL_SECONDS", "5"))
+
+# Maximum entries per worker before least-recently-used eviction
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+
+# =======================================================
+# Cache Implementation
+# =======================================================
+
+class UserCache:
+    """Thread-safe TTL+LRU map of user id -> CachedSessionUser (or None)."""
+
+    def __init__(self, max_entries, ttl, negative_ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # uid -> (expires_at, record_or_None), oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters for diagnostics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, uid):
+        """Return (found, record); record is None for cached unknown ids."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[uid]
+                self.misses += 1
+                return False, None
+
+            # Mark as most recently used
+            self._entries.move_to_end(uid)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, uid, record):
+        """Store a record (or None for an unknown id) with the matching TTL."""
+        ttl = self.ttl if record is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[uid] = (time.monotonic() + ttl, record)
+            self._entries.move_to_end(uid)
+
+            # Evict least recently used entries beyond the bound
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, uid):
+        """Forget one user."""
+        with self._lock:
+            self._entries.pop(uid, None)
+
+    def clear(self):
+        """Forget every user."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return size and hit/miss counters."""
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Single cache instance per worker process
+_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS, USER_CACHE_NEGATIVE_TTL_SECONDS)
+
+
+# =======================================================
+# Public API
+# =======================================================
+
+def load_user(uid):
+    """Return the CachedSessionUser for `uid`, querying SQL only on a miss."""
+    found, record = _cache.get(uid)
+    if found:
+        return record
+
+    # Read only the columns the record needs (never the password hash)
+    db = get_db()
+    row = (
+        db.query(UserSQL.id, UserSQL.username, UserSQL.email, UserSQL.role)
+          .filter(UserSQL.id == uid)
+          .one_or_none()
+    )
+
+    record = CachedSessionUser.from_row(row) if row else None
+    _cache.put(uid, record)
+    return record
+
+
+def prime_user(row):
+    """Seed the cache from a freshly loaded UserSQL row and return its record."""
+    record = CachedSessionUser.from_row(row)
+    _cache.put(int(row.id), record)
+    return record
+
+
+def invalidate_user(uid):
+    """Drop a user after a role/password change or deletion."""
+    try:
+        _cache.invalidate(int(uid))
+    except (TypeError, ValueError):
+        pass
+
+
+def clear():
+    """Drop every cached user (e.g. after bulk changes)."""
+    _cache.clear()
+
+
+def stats():
+    """Return cache size and hit/miss counters for this worker."""
+    return _cache.stats()
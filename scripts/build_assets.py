@@ -0,0 +1,383 @@
+"""
+Build fingerprinted, minified, pre-compressed static assets.
+
+Usage:
+    python -m scripts.build_assets [--no-minify]
+
+Minifies static/css/*.css and static/js/*.js into static/dist/ as
+<name>.<hash>.<ext>, writes .gz (and .br when the optional `brotli`
+package is installed) next to each file, and records the mapping in
+static/dist/manifest.json for brainery_data.assets.asset_url().
+The already-minified bundle in static/vendor/ (scripts/vendor_assets.py)
+is fingerprinted and compressed the same way. Files a stylesheet
+references with a relative url() (e.g. fonts) are fingerprinted too
+and the url() is rewritten to point at them.
+
+The built-in minifiers only strip comments and whitespace (newlines
+in JS are kept, so automatic semicolon insertion is unaffected). If
+`rcssmin` / `rjsmin` are installed they are used instead. Files from
+previous builds that are no longer referenced are removed.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+from brainery_data.assets import DIST_DIR, MANIFEST_NAME
+
+STATIC = Path(__file__).resolve().parent.parent / "brainery_data" / "static"
+
+# Source groups: (directory under static/, extension, minify)
+SOURCES = [
+    ("css", ".css", True),
+    ("js", ".js", True),
+    ("vendor", ".css", False),
+    ("vendor", ".js", False),
+    ("vendor", ".svg", False),
+]
+
+# Hex digits of the content hash kept in file names
+HASH_LENGTH = 10
+
+# Compressed siblings smaller than this fraction of the original are kept
+MIN_COMPRESSION_GAIN = 0.95
+
+
+# =======================================================
+# CSS Minifier
+# =======================================================
+
+_CSS_TOKENS = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)""", re.S)
+
+# Whitespace next to these characters is never significant in CSS
+_CSS_TIGHT_BEFORE = set("{};,>)")
+_CSS_TIGHT_AFTER = set("{};,>:(")
+
+
+def minify_css(text):
+    """Strip comments and insignificant whitespace (strings untouched)."""
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+
+    out = []
+    pos = 0
+    pending_space = False
+    for m in _CSS_TOKENS.finditer(text):
+        chunk = text[pos:m.start()]
+        if chunk:
+            if pending_space and out and out[-1][-1] not in _CSS_TIGHT_AFTER and chunk[0] not in _CSS_TIGHT_BEFORE:
+                out.append(" ")
+            out.append(chunk)
+            pending_space = False
+        pos = m.end()
+
+        string, comment, space = m.groups()
+        if string:
+            if pending_space and out and out[-1][-1] not in _CSS_TIGHT_AFTER:
+                out.append(" ")
+            out.append(string)
+            pending_space = False
+        elif comment or space:
+            pending_space = True
+
+    tail = text[pos:]
+    if tail:
+        if pending_space and out and out[-1][-1] not in _CSS_TIGHT_AFTER and tail[0] not in _CSS_TIGHT_BEFORE:
+            out.append(" ")
+        out.append(tail)
+
+    # The last declaration in a block needs no semicolon
+    return "".join(out).replace(";}", "}")
+
+
+# =======================================================
+# JS Minifier (Comments and Indentation Only)
+# =======================================================
+
+# After these characters / keywords a "/" starts a regex literal
+_REGEX_AFTER_CHARS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_AFTER_WORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new",
+    "delete", "void", "throw", "instanceof", "yield", "await",
+}
+
+# Dropping a space next to these characters cannot merge two tokens
+_JS_TIGHT = set("{}();,:=<>[]?!&|")
+
+# One identifier/number run, or any other single character
+_JS_WORD = re.compile(r"[\w$]+|.", re.S)
+
+
+def _read_string(src, i, quote):
+    """Return the index just past the string literal starting at i."""
+    i += 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == "\\" else 1
+    return i + 1
+
+
+def _read_regex(src, i):
+    """Return the index just past the regex literal (and flags) at i."""
+    i += 1
+    in_class = False
+    while i < len(src):
+        ch = src[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            break
+        i += 1
+    i += 1
+    while i < len(src) and (src[i].isalnum() or src[i] == "_"):
+        i += 1
+    return i
+
+
+def _last_token(out):
+    """Return the last significant character or word written so far."""
+    text = "".join(out[-4:]).rstrip()
+    if not text:
+        return ""
+    m = re.search(r"[A-Za-z_$][\w$]*$", text)
+    return m.group(0) if m else text[-1]
+
+
+def minify_js(src):
+    """Strip comments, indentation and blank lines; keep every newline that separates code."""
+    if rjsmin is not None:
+        return rjsmin.jsmin(src)
+
+    out = []
+    # One entry per open template literal: brace depth inside its ${...}
+    templates = []
+    pending = ""  # "", " " or "\n" waiting to be written before the next token
+    i, n = 0, len(src)
+
+    def emit(token):
+        nonlocal pending
+        if pending and out:
+            if pending == "\n" and out[-1][-1:] != "\n":
+                out.append("\n")
+            elif pending == " " and out[-1][-1] not in _JS_TIGHT and token[0] not in _JS_TIGHT:
+                out.append(" ")
+        pending = ""
+        out.append(token)
+
+    def read_template_text(i):
+        """Copy template text from i up to the closing ` or the next ${."""
+        start = i
+        while i < n:
+            if src[i] == "\\":
+                i += 2
+            elif src[i] == "`":
+                out.append(src[start:i + 1])
+                return i + 1, False
+            elif src.startswith("${", i):
+                out.append(src[start:i + 2])
+                return i + 2, True
+            else:
+                i += 1
+        out.append(src[start:])
+        return n, False
+
+    while i < n:
+        ch = src[i]
+
+        # Whitespace: remember only whether a newline was involved
+        if ch.isspace():
+            if ch == "\n" or pending == "\n":
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i += 1
+        elif src.startswith("//", i):
+            end = src.find("\n", i)
+            i = n if end == -1 else end
+        elif src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            if not src.startswith("/*!", i):
+                pending = "\n" if "\n" in src[i:end] or pending == "\n" else (pending or " ")
+            else:
+                emit(src[i:end])
+            i = end
+        elif ch in "'\"":
+            end = _read_string(src, i, ch)
+            emit(src[i:end])
+            i = end
+        elif ch == "`":
+            emit("`")
+            i, opened = read_template_text(i + 1)
+            if opened:
+                templates.append(0)
+        elif ch == "/":
+            prev = _last_token(out)
+            if not prev or prev in _REGEX_AFTER_CHARS or prev in _REGEX_AFTER_WORDS:
+                end = _read_regex(src, i)
+                emit(src[i:end])
+                i = end
+            else:
+                emit(ch)
+                i += 1
+        elif templates and ch == "{":
+            templates[-1] += 1
+            emit(ch)
+            i += 1
+        elif templates and ch == "}":
+            if templates[-1] == 0:
+                # End of a ${...} expression: back to template text
+                templates.pop()
+                pending = ""
+                out.append("}")
+                i, opened = read_template_text(i + 1)
+                if opened:
+                    templates.append(0)
+            else:
+                templates[-1] -= 1
+                emit(ch)
+                i += 1
+        else:
+            m = _JS_WORD.match(src, i)
+            emit(m.group(0))
+            i = m.end()
+
+    return "".join(out).strip() + "\n"
+
+
+# =======================================================
+# Build
+# =======================================================
+
+def _write(path, data):
+    """Write bytes, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def rebase_css_urls(text, rel, assets):
+    """Fingerprint files a stylesheet references and point its url()s at them."""
+    built_dir = (STATIC / DIST_DIR / rel).parent
+
+    def one(match):
+        url = match.group(2).strip()
+        if re.match(r"(?:[a-z][\w+.-]*:|/|#)", url, re.I):
+            return match.group(0)
+
+        # Keep any ?query / #fragment; resolve the file part
+        path = re.split(r"[?#]", url, 1)[0]
+        target = ((STATIC / rel).parent / path).resolve()
+        if not target.is_file() or STATIC not in target.parents:
+            return match.group(0)
+
+        ref_rel = target.relative_to(STATIC).as_posix()
+        if ref_rel not in assets:
+            assets[ref_rel] = emit(target.read_bytes(), ref_rel, target)
+        new = os.path.relpath(STATIC / assets[ref_rel]["path"], built_dir).replace(os.sep, "/")
+        return f"url({new}{url[len(path):]})"
+
+    return _CSS_URL.sub(one, text)
+
+
+def build_one(source, rel, minify, assets):
+    """Build one source file; return its manifest entry."""
+    text = source.read_text(encoding="utf-8")
+    if minify:
+        text = minify_css(text) if source.suffix == ".css" else minify_js(text)
+    if source.suffix == ".css":
+        text = rebase_css_urls(text, rel, assets)
+    return emit(text.encode("utf-8"), rel, source)
+
+
+def emit(data, rel, source):
+    """Write `data` under its content hash plus compressed siblings."""
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    built_rel = f"{DIST_DIR}/{Path(rel).parent.as_posix()}/{source.stem}.{digest}{source.suffix}"
+    built = STATIC / built_rel
+    _write(built, data)
+
+    # Deterministic gzip (mtime=0) so rebuilds are byte-identical
+    encodings = []
+    compressed = {"gzip": (".gz", gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        compressed["br"] = (".br", brotli.compress(data, quality=11))
+    for encoding, (suffix, blob) in compressed.items():
+        if len(blob) < len(data) * MIN_COMPRESSION_GAIN:
+            _write(built.with_name(built.name + suffix), blob)
+            encodings.append(encoding)
+
+    return {
+        "path": built_rel,
+        "hash": digest,
+        "bytes": len(data),
+        "source_bytes": source.stat().st_size,
+        "encodings": sorted(encodings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--no-minify", action="store_true", help="fingerprint and compress only")
+    args = parser.parse_args()
+
+    assets = {}
+    for folder, ext, minify in SOURCES:
+        for source in sorted((STATIC / folder).glob(f"*{ext}")):
+            rel = f"{folder}/{source.name}"
+            assets[rel] = build_one(source, rel, minify and not args.no_minify, assets)
+
+    # Version token: changes when any built file changes
+    version = hashlib.sha256(
+        "".join(f"{rel}={entry['hash']};" for rel, entry in sorted(assets.items())).encode("utf-8")
+    ).hexdigest()[:HASH_LENGTH]
+
+    dist = STATIC / DIST_DIR
+    manifest_path = dist / MANIFEST_NAME
+    _write(manifest_path, (json.dumps({"version": version, "assets": assets}, indent=2) + "\n").encode("utf-8"))
+
+    # Remove output from earlier builds
+    keep = {manifest_path}
+    for entry in assets.values():
+        built = STATIC / entry["path"]
+        keep.add(built)
+        keep.update(built.with_name(built.name + suffix) for suffix in (".gz", ".br"))
+    for folder in {folder for folder, _, _ in SOURCES}:
+        for path in (dist / folder).rglob("*"):
+            if path.is_file() and path not in keep:
+                path.unlink()
+
+    print(f"{'asset':<38}{'source':>10}{'built':>10}  encodings")
+    for rel, entry in assets.items():
+        print(f"{rel:<38}{entry['source_bytes']:>10}{entry['bytes']:>10}  {', '.join(entry['encodings']) or '-'}")
+    print(f"\nManifest version {version} -> {manifest_path.relative_to(STATIC.parent.parent)}")
+    if brotli is None:
+        print("Note: install `brotli` to also write .br files.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Generate responsive WebP/AVIF variants of static/images.
+
+Usage:
+    python -m scripts.build_images [--widths 480,768,1200,1600] [--quality 80] [--avif-quality 55]
+
+Requires Pillow (pip install Pillow). AVIF is written when this Pillow
+build supports it (Pillow >= 11.2, or the pillow-avif-plugin package);
+otherwise only WebP variants are produced.
+
+Each image is resized (never upscaled) to every width below its own,
+plus its own width when that is under the largest requested width.
+Files go to static/dist/images/<name>.<hash>.<width>.<ext>, listed in
+static/dist/images.json for the picture() macro in templates/macros.html.
+Unchanged images are skipped on later runs; stale variants are removed.
+"""
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = features = None
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+except ImportError:
+    pass
+
+from brainery_data.assets import DIST_DIR, IMAGE_MANIFEST_NAME
+
+STATIC = Path(__file__).resolve().parent.parent / "brainery_data" / "static"
+
+# Source folder (under static/) and the file types it may contain
+SOURCE_DIR = "images"
+SOURCE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+DEFAULT_WIDTHS = "480,768,1200,1600"
+
+# Hex digits of the source hash kept in variant names
+HASH_LENGTH = 10
+
+
+def avif_supported():
+    """True if this Pillow can encode AVIF."""
+    try:
+        return bool(features.check("avif"))
+    except ValueError:
+        # Older Pillow without the feature flag: the plugin registers a saver
+        return "AVIF" in Image.SAVE
+
+
+def target_widths(source_width, widths):
+    """Widths to generate for an image `source_width` pixels wide."""
+    chosen = [w for w in widths if w < source_width]
+    if source_width <= max(widths):
+        chosen.append(source_width)
+    return sorted(set(chosen)) or [source_width]
+
+
+def build_image(source, rel, widths, formats, previous):
+    """Write the variants of one image; return its manifest entry."""
+    digest = hashlib.sha256(source.read_bytes()).hexdigest()[:HASH_LENGTH]
+    settings = formats_key(widths, formats)
+
+    # Same content and settings as last time: keep the existing files
+    if (
+        previous
+        and previous.get("hash") == digest
+        and previous.get("settings") == settings
+        and all((STATIC / v["path"]).is_file() for v in previous["variants"])
+    ):
+        return previous
+
+    out_dir = STATIC / DIST_DIR / Path(rel).parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source) as img:
+        img.load()
+        # Palette/greyscale PNGs: convert so the encoders keep alpha
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+        width, height = img.size
+
+        variants = []
+        for w in target_widths(width, widths):
+            h = max(1, round(height * w / width))
+            resized = img if w == width else img.resize((w, h), Image.LANCZOS)
+            for ext, (fmt, mime, options) in formats.items():
+                name = f"{source.stem}.{digest}.{w}.{ext}"
+                resized.save(out_dir / name, fmt, **options)
+                variants.append({
+                    "path": f"{DIST_DIR}/{Path(rel).parent.as_posix()}/{name}",
+                    "width": w,
+                    "type": mime,
+                    "bytes": (out_dir / name).stat().st_size,
+                })
+
+    return {
+        "hash": digest,
+        "width": width,
+        "height": height,
+        "source_bytes": source.stat().st_size,
+        "settings": settings,
+        "variants": variants,
+    }
+
+
+def formats_key(widths, formats):
+    """Fingerprint of the settings, so changing them forces a rebuild."""
+    return json.dumps([widths, {ext: opts for ext, (_, _, opts) in formats.items()}], sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--widths", default=DEFAULT_WIDTHS, help="comma-separated target widths in pixels")
+    parser.add_argument("--quality", type=int, default=80, help="WebP quality (0-100)")
+    parser.add_argument("--avif-quality", type=int, default=55, help="AVIF quality (0-100)")
+    args = parser.parse_args()
+
+    if Image is None:
+        sys.exit("Pillow is required: pip install Pillow")
+
+    widths = sorted({int(w) for w in args.widths.split(",") if w.strip()})
+
+    # Extension -> (Pillow format, MIME type, save options)
+    formats = {"webp": ("WEBP", "image/webp", {"quality": args.quality, "method": 6})}
+    if avif_supported():
+        formats["avif"] = ("AVIF", "image/avif", {"quality": args.avif_quality})
+    else:
+        print("Note: this Pillow cannot encode AVIF; writing WebP only.")
+
+    manifest_path = STATIC / DIST_DIR / IMAGE_MANIFEST_NAME
+    previous = {}
+    if manifest_path.is_file():
+        previous = json.loads(manifest_path.read_text(encoding="utf-8")).get("images", {})
+
+    images = {}
+    for source in sorted((STATIC / SOURCE_DIR).iterdir()):
+        if source.suffix.lower() in SOURCE_SUFFIXES:
+            rel = f"{SOURCE_DIR}/{source.name}"
+            images[rel] = build_image(source, rel, widths, formats, previous.get(rel))
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({"images": images}, indent=2) + "\n", encoding="utf-8")
+
+    # Remove variants of deleted or changed images
+    keep = {STATIC / v["path"] for image in images.values() for v in image["variants"]}
+    for path in (STATIC / DIST_DIR / SOURCE_DIR).rglob("*"):
+        if path.is_file() and path not in keep:
+            path.unlink()
+
+    print(f"{'image':<40}{'source':>11}{'smallest':>10}{'largest':>10}")
+    for rel, image in images.items():
+        sizes = [v["bytes"] for v in image["variants"]]
+        print(f"{rel:<40}{image['source_bytes']:>11}{min(sizes):>10}{max(sizes):>10}")
+    print(f"\n{len(images)} images -> {manifest_path.relative_to(STATIC.parent.parent)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Report password hash latency per cost setting on this machine.
+
+Usage:
+    python -m scripts.calibrate_password_hash [--target-ms 250] [--rounds 5] [METHOD ...]
+
+Prints the median/max time to hash one password for each Werkzeug
+method and recommends the strongest setting under --target-ms. Put
+the chosen method in PASSWORD_HASH_METHOD; existing users are
+rehashed on their next login.
+"""
+import argparse
+import statistics
+import time
+
+from werkzeug.security import generate_password_hash
+
+from brainery_data.passwords import PASSWORD_HASH_METHOD, normalise_method
+
+# Candidate settings, weakest first within each family
+DEFAULT_METHODS = [
+    "pbkdf2:sha256:200000",
+    "pbkdf2:sha256:400000",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:1000000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+    "scrypt:65536:8:1",
+]
+
+
+def time_method(method, rounds):
+    """Return per-hash durations in milliseconds."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        generate_password_hash("calibration-Passw0rd!", method)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("methods", nargs="*", default=DEFAULT_METHODS)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    current = normalise_method(PASSWORD_HASH_METHOD)
+    print(f"Configured PASSWORD_HASH_METHOD: {current}")
+    print(f"{'method':<26}{'median ms':>12}{'max ms':>10}")
+
+    within_target = []
+    for method in args.methods:
+        method = normalise_method(method)
+        samples = time_method(method, args.rounds)
+        median = statistics.median(samples)
+        marker = "  <- current" if method == current else ""
+        print(f"{method:<26}{median:>12.1f}{max(samples):>10.1f}{marker}")
+        if median <= args.target_ms:
+            within_target.append((median, method))
+
+    if within_target:
+        print(f"\nSlowest (strongest) setting within {args.target_ms:.0f} ms: {max(within_target)[1]}")
+    else:
+        print(f"\nNo setting hashed within {args.target_ms:.0f} ms on this machine.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +0,0 @@
-﻿from brainery_data.models import SessionUser
-print("OK: SessionUser import")
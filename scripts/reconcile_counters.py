@@ -0,0 +1,14 @@
+from brainery_data.sql.db import SessionLocal
+from brainery_data.sql import counters
+
+# Recompute the dashboard counters from the source tables and report drift
+# (safe to run from cron; writers queue behind the counter row locks)
+db = SessionLocal()
+try:
+    drift = counters.reconcile(db)
+    if not drift:
+        print("Counters OK (no drift).")
+    for name, (stored, actual) in drift.items():
+        print(f"- {name}: stored={stored} actual={actual} (fixed)")
+finally:
+    db.close()
@@ -0,0 +1,397 @@
+"""
+Vendor Bootstrap, jQuery and Font Awesome as one first-party CSS/JS bundle.
+
+Usage:
+    python -m scripts.vendor_assets [--update-lock] [--offline]
+
+Downloads the pinned releases below (cached in .vendor-cache/), checks
+them against their published Subresource Integrity hashes and
+scripts/vendor.lock.json, then writes:
+
+    static/vendor/vendor.css       Bootstrap + Font Awesome, purged of
+                                   selectors our templates/JS never use
+    static/vendor/vendor.js        jQuery + Popper + Bootstrap
+    static/vendor/webfonts/*.woff2 Font Awesome fonts, subset to the used
+                                   icons when fontTools + brotli are installed
+    static/vendor/brain.svg        favicon
+
+The output and the lock file are committed. scripts/build_assets.py
+then fingerprints and compresses the bundle like our own CSS/JS.
+
+Files with a published integrity hash fail if a download differs, even
+with --update-lock. The lock file pins the rest (the font files and the
+favicon); use --update-lock after changing a version. Classes added at
+runtime are found because the scan includes the vendored JS itself;
+classes our own code builds from a variable go in SAFELIST.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import re
+import shutil
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = ROOT / "brainery_data"
+STATIC = PACKAGE / "static"
+OUT_DIR = STATIC / "vendor"
+CACHE_DIR = ROOT / ".vendor-cache"
+LOCK_PATH = Path(__file__).resolve().parent / "vendor.lock.json"
+
+# Pinned releases (jQuery 3.7.1 replaces the 3.6.4 the CDN tags loaded)
+BOOTSTRAP = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist"
+POPPER = "https://cdn.jsdelivr.net/npm/@popperjs/core@2.11.8/dist/umd"
+JQUERY = "https://cdn.jsdelivr.net/npm/jquery@3.7.1/dist"
+FONT_AWESOME = "https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.4.0"
+
+# name -> (url, published Subresource Integrity hash or None)
+SOURCES = {
+    "bootstrap.min.css": (
+        f"{BOOTSTRAP}/css/bootstrap.min.css",
+        "sha384-9ndCyUaIbzAi2FUVXJi0CjmCapSmO7SnpJef0486qhLnuZ2cdeRhO02iuK6FUUVM",
+    ),
+    "bootstrap.min.js": (
+        f"{BOOTSTRAP}/js/bootstrap.min.js",
+        "sha384-fbbOQedDUMZZ5KreZpsbe1LCZPVmfTnH7ois6mU1QK+m14rQ1l2bGBq41eYeM/fS",
+    ),
+    "popper.min.js": (
+        f"{POPPER}/popper.min.js",
+        "sha384-I7E8VVD/ismYTF4hNIPjVp/Zjvgyol6VFvRkX/vR+Vc4jQkC+hVqc2pM8ODewa9r",
+    ),
+    "jquery.min.js": (
+        f"{JQUERY}/jquery.min.js",
+        "sha256-/JqT3SQfawRcv/BIHPThkBvs0OEvtFFmqPF/lYI/Cxo=",
+    ),
+    "fontawesome.all.min.css": (
+        f"{FONT_AWESOME}/css/all.min.css",
+        "sha512-iecdLmaskl7CVkqkXNQ/ZH/XLlvWZOJyj7Yy7tcenmpD1ypASozpmT/E0iPtmFIB46ZmdtAc9eNBvH0H/ZpiBw==",
+    ),
+    "brain.svg": (f"{FONT_AWESOME}/svgs/solid/brain.svg", None),
+}
+
+# Files scanned for class names / ids that must survive the purge
+SCAN_GLOBS = [
+    (PACKAGE / "templates", "*.html"),
+    (STATIC / "js", "*.js"),
+    (PACKAGE / "routes", "*.py"),
+]
+
+# Classes built from a variable that no scan can see: flash categories
+# (alert-{{ category }}) and dashboard toasts (bg-${type})
+SAFELIST = {
+    "alert-success", "alert-danger", "alert-warning", "alert-info",
+    "alert-primary", "alert-secondary", "alert-dismissible",
+    "bg-success", "bg-danger", "bg-warning", "bg-info",
+}
+
+
+# =======================================================
+# Download (Cached, Hash-Pinned)
+# =======================================================
+
+def fetch(name, url, integrity, lock, update_lock, offline):
+    """Return the bytes of `url`, verified against its SRI hash and the lock file."""
+    cached = CACHE_DIR / name
+    if cached.is_file():
+        data = cached.read_bytes()
+    elif offline:
+        sys.exit(f"{name} is not in {CACHE_DIR} and --offline was given")
+    else:
+        with urllib.request.urlopen(url, timeout=60) as resp:
+            data = resp.read()
+        CACHE_DIR.mkdir(exist_ok=True)
+        cached.write_bytes(data)
+
+    if integrity:
+        algorithm, _, expected = integrity.partition("-")
+        actual = base64.b64encode(hashlib.new(algorithm, data).digest()).decode("ascii")
+        if actual != expected:
+            sys.exit(f"{name}: download does not match its published integrity hash {integrity}")
+
+    digest = hashlib.sha256(data).hexdigest()
+    pinned = lock.get(name)
+    if pinned and not update_lock and (pinned["url"] != url or pinned["sha256"] != digest):
+        sys.exit(f"{name}: download does not match {LOCK_PATH.name} (use --update-lock after a version bump)")
+    lock[name] = {"url": url, "sha256": digest}
+    return data
+
+
+# =======================================================
+# CSS Parsing
+# =======================================================
+
+def _skip_string(css, i):
+    """Index just past the quoted string starting at i."""
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == "\\" else 1
+    return i + 1
+
+
+def _scan(css, i, stops, track_braces=False):
+    """Index of the first stop character at i, skipping strings and comments."""
+    depth = 0
+    while i < len(css):
+        ch = css[i]
+        if ch in "\"'":
+            i = _skip_string(css, i)
+            continue
+        if css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            i = len(css) if end == -1 else end + 2
+            continue
+        if track_braces and ch == "{":
+            depth += 1
+        elif track_braces and ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        elif not track_braces and ch in stops:
+            return i
+        i += 1
+    return i
+
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def parse_rules(css):
+    """Split a stylesheet into (prelude, body) pairs; body is None for statements."""
+    rules = []
+    i = 0
+    while i < len(css):
+        j = _scan(css, i, "{;}")
+        prelude = _COMMENT.sub("", css[i:j]).strip()
+        if j >= len(css):
+            break
+        if css[j] == ";":
+            if prelude:
+                rules.append((prelude, None))
+            i = j + 1
+        elif css[j] == "}":
+            i = j + 1
+        else:
+            k = _scan(css, j, "", track_braces=True)
+            rules.append((prelude, css[j + 1:k]))
+            i = k + 1
+    return rules
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(prelude):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+    parts.append(prelude[start:].strip())
+    return [p for p in parts if p]
+
+
+# Arguments of these never make a selector require a class
+_FUNCTIONAL_PSEUDO = re.compile(r":(?:not|is|where|has|-webkit-any|-moz-any)\((?:[^()]|\([^()]*\))*\)")
+_ATTRIBUTE = re.compile(r"\[[^\]]*\]")
+_CLASS_OR_ID = re.compile(r"[.#](-?[A-Za-z_][\w-]*)")
+
+
+def selector_used(selector, used):
+    """True if every class and id the selector requires appears in `used`."""
+    core = _ATTRIBUTE.sub("", _FUNCTIONAL_PSEUDO.sub("", selector))
+    return all(name in used for name in _CLASS_OR_ID.findall(core))
+
+
+# =======================================================
+# Purge
+# =======================================================
+
+# At-rules whose body is itself a list of rules
+_GROUPING = {"@media", "@supports", "@layer", "@container"}
+
+
+def purge_rules(css, used):
+    """Drop style rules whose selectors all need unused classes."""
+    out = []
+    for prelude, body in parse_rules(css):
+        if body is None:
+            out.append(prelude + ";")
+        elif prelude.startswith("@"):
+            name = re.match(r"@[\w-]+", prelude).group(0).lower()
+            if name in _GROUPING:
+                inner = purge_rules(body, used)
+                if inner:
+                    out.append(f"{prelude}{{{inner}}}")
+            else:
+                out.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [s for s in split_selectors(prelude) if selector_used(s, used)]
+            if selectors:
+                out.append(f"{','.join(selectors)}{{{body}}}")
+    return "".join(out)
+
+
+def drop_unreferenced(css):
+    """Remove @keyframes and @font-face nothing in the purged CSS refers to."""
+    rendered = [f"{p};" if b is None else f"{p}{{{b}}}" for p, b in parse_rules(css)]
+    kept = []
+    for index, rule in enumerate(rendered):
+        lowered = rule.lower()
+        if lowered.startswith(("@keyframes", "@-webkit-keyframes", "@font-face")):
+            others = "".join(rendered[:index] + rendered[index + 1:])
+            if lowered.startswith("@font-face"):
+                family = re.search(r"font-family:\s*(\"[^\"]+\"|'[^']+'|[^;}]+)", rule)
+                if family and family.group(1).strip() not in others:
+                    continue
+            else:
+                name = rule.split(None, 1)[1].split("{", 1)[0].strip()
+                if not re.search(rf"(?<![\w-]){re.escape(name)}(?![\w-])", others):
+                    continue
+        kept.append(rule)
+    return "".join(kept)
+
+
+def banner(text):
+    """Leading /*! license */ comment of a vendor file."""
+    m = re.match(r"\s*(/\*!.*?\*/)", text, re.S)
+    return m.group(1) if m else ""
+
+
+def used_tokens(extra_texts):
+    """Every identifier-like token in our templates, JS, routes and the vendor JS."""
+    tokens = set(SAFELIST)
+    texts = list(extra_texts)
+    for folder, pattern in SCAN_GLOBS:
+        texts.extend(p.read_text(encoding="utf-8-sig") for p in sorted(folder.glob(pattern)))
+    for text in texts:
+        tokens.update(re.findall(r"[A-Za-z0-9_-]+", text))
+    return tokens
+
+
+# =======================================================
+# Font Awesome Fonts
+# =======================================================
+
+_WOFF2_SRC = re.compile(r"url\(([^)]+?\.woff2)\)\s*format\([\"']woff2[\"']\)")
+
+
+def rewrite_font_faces(css):
+    """Point @font-face at webfonts/*.woff2 only; return (css, font file names)."""
+    fonts = []
+
+    def one(match):
+        prelude, body = match.group(1), match.group(2)
+        names = [Path(u.strip("\"'")).name for u in _WOFF2_SRC.findall(body)]
+        if not names:
+            return match.group(0)
+        fonts.extend(names)
+        src = ",".join(f'url(webfonts/{n}) format("woff2")' for n in names)
+        body = re.sub(r"src:[^;}]+", f"src:{src}", body)
+        return f"{prelude}{{{body}}}"
+
+    css = re.sub(r"(@font-face)\{([^}]*)\}", one, css)
+    return css, sorted(set(fonts))
+
+
+def used_codepoints(css):
+    """Codepoints of the icon glyphs left after purging."""
+    return {int(cp, 16) for cp in re.findall(r"content:\s*[\"']\\([0-9a-fA-F]{2,6})[\"']", css)}
+
+
+def subset_font(data, codepoints, dest):
+    """Write `data` subset to `codepoints` (full font if it cannot be subset)."""
+    try:
+        import brotli  # noqa: F401  (needed by fontTools for woff2)
+        from fontTools import subset
+        from fontTools.ttLib import TTLibError
+    except ImportError:
+        dest.write_bytes(data)
+        return False
+
+    src = dest.with_suffix(".src.woff2")
+    src.write_bytes(data)
+    try:
+        options = subset.Options()
+        options.flavor = "woff2"
+        options.layout_features = ["*"]
+        font = subset.load_font(str(src), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=sorted(codepoints))
+        subsetter.subset(font)
+        subset.save_font(font, str(dest), options)
+    except TTLibError as exc:
+        # Browsers accept some fonts fontTools cannot parse: ship them whole
+        print(f"Note: {dest.name} was not subset ({exc}).")
+        dest.write_bytes(data)
+        return False
+    finally:
+        src.unlink()
+    return True
+
+
+# =======================================================
+# Build
+# =======================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update-lock", action="store_true", help="accept new download hashes")
+    parser.add_argument("--offline", action="store_true", help="use only .vendor-cache/")
+    args = parser.parse_args()
+
+    lock = json.loads(LOCK_PATH.read_text(encoding="utf-8"))["files"] if LOCK_PATH.is_file() else {}
+    get = lambda name, source=None: fetch(name, *(source or SOURCES[name]), lock, args.update_lock, args.offline)
+
+    bootstrap_css = get("bootstrap.min.css").decode("utf-8")
+    fa_css = get("fontawesome.all.min.css").decode("utf-8")
+    jquery_js = get("jquery.min.js").decode("utf-8")
+    popper_js = get("popper.min.js").decode("utf-8")
+    bootstrap_js = get("bootstrap.min.js").decode("utf-8")
+
+    # Purge against our sources plus the vendor JS (runtime classes such as "show")
+    used = used_tokens([jquery_js, bootstrap_js])
+    purged = drop_unreferenced(purge_rules(bootstrap_css, used) + purge_rules(fa_css, used))
+    purged, font_names = rewrite_font_faces(purged)
+
+    # Fresh output directory
+    if OUT_DIR.exists():
+        shutil.rmtree(OUT_DIR)
+    (OUT_DIR / "webfonts").mkdir(parents=True)
+
+    css = "\n".join(filter(None, [banner(bootstrap_css), banner(fa_css), purged])) + "\n"
+    (OUT_DIR / "vendor.css").write_text(css, encoding="utf-8")
+
+    # Source maps are not vendored, so drop their references
+    strip_map = lambda js: re.sub(r"\n?//# sourceMappingURL=\S+\s*$", "", js.rstrip())
+    # Popper before Bootstrap: its UMD build reads window.Popper (same as the bundle)
+    js = "\n;\n".join(strip_map(text) for text in (jquery_js, popper_js, bootstrap_js)) + "\n"
+    (OUT_DIR / "vendor.js").write_text(js, encoding="utf-8")
+
+    (OUT_DIR / "brain.svg").write_bytes(get("brain.svg"))
+
+    codepoints = used_codepoints(purged)
+    subsetted = False
+    for name in font_names:
+        data = get(name, (f"{FONT_AWESOME}/webfonts/{name}", None))
+        subsetted = subset_font(data, codepoints, OUT_DIR / "webfonts" / name) or subsetted
+
+    LOCK_PATH.write_text(json.dumps({"files": dict(sorted(lock.items()))}, indent=2) + "\n", encoding="utf-8")
+
+    before = len(bootstrap_css) + len(fa_css)
+    print(f"vendor.css  {before:>8} -> {len(css):>8} bytes (purged)")
+    print(f"vendor.js   {len(js):>8} bytes (jQuery + Popper + Bootstrap)")
+    for path in sorted((OUT_DIR / "webfonts").iterdir()):
+        print(f"webfonts/{path.name:<24}{path.stat().st_size:>8} bytes")
+    print(f"{len(codepoints)} icon glyphs used")
+    if not subsetted:
+        print("Note: install fontTools and brotli to subset the icon fonts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# =======================================================
+# Tests: Response Compression Middleware
+# =======================================================
+# The middleware is exercised directly through werkzeug's test Client
+# with small WSGI apps, so each case controls exactly what the wrapped
+# application sends.
+
+import gzip
+import zlib
+
+import pytest
+from werkzeug.test import Client
+
+from brainery_data import compression
+from brainery_data.compression import CompressionMiddleware, choose_encoder
+
+HTML = "text/html; charset=utf-8"
+BIG = b"<p>" + b"brainery " * 400 + b"</p>"
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def wsgi_app(body=BIG, content_type=HTML, status="200 OK", headers=(), length=True, closed=None):
+    """A WSGI app returning `body` (bytes or list of chunks) with the given headers."""
+    chunks = [body] if isinstance(body, bytes) else list(body)
+
+    def app(environ, start_response):
+        response_headers = [("Content-Type", content_type), *headers]
+        if length:
+            response_headers.append(("Content-Length", str(sum(map(len, chunks)))))
+        start_response(status, response_headers)
+        return _Closing(chunks, closed)
+
+    return app
+
+
+class _Closing(list):
+    """Response iterable that records close() calls."""
+
+    def __init__(self, chunks, closed):
+        super().__init__(chunks)
+        self._closed = closed
+
+    def close(self):
+        if self._closed is not None:
+            self._closed.append(True)
+
+
+def client(app, min_size=1024):
+    return Client(CompressionMiddleware(app, min_size=min_size))
+
+
+# =======================================================
+# Accept-Encoding Negotiation
+# =======================================================
+
+@pytest.mark.parametrize("header", [None, "", "identity", "gzip;q=0", "deflate", "*;q=0"])
+def test_identity_when_nothing_usable_is_accepted(header):
+    assert choose_encoder(header) is None
+
+
+@pytest.mark.parametrize("header", ["gzip", "GZIP", "gzip;q=0.3", "*", "deflate, gzip;q=0.5"])
+def test_gzip_is_chosen_when_accepted(header, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoder(header).name == "gzip"
+
+
+def test_malformed_q_value_counts_as_refused(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoder("gzip;q=abc") is None
+
+
+def test_explicit_coding_overrides_wildcard(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoder("*;q=1, gzip;q=0") is None
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli is not installed")
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0.9, gzip;q=0.8", "br"),
+    ("br;q=0, gzip", "gzip"),
+])
+def test_highest_q_value_wins(header, expected):
+    assert choose_encoder(header).name == expected
+
+
+# =======================================================
+# Known-Length Responses
+# =======================================================
+
+def test_compresses_large_html_with_exact_length():
+    resp = client(wsgi_app()).get("/", headers=GZIP)
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert int(resp.headers["Content-Length"]) == len(resp.data) < len(BIG)
+    assert gzip.decompress(resp.data) == BIG
+    assert resp.headers["Vary"] == "Accept-Encoding"
+
+
+def test_small_body_is_sent_as_is_but_still_varies():
+    resp = client(wsgi_app(body=b"<p>hi</p>")).get("/", headers=GZIP)
+
+    assert "Content-Encoding" not in resp.headers
+    assert resp.data == b"<p>hi</p>"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+
+
+def test_client_without_gzip_gets_identity():
+    resp = client(wsgi_app()).get("/")
+
+    assert "Content-Encoding" not in resp.headers
+    assert resp.data == BIG
+    assert resp.headers["Vary"] == "Accept-Encoding"
+
+
+def test_existing_vary_is_merged():
+    app = wsgi_app(headers=[("Vary", "Cookie")])
+    resp = client(app).get("/", headers=GZIP)
+
+    assert resp.headers.getlist("Vary") == ["Cookie, Accept-Encoding"]
+
+
+def test_strong_etag_is_weakened_and_weak_etag_kept():
+    strong = client(wsgi_app(headers=[("ETag", '"abc"')])).get("/", headers=GZIP)
+    weak = client(wsgi_app(headers=[("ETag", 'W/"abc"')])).get("/", headers=GZIP)
+
+    assert strong.headers["ETag"] == 'W/"abc"'
+    assert weak.headers["ETag"] == 'W/"abc"'
+
+
+def test_identity_response_keeps_strong_etag():
+    resp = client(wsgi_app(headers=[("ETag", '"abc"')])).get("/")
+
+    assert resp.headers["ETag"] == '"abc"'
+
+
+# =======================================================
+# Responses That Are Never Touched
+# =======================================================
+
+def test_already_encoded_body_is_passed_through():
+    encoded = gzip.compress(BIG)
+    app = wsgi_app(body=encoded, content_type="text/css", headers=[("Content-Encoding", "gzip")])
+    resp = client(app).get("/", headers=GZIP)
+
+    assert resp.headers.getlist("Content-Encoding") == ["gzip"]
+    assert resp.data == encoded
+    assert "Vary" not in resp.headers
+
+
+@pytest.mark.parametrize("content_type", ["image/png", "font/woff2", "application/octet-stream"])
+def test_incompressible_types_are_passed_through(content_type):
+    resp = client(wsgi_app(content_type=content_type)).get("/", headers=GZIP)
+
+    assert "Content-Encoding" not in resp.headers
+    assert resp.data == BIG
+
+
+@pytest.mark.parametrize("status, body", [
+    ("204 No Content", b""),
+    ("206 Partial Content", BIG),
+    ("304 Not Modified", b""),
+])
+def test_bodyless_and_partial_statuses_are_passed_through(status, body):
+    resp = client(wsgi_app(body=body, status=status)).get("/", headers=GZIP)
+
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_no_transform_is_respected():
+    app = wsgi_app(headers=[("Cache-Control", "no-transform")])
+    resp = client(app).get("/", headers=GZIP)
+
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_head_request_is_not_encoded():
+    resp = client(wsgi_app()).head("/", headers=GZIP)
+
+    assert "Content-Encoding" not in resp.headers
+    assert resp.headers["Content-Length"] == str(len(BIG))
+
+
+def test_disabled_middleware_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(compression, "COMPRESS_ENABLED", False)
+    resp = client(wsgi_app()).get("/", headers=GZIP)
+
+    assert "Content-Encoding" not in resp.headers
+    assert "Vary" not in resp.headers
+
+
+# =======================================================
+# Streaming and Lazy start_response
+# =======================================================
+
+def test_streamed_body_is_flushed_chunk_by_chunk():
+    chunks = [(b"<li>%d</li>" % i) * 200 for i in range(5)]
+    resp = client(wsgi_app(body=chunks, length=False)).get("/", headers=GZIP, buffered=False)
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in resp.headers
+
+    # Each piece decodes on its own to the chunk the app just produced
+    decoder = zlib.decompressobj(31)
+    pieces = iter(resp.response)
+    for chunk in chunks:
+        assert decoder.decompress(next(pieces)) == chunk
+    assert decoder.decompress(b"".join(pieces)) == b""
+    assert decoder.eof
+    resp.close()
+
+
+def test_short_stream_falls_back_to_identity():
+    closed = []
+    app = wsgi_app(body=[b"<p>a</p>", b"<p>b</p>"], length=False, closed=closed)
+    resp = client(app).get("/", headers=GZIP)
+
+    assert "Content-Encoding" not in resp.headers
+    assert resp.data == b"<p>a</p><p>b</p>"
+    assert closed == [True]
+
+
+def test_lazy_start_response_is_handled():
+    def app(environ, start_response):
+        # A generator: start_response only runs once iteration begins
+        start_response("200 OK", [("Content-Type", HTML)])
+        yield BIG[:2000]
+        yield BIG[2000:]
+
+    resp = client(app).get("/", headers=GZIP)
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.data) == BIG
+
+
+def test_write_callable_output_comes_first():
+    def app(environ, start_response):
+        write = start_response("200 OK", [("Content-Type", HTML)])
+        write(BIG[:100])
+        return [BIG[100:]]
+
+    resp = client(app).get("/", headers=GZIP)
+
+    assert gzip.decompress(resp.data) == BIG
+
+
+def test_app_iterable_is_closed_after_compression():
+    closed = []
+    resp = client(wsgi_app(closed=closed)).get("/", headers=GZIP)
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert closed == [True]
@@ -0,0 +1,210 @@
+# =======================================================
+# Tests: Rendered-Page Cache for Anonymous Visitors
+# =======================================================
+# A minimal Flask app with CSRFProtect and one @anonymous_page view
+# stands in for the homepage; the PageCache class is also tested on
+# its own for TTL and LRU behaviour.
+
+import re
+
+import pytest
+from flask import Flask, abort, flash, render_template_string
+from flask_wtf.csrf import CSRFProtect
+
+from brainery_data import assets, page_cache
+from brainery_data.page_cache import PageCache
+
+PAGE = '<form method="post" action="/submit"><input name="csrf_token" value="{{ csrf_token() }}"></form>'
+
+
+def token_in(resp):
+    return re.search(r'name="csrf_token" value="([^"]+)"', resp.get_data(as_text=True)).group(1)
+
+
+@pytest.fixture
+def renders():
+    return []
+
+
+@pytest.fixture
+def app(renders):
+    app = Flask(__name__)
+    app.config.update(SECRET_KEY="test", TESTING=True)
+
+    # Same order as create_app: the placeholder must override CSRFProtect's csrf_token
+    CSRFProtect(app)
+    page_cache.init_app(app)
+
+    @app.route("/")
+    @page_cache.anonymous_page
+    def index():
+        renders.append("index")
+        return render_template_string(PAGE)
+
+    @app.route("/missing")
+    @page_cache.anonymous_page
+    def missing():
+        renders.append("missing")
+        return render_template_string(PAGE), 404
+
+    @app.route("/json")
+    @page_cache.anonymous_page
+    def as_json():
+        renders.append("json")
+        return {"ok": True}
+
+    @app.route("/flash")
+    def set_flash():
+        flash("Welcome back")
+        return "flashed"
+
+    @app.route("/submit", methods=["POST"])
+    def submit():
+        return "accepted"
+
+    page_cache.clear()
+    yield app
+    page_cache.clear()
+
+
+# =======================================================
+# Anonymous Visitors
+# =======================================================
+
+def test_second_visit_is_served_from_cache(app, renders):
+    client = app.test_client()
+    first = client.get("/")
+    second = client.get("/")
+
+    assert renders == ["index"]
+    assert first.status_code == second.status_code == 200
+    assert second.mimetype == "text/html"
+    assert page_cache.stats()["size"] == 1
+
+
+def test_each_visitor_gets_their_own_valid_csrf_token(app):
+    alice, bob = app.test_client(), app.test_client()
+    alice_token = token_in(alice.get("/"))
+    bob_token = token_in(bob.get("/"))
+
+    assert alice_token != bob_token
+    assert page_cache._CSRF_PLACEHOLDER not in (alice_token, bob_token)
+
+    # Each token validates against its own session only
+    assert alice.post("/submit", data={"csrf_token": alice_token}).status_code == 200
+    assert bob.post("/submit", data={"csrf_token": bob_token}).status_code == 200
+    assert bob.post("/submit", data={"csrf_token": alice_token}).status_code == 400
+
+
+def test_query_string_shares_the_cached_page(app, renders):
+    client = app.test_client()
+    client.get("/?utm_source=newsletter")
+    client.get("/?utm_source=ads")
+
+    assert renders == ["index"]
+
+
+def test_new_asset_build_changes_the_key(app, renders, monkeypatch):
+    client = app.test_client()
+    client.get("/")
+    monkeypatch.setattr(assets, "manifest_version", lambda: "next-build")
+    client.get("/")
+
+    assert renders == ["index", "index"]
+
+
+# =======================================================
+# Bypass and Non-Cacheable Responses
+# =======================================================
+
+def test_logged_in_session_bypasses_cache(app, renders):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    client.get("/")
+    client.get("/")
+
+    assert renders == ["index", "index"]
+    assert page_cache.stats()["size"] == 0
+
+
+def test_remember_me_cookie_bypasses_cache(app, renders):
+    client = app.test_client()
+    client.set_cookie("remember_token", "1|signature")
+    client.get("/")
+    client.get("/")
+
+    assert renders == ["index", "index"]
+
+
+def test_pending_flash_bypasses_cache(app, renders):
+    client = app.test_client()
+    client.get("/")
+    client.get("/flash")
+    client.get("/")
+
+    assert renders == ["index", "index"]
+
+
+def test_error_pages_are_not_cached_but_get_a_real_token(app, renders):
+    client = app.test_client()
+    resp = client.get("/missing")
+    client.get("/missing")
+
+    assert resp.status_code == 404
+    assert token_in(resp) != page_cache._CSRF_PLACEHOLDER
+    assert renders == ["missing", "missing"]
+
+
+def test_non_html_responses_are_not_cached(app, renders):
+    client = app.test_client()
+    client.get("/json")
+    client.get("/json")
+
+    assert renders == ["json", "json"]
+
+
+def test_disabled_cache_always_renders(app, renders, monkeypatch):
+    monkeypatch.setattr(page_cache, "PAGE_CACHE_ENABLED", False)
+    client = app.test_client()
+    client.get("/")
+    client.get("/")
+
+    assert renders == ["index", "index"]
+
+
+# =======================================================
+# PageCache (TTL + LRU)
+# =======================================================
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(page_cache.time, "monotonic", lambda: now[0])
+    cache = PageCache(max_entries=4, ttl=60)
+    cache.put("home", "<html>")
+
+    now[0] += 59
+    assert cache.get("home") == "<html>"
+    now[0] += 1
+    assert cache.get("home") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 1, "bypassed": 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PageCache(max_entries=2, ttl=60)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert cache.get("a") == "A"
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+
+
+@pytest.mark.parametrize("max_entries, ttl", [(0, 60), (4, 0)])
+def test_zero_size_or_ttl_stores_nothing(max_entries, ttl):
+    cache = PageCache(max_entries=max_entries, ttl=ttl)
+    cache.put("a", "A")
+
+    assert cache.get("a") is None